@@ -1,7 +1,7 @@
 from flask import Flask
 from flask_restx import Api
 from config import DevelopmentConfig #import propre
-from app.extensions import db, bcrypt, jwt
+from app.extensions import db, bcrypt, jwt, password_hasher
 from flask_cors import CORS
 #-------------------------------------------------------------- Import namespace
 
@@ -11,6 +11,12 @@ from app.api.v1.places import api as places_ns              # places
 from app.api.v1.reviews import api as reviews_ns            # amenities
 from app.api.v1.auth import api as auth_ns
 from app.api.v1.admin import api as admin_ns
+from app.cli import register_commands
+from app.services import facade, identity
+from app.persistence import engine, routing
+from app.persistence.cache import make_cache
+from app.utils import compression, serializers
+from app.frontend import bp as frontend_bp
 #------------------------------------------------------------------- App et Docu
 
 authorizations = {
@@ -26,9 +32,14 @@ def create_app(config_class="config.DevelopmentConfig"): #devconfig sera automat
     app = Flask(__name__)   # Création application Flask
     app.config.from_object(config_class) # applique la configuration
     bcrypt.init_app(app)
+    password_hasher.init_app(app)       # Pool de hashage, selon BCRYPT_*
     jwt.init_app(app)
+    engine.init_app(app)                # Options du pool, selon DB_POOL_*
     db.init_app(app)
-    CORS(app, origins=["http://localhost:5500"])
+    routing.init_app(app)               # Réplicas en lecture, DB_REPLICA_URLS
+    engine.set_pragmas(app)             # PRAGMA SQLite, selon SQLITE_*
+    CORS(app, origins=["http://localhost:5500"],
+         expose_headers=["ETag", "Last-Modified"])
 
     api = Api(              # Infos pour la documentation Swagger
         app,
@@ -54,5 +65,21 @@ def create_app(config_class="config.DevelopmentConfig"): #devconfig sera automat
     # Ajout du namespace de auth à l'API principale
     api.add_namespace(admin_ns, path="/api/v1/admin")
 
+    # Encodeur JSON des réponses, selon JSON_BACKEND
+    serializers.init_app(app, api)
+
+    # Compression gzip/brotli des réponses, selon COMPRESS_*
+    compression.init_app(app)
+    # Frontend statique (variantes précompressées) sous /frontend/
+    app.register_blueprint(frontend_bp)
+
+    # Cache des GET d'une entité, selon CACHE_BACKEND
+    facade.configure_cache(make_cache(app.config))
+    # Identité JWT par requête (cache court) et jti révoqués
+    identity.init_app(app)
+
+    # Ajout des commandes CLI (flask import-ndjson, ...)
+    register_commands(app)
+
 
     return app
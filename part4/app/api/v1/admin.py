@@ -17,7 +17,7 @@ update places).
 
 Authentication and authorization are enforced using JWT tokens. Admin
 privileges are checked
-via the 'is_admin' claim in the JWT identity.
+via the is_admin flag of the token's user (read from the database).
 
 Endpoints:
 - POST   /users/             : Create a new user (admin only).
@@ -25,6 +25,12 @@ Endpoints:
 - POST   /amenities/         : Create a new amenity (admin only).
 - PUT    /amenities/<amenity_id> : Update an existing amenity (admin only).
 - PUT    /places/<place_id>  : Update a place (admin or owner only).
+- POST   /import             : Bulk import NDJSON amenities, places and
+  reviews (admin only).
+- GET    /cache              : Cache hit/miss counters (admin only).
+- GET    /hashing            : Password hashing pool and queue depth
+  (admin only).
+- GET    /tokens             : Refresh token store counters (admin only).
 
 Models:
 - Admin_User: Model for creating a user.
@@ -37,12 +43,14 @@ This module is intended to be included as part of the API blueprint and
 should be protected with proper JWT authentication.
 
 """
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.services import facade
+from app.extensions import password_hasher
 from functools import wraps
 from app.utils.decorators import handle_errors
-from werkzeug.security import generate_password_hash
+from app.services.bulk_import import DEFAULT_BATCH_SIZE
 
 api = Namespace(
     'admin',
@@ -121,8 +129,8 @@ def admin_only(f):
     """
     Decorator to restrict access to admin users only.
 
-    Requires a valid JWT token and checks the 'is_admin' claim in the
-    token identity.
+    Requires a valid JWT token and checks the is_admin flag of its user
+    (current_user, see app/services/identity.py).
     Returns HTTP 403 Forbidden if the user is not an admin.
     """
     @wraps(f)
@@ -130,8 +138,8 @@ def admin_only(f):
     def decorated(*args, **kwargs):
         # remplace fct inter remplece f,
         # accepte tous args pour s'adapter à n'importe quelle fct décorée
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        # Identité résolue une fois par requête depuis le token
+        if not current_user.is_admin:
             return {'error': 'Admin privileges required'}, 403
         return f(*args, **kwargs)
     # si le admin, on execute fct décorée en passant tous les arg
@@ -188,8 +196,6 @@ class AdminUserResource(Resource):
             JSON containing updated user info.
         """
         updated_user_data = api.payload
-        if 'password' in updated_user_data:
-            updated_user_data['password'] = generate_password_hash(updated_user_data['password'])
         updated_user = facade.update_user(user_id, updated_user_data)
         return {
             'id': updated_user.id,
@@ -263,12 +269,10 @@ class AdminPlaceModify(Resource):
         Returns:
             JSON containing updated place details.
         """
-        current_user = get_jwt_identity()
-        is_admin = current_user.get('is_admin', False)
-        user_id = current_user.get('id')
+        is_admin = current_user.is_admin
 
         place = facade.get_place(place_id)
-        if not is_admin and place.owner_id != user_id:
+        if not is_admin and not current_user.owns(place.owner_id):
             return {'error': 'Unauthorized action'}, 403
 
         update_data = api.payload          # Récupère les nouvelles données
@@ -286,3 +290,73 @@ class AdminPlaceModify(Resource):
             'latitude': updated_place.latitude,
             'longitude': updated_place.longitude
         }, 200
+
+
+@api.route('/import')
+class AdminBulkImport(Resource):
+    @api.doc(params={
+        'batch_size': f'Rows per transaction (default {DEFAULT_BATCH_SIZE})'
+    })
+    @api.response(200, 'Import report with per-line errors')
+    @api.response(400, 'Invalid batch size')
+    @admin_only
+    @handle_errors
+    def post(self):
+        """
+        Bulk import amenities, places and reviews.
+
+        The request body is NDJSON (one JSON object per line, with a
+        "type" key) and is read as a stream. Rows are inserted in batched
+        transactions; invalid rows are reported and skipped.
+
+        Returns:
+            JSON with inserted counts per type and per-line errors.
+        """
+        batch_size = request.args.get(
+            'batch_size', DEFAULT_BATCH_SIZE, type=int)
+        report = facade.bulk_import(request.stream, batch_size)
+        return report, 200
+
+
+@api.route('/cache')
+class AdminCacheStats(Resource):
+    @api.response(200, 'Cache statistics')
+    @admin_only
+    def get(self):
+        """
+        Get the read-through cache statistics.
+
+        Returns:
+            JSON with backend name, hits, misses, hit ratio and size.
+        """
+        return facade.cache.stats(), 200
+
+
+@api.route('/hashing')
+class AdminHashingStats(Resource):
+    @api.response(200, 'Password hashing pool statistics')
+    @admin_only
+    def get(self):
+        """
+        Get the password hashing pool statistics.
+
+        Returns:
+            JSON with bcrypt cost, workers, queue size, current and
+            maximum queue depth, running, completed and rejected hashes.
+        """
+        return password_hasher.stats(), 200
+
+
+@api.route('/tokens')
+class AdminTokenStats(Resource):
+    @api.response(200, 'Refresh token store statistics')
+    @admin_only
+    def get(self):
+        """
+        Get the refresh token store statistics.
+
+        Returns:
+            JSON with backend name, active tokens, tokens issued,
+            rotations and replays detected.
+        """
+        return facade.token_store.stats(), 200
@@ -40,6 +40,10 @@ Usage:
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from app.utils.decorators import handle_errors
+from app.utils.conditional import conditional
+from app.utils.serializers import amenity_serializer
+from app.utils.pagination import (
+    pagination_parser, get_pagination_args, paginated)
 from flask_jwt_extended import jwt_required
 
 
@@ -102,24 +106,39 @@ class AmenityList(Resource):    # Récupération des méthodes par Resource
         }, 201                                                # Création Ok
 
 # --------------------------------------- Route POST & GET : /api/v1/amenities/
+    @api.expect(pagination_parser)
     @api.response(200, 'List of amenites retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
+    @handle_errors
 # ------------------------------ Fonction pour récupérer la liste des amenities
     def get(self):
         """
         Retrieve all amenities.
 
+        Optional query parameters `limit` and `cursor` switch to keyset
+        pagination: the response is then {'items', 'next_cursor'}.
+
         Returns:
             JSON list of amenities, each containing 'id' and 'name'.
             HTTP 200 status.
         """
-        amenities = facade.get_all_amenities()       # Récupération de la liste
-        amenities_list = []                          # Liste vide
-        for amenity in amenities:            # Boucle dans le _storage
-            amenities_list.append({          # Ajoute chaque amenity à la liste
-                'id': amenity.id,
-                'name': amenity.name
-            })
-        return amenities_list, 200           # Return la liste
+        page = get_pagination_args()            # None si pas de pagination
+
+        def build():
+            next_cursor = None
+            if page:
+                # Récupération d'une seule page
+                amenities, next_cursor = facade.get_amenities_page(*page)
+            else:
+                amenities = facade.get_all_amenities()   # Toute la liste
+            # Sérialise chaque amenity ({'id', 'name'})
+            amenities_list = amenity_serializer.many(amenities)
+            if page:
+                return paginated(amenities_list, next_cursor), 200
+            return amenities_list, 200       # Return la liste
+
+        # 304 si la collection n'a pas changé (ETag faible)
+        return conditional(facade.get_version('amenity'), build, weak=True)
 
 
 # ---------------------------- Route GET & PUT : /api/v1/amenities/<amenity_id>
@@ -156,13 +175,16 @@ class AmenityResource(Resource):    # Récupération des méthodes par Resource
         Errors:
             HTTP 404 if the amenity with the given ID does not exist.
         """
-        amenity = facade.get_amenity(amenity_id)   # Récupère l'id de l'amenity
-        if not amenity:                            # Si amenity id pas trouvé
-            return {'error': 'Amenity not found'}, 404                 # Erreur
-        return {                                   # Sinon retourne l'amenity
-            'id': amenity.id,
-            'name': amenity.name
-        }, 200                                     # Récupération OK
+        version = facade.get_version('amenity', amenity_id)
+
+        def build():
+            amenity = facade.get_amenity_detail(amenity_id, version)
+            if not amenity:                        # Si amenity id pas trouvé
+                return {'error': 'Amenity not found'}, 404             # Erreur
+            return amenity, 200                    # Récupération OK
+
+        # 304 si l'amenity n'a pas changé depuis la copie du client
+        return conditional(version, build)
 
 # ---------------------------- Route GET & PUT : /api/v1/amenities/<amenity_id>
     @api.expect(amenity_model, validate=True)
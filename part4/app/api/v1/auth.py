@@ -9,14 +9,18 @@ for JWT-based authentication and authorization.
 Features:
 - User login to obtain access and refresh JWT tokens.
 - Protected endpoint accessible only with a valid access token.
-- Token refresh endpoint to get a new access token using a refresh token.
+- Token refresh endpoint exchanging a refresh token (usable once) for a
+  new access token and the next refresh token.
+- Logout endpoint revoking the token it is called with.
 
 Endpoints:
 - POST   /api/v1/auth/login       : Authenticate user and get JWT tokens.
 - GET    /api/v1/auth/protected   : Access a protected resource
 (requires access token).
-- POST   /api/v1/auth/refresh     : Refresh access token
+- POST   /api/v1/auth/refresh     : Rotate tokens
 (requires refresh token).
+- POST   /api/v1/auth/logout      : Revoke the access or refresh token
+used for the call.
 
 Data Validation:
 - Input data for login is validated against the login_model schema,
@@ -25,7 +29,11 @@ which requires
 
 Error Handling:
 - Invalid login credentials return a 401 Unauthorized response.
+- A full password hashing queue returns 503 with Retry-After.
 - Protected and refresh endpoints require valid JWT tokens.
+- Revoked tokens and tokens of deleted users return 401.
+- A refresh token used twice returns 401 and revokes every refresh token
+  descending from the same login.
 
 Usage:
 - Register this namespace with your Flask-RESTX API instance.
@@ -34,13 +42,15 @@ Usage:
 
 
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
 from flask_jwt_extended import (
     jwt_required,
-    get_jwt_identity,
-    create_refresh_token
+    get_jwt,
+    current_user
 )
+from app.persistence.token_store import TokenReplay
 from app.services import facade
+from app.services.identity import issue_tokens, revoke, rotate_tokens
+from app.utils.hashing import HasherBusy
 
 api = Namespace(  # Namespace permet de regrouper les routes pr une même entité
     'auth',                                            # Le nom du Namespace
@@ -80,30 +90,22 @@ class Login(Resource):
 
         Errors:
             HTTP 401 if credentials are invalid.
+            HTTP 503 if too many logins are being hashed.
         """
         credentials = api.payload     # Récupère les données (email + password)
-        # Recherche et récupère le user par sont email
-        user = facade.get_user_by_email(credentials['email'])
+        try:
+            # Recherche le user par son email et vérifie son password
+            user = facade.authenticate(
+                credentials['email'], credentials['password'])
+        except HasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
 
         # Si je user n'existe pas ou que son password est NOK
-        if not user or not user.verify_password(credentials['password']):
+        if not user:
             return {'error': 'Invalid credentials'}, 401               # Erreur
 
-        # Sinon création d'un token lié par l'user.id
-        access_token = create_access_token(identity={
-            'id': str(user.id),
-            'is_admin': user.is_admin
-        })
-        refresh_token = create_refresh_token(identity={
-            'id': str(user.id),
-            'is_admin': user.is_admin
-        })
-
-        # Retourne le token
-        return {
-            'access_token': access_token,
-            'refresh_token': refresh_token
-        }, 200
+        # Sinon création des tokens liés par l'user.id (nouvelle famille)
+        return issue_tokens(str(user.id), user.is_admin), 200
 
 
 # --------------------------------------------- Fonction pour vérifier le token
@@ -126,28 +128,53 @@ class ProtectedResource(Resource):
             HTTP 401 if access token is missing or invalid.
         """
         # Récupère le user.id par sont token
-        current_user = get_jwt_identity()
-        return {'message': f'Hello, user {current_user["id"]}'}, 200
+        return {'message': f'Hello, user {current_user.id}'}, 200
 
 
 @api.route('/refresh')
 class TokenRefresh(Resource):
     """
-    Resource for refreshing an access JWT token using a refresh token.
+    Resource rotating JWT tokens using a refresh token.
     """
     @jwt_required(refresh=True)
     def post(self):
         """
-        Refresh the access token.
+        Exchange the refresh token for new access and refresh tokens.
+
+        Requires a valid refresh JWT token, which can be used only once.
+
+        Returns:
+            JSON containing the new 'access_token' and 'refresh_token'
+            with HTTP 200.
+
+        Errors:
+            HTTP 401 if refresh token is missing, invalid, revoked or
+            already used (its whole family is then revoked).
+        """
+        try:
+            tokens = rotate_tokens(get_jwt())
+        except TokenReplay:
+            return {'error': 'Refresh token already used, log in again'}, 401
+        if tokens is None:
+            return {'error': 'Refresh token expired or revoked'}, 401
+        return tokens, 200
+
 
-        Requires a valid refresh JWT token.
+@api.route('/logout')
+class Logout(Resource):
+    """
+    Resource revoking a JWT token.
+    """
+    @jwt_required(verify_type=False)
+    def post(self):
+        """
+        Revoke the token sent with the request (access or refresh).
 
         Returns:
-            JSON containing the new 'access_token' with HTTP 200.
+            JSON message with HTTP 200.
 
         Errors:
-            HTTP 401 if refresh token is missing or invalid.
+            HTTP 401 if the token is missing, invalid or already revoked.
         """
-        current_user = get_jwt_identity()
-        new_access_token = create_access_token(identity=current_user)
-        return {'access_token': new_access_token}, 200
+        revoke(get_jwt())               # Le jti est refusé jusqu'à expiration
+        return {'message': 'Token revoked'}, 200
@@ -6,7 +6,10 @@ It supports creating, retrieving, updating, and listing places.
 
 Endpoints:
 - GET, POST /api/v1/places/: List all places or create a new place.
+  Optional filters: min_price, max_price, amenities, amenities_match.
 - GET, PUT /api/v1/places/<place_id>: Retrieve or update a specific place.
+- GET /api/v1/places/search: Full-text search (q) or places around a
+  point (lat, lon, radius_km).
 
 Models:
 - place_model: Schema for place creation with validation.
@@ -17,10 +20,18 @@ Error handling returns appropriate HTTP status codes and messages.
 
 
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.services import facade
-from app.api.v1.users import user_place_model
 from app.utils.decorators import handle_errors
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE, pagination_parser, get_pagination_args, paginated,
+    parse_query_args)
+from app.utils.fieldsets import fieldset_parser, get_shape
+from app.utils.conditional import conditional
+from app.utils.serializers import (
+    place_detail_view, place_list_serializer, register_model)
+from app.utils.streaming import (
+    get_stream_format, stream_response, streaming_parser)
 
 api = Namespace(  # Namespace permet de regrouper les routes pr une même entité
     'places',                           # Le nom du Namespace
@@ -71,26 +82,59 @@ place_update_model = api.model('PlaceUpdate', {    # "model" permet de déclarer
     )
 })
 # ------------------------------------------------ modèle de données détaillées
-place_detail_model = api.model('PlaceDetailModel', {
-    'id': fields.String(),                          # "fields.String" = string
-    'title': fields.String(),                       # "fields.String" = string
-    'description': fields.String(),                 # "fields.String" = string
-    'price': fields.Float(),                        # "fields.Float" = Float
-    'latitude': fields.Float(),                     # "fields.Float" = Float
-    'longitude': fields.Float(),                    # "fields.Float" = Float
-    'owner': fields.Nested(user_place_model),       # "fields.Nested" = Dict
-    # fields.List = une liste qui contient des sous dictionnaires : Nested
-    'amenities': fields.List(fields.Nested(api.model('AmenityMiniModel', {
-        'id': fields.String(),                      # "fields.String" = string
-        'name': fields.String()                     # "fields.String" = string
-    }))),
-    # fields.List = une liste qui contient des sous dictionnaires : Nested
-    'reviews': fields.List(fields.Nested(api.model('ReviewMiniModel', {
-        'id': fields.String(),                      # "fields.String" = string
-        'rating': fields.Integer(),                # "fields.Integer" = Integer
-        'comment': fields.String()                  # "fields.String" = string
-    })))
-})
+# Schéma de sortie partagé (voir app/utils/serializers.py)
+place_detail_model = register_model(api, place_detail_view)
+
+# Paramètres de la recherche : pagination + texte, ou point et rayon
+search_parser = pagination_parser.copy()
+search_parser.add_argument(
+    'q', type=str, location='args', help='Words to search for')
+search_parser.add_argument(
+    'lat', type=float, location='args', help='Latitude of the center')
+search_parser.add_argument(
+    'lon', type=float, location='args', help='Longitude of the center')
+search_parser.add_argument(
+    'radius_km', type=float, location='args', help='Search radius in km')
+
+# Paramètres des filtres de la liste : pagination + prix et amenities
+filter_parser = pagination_parser.copy()
+filter_parser.add_argument(
+    'min_price', type=float, location='args', help='Minimum price')
+filter_parser.add_argument(
+    'max_price', type=float, location='args', help='Maximum price')
+filter_parser.add_argument(
+    'amenities', type=str, action='split', location='args',
+    help='Comma-separated amenity ids')
+filter_parser.add_argument(
+    'amenities_match', type=str, location='args', default='all',
+    choices=('all', 'any'),
+    help="Places must offer 'all' (default) or 'any' of the amenities")
+
+
+# ---------------------------------------------------- Forme des réponses place
+PLACE_FIELDS = (
+    'id', 'title', 'description', 'price', 'latitude', 'longitude',
+    'review_count', 'average_rating')
+PLACE_EMBEDS = ('owner', 'amenities', 'reviews')
+
+
+def get_place_shape():
+    """Requested shape of place responses (everything by default)."""
+    return get_shape(
+        PLACE_FIELDS + ('distance_km', 'score', 'snippet'),
+        PLACE_EMBEDS, default_embed=PLACE_EMBEDS)
+
+
+# ----------------------------------- Construction d'une place pour une liste
+def place_to_list_item(place, shape=None):
+    """
+    Build the listing dictionary of a place (relations preloaded).
+
+    With a shape, only the embedded relations are read (they are the only
+    ones preloaded) and only the requested keys are returned.
+    """
+    # Sans shape : toutes les clés et toutes les relations
+    return place_list_serializer.shaped(shape)(place)
 
 
 # ------------------------------------------ Route POST & GET : /api/v1/places/
@@ -114,8 +158,6 @@ class PlaceList(Resource):             # Récupération des méthodes par Resour
             JSON with new place details and HTTP 201 on success,
             or error message with HTTP 400/403 on failure.
         """
-        # Récupère le token du user courant
-        current_user = get_jwt_identity()
         # Récupère les données client
         place_data = api.payload
 
@@ -123,14 +165,11 @@ class PlaceList(Resource):             # Récupération des méthodes par Resour
         if not place_data.get("owner"):
             return {'error': "Missing or empty 'owner' field"}, 400
 
-        # Récupère le user par l'id passé dans owner
-        owner = facade.get_user(place_data["owner"])
-
-        # Vérifie si le user existe
-        if not owner:
-            return {'error': 'Owner user not found'}, 400
-        # Vérifie si le user courant est le owner
-        elif place_data["owner"] != current_user["id"]:
+        # Vérifie si le user courant (identité du token) est le owner
+        if not current_user.owns(place_data["owner"]):
+            # Récupère le user par l'id passé dans owner
+            if not facade.get_user(place_data["owner"]):
+                return {'error': 'Owner user not found'}, 400
             return {'error': 'Unauthorized action'}, 403
 
         # Si tout est OK création d'une nouvelle place
@@ -147,60 +186,147 @@ class PlaceList(Resource):             # Récupération des méthodes par Resour
             }, 201
 
 # ------------------------------------------ Route POST & GET : /api/v1/places/
+    @api.expect(filter_parser, fieldset_parser, streaming_parser)
     @api.response(200, 'Places found', place_detail_model)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination or filter parameters')
+    @handle_errors
     def get(self):
         """
         Retrieve all places.
 
+        Optional query parameters `limit` and `cursor` switch to keyset
+        pagination: the response is then {'items', 'next_cursor'}.
+
+        Optional filters `min_price`, `max_price` and `amenities` (with
+        `amenities_match` = 'all' or 'any') are applied in SQL; filtered
+        responses are always paginated and add a `facets` key with the
+        number of matching places per amenity.
+
+        Optional `fields` and `embed` select the returned keys and the
+        nested relations (owner, amenities, reviews; all by default).
+
+        The response has a weak ETag and a Last-Modified header; a
+        matching If-None-Match or If-Modified-Since gives a 304.
+
+        The full list can be streamed (`Accept: application/x-ndjson`, or
+        `stream=true` for a chunked JSON array); places are then read and
+        sent in batches, with a flat memory use.
+
         Returns:
             JSON list of places with HTTP 200.
         """
-        places = facade.get_all_places()       # Récupération de la liste
-        places_list = []                       # Liste vide
-
-        for place in places:
-            # Récupérer le owner
-            owner = facade.get_user(place.owner)
-
-            # Construction du dictionnaire owner
-            owner_data = {
-                "id": owner.id,
-                "first_name": owner.first_name,
-                "last_name": owner.last_name,
-                "email": owner.email
-            } if owner else None
-
-            # Construction de la liste des amenities
-            amenities = []
-            for amenity in place.amenities:
-                amenity_data = {}
-                amenity_data["id"] = amenity.id
-                amenity_data["name"] = amenity.name
-                amenities.append(amenity_data)
-
-            # Construction de la liste des reviews
-            reviews = []
-            for review in place.reviews:
-                review_data = {}
-                review_data["id"] = review.id
-                review_data["rating"] = review.rating
-                review_data["text"] = review.text
-                reviews.append(review_data)
-
-            # Construction de la place complète
-            places_list.append({
-                "id": place.id,
-                "title": place.title,
-                "description": place.description,
-                "price": place.price,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "owner": owner_data,
-                "amenities": amenities,
-                "reviews": reviews
-            })
-        return places_list, 200
+        args = parse_query_args(filter_parser)
+        shape = get_place_shape()
+        amenity_ids = [a_id for a_id in args['amenities'] or [] if a_id]
+        filtered = (args['min_price'] is not None or
+                    args['max_price'] is not None or bool(amenity_ids))
+        page = get_pagination_args()            # None si pas de pagination
+        stream_format = get_stream_format()     # None si pas de streaming
+        if stream_format and (page or filtered):
+            raise ValueError(
+                "Streaming cannot be combined with pagination or filters")
+
+        def build():
+            if stream_format:
+                # Les places sont lues par lots et envoyées une par une
+                return stream_response(
+                    (place_to_list_item(place, shape)
+                     for place in facade.stream_places(shape.embed)),
+                    stream_format), 200
+            if filtered:
+                limit, cursor = page or (DEFAULT_PAGE_SIZE, None)
+                places, next_cursor, facets = facade.filter_places(
+                    limit, cursor,
+                    min_price=args['min_price'],
+                    max_price=args['max_price'],
+                    amenity_ids=amenity_ids,
+                    match=args['amenities_match'],
+                    embed=shape.embed)
+                body = paginated(
+                    [place_to_list_item(place, shape) for place in places],
+                    next_cursor)
+                body['facets'] = {'amenities': facets}
+                return body, 200
+
+            next_cursor = None
+            if page:
+                # Récupération d'une seule page (relations préchargées)
+                places, next_cursor = facade.get_places_page(
+                    *page, shape.embed)
+            else:
+                # Récupération de la liste avec les relations demandées
+                places = facade.get_all_places_with_relations(shape.embed)
+            # Construction de la liste des places
+            places_list = [
+                place_to_list_item(place, shape) for place in places]
+            if page:
+                return paginated(places_list, next_cursor), 200
+            return places_list, 200
+
+        # 304 si la collection n'a pas changé (les facettes dépendent des
+        # amenities)
+        embed = shape.embed | {'amenities'} if filtered else shape.embed
+        return conditional(
+            facade.get_version('place', embed=embed), build, weak=True,
+            variant=stream_format or 'json')
+
+
+# ---------------------------------------- Route GET : /api/v1/places/search
+@api.route('/search')                  # Création d'une route
+class PlaceSearch(Resource):           # Récupération des méthodes par Resource
+    """Resource for searching places by text or around a point."""
+    @api.expect(search_parser, fieldset_parser)
+    @api.response(200, 'Places found, best match first')
+    @api.response(400, 'Invalid search parameters')
+    @handle_errors
+    def get(self):
+        """
+        Search places.
+
+        - With `q`: full-text search over titles, descriptions and review
+          texts, ranked by relevance; each item has a `score` and a
+          `snippet` with the matched words between brackets.
+        - With `lat`, `lon` and `radius_km`: places within the radius,
+          nearest first; each item has a `distance_km`.
+
+        Results are always paginated: the response is
+        {'items', 'next_cursor'}. `fields` and `embed` select the returned
+        keys and relations, as on the list endpoint.
+
+        Returns:
+            JSON page of places with HTTP 200,
+            or error message with HTTP 400 on invalid parameters.
+        """
+        args = parse_query_args(search_parser)
+        shape = get_place_shape()
+        limit, cursor = get_pagination_args() or (DEFAULT_PAGE_SIZE, None)
+
+        # Recherche plein texte
+        if args.get('q') is not None:
+            results, next_cursor = facade.search_places_text(
+                args['q'], limit, cursor, shape.embed)
+            items = []
+            for place, score, snippet in results:
+                item = place_to_list_item(place, shape)
+                item['score'] = round(score, 4)
+                item['snippet'] = snippet
+                items.append(shape.apply(item))
+            return paginated(items, next_cursor), 200
+
+        # Recherche par distance
+        for key in ('lat', 'lon', 'radius_km'):
+            if args.get(key) is None:
+                return {'error': f"Missing 'q' or '{key}' parameter"}, 400
+        results, next_cursor = facade.search_places_nearby(
+            args['lat'], args['lon'], args['radius_km'], limit, cursor,
+            shape.embed)
+        items = []
+        for place, distance in results:
+            item = place_to_list_item(place, shape)
+            item['distance_km'] = round(distance, 3)
+            items.append(shape.apply(item))
+        return paginated(items, next_cursor), 200
 
 
 # --------------------------------- Route GET & PUT : /api/v1/places/<place_id>
@@ -211,11 +337,21 @@ class PlaceResource(Resource):         # Récupération des méthodes par Resour
     @api.response(200, 'Place details retrieved successfully')  # OK
     @api.response(404, 'Place not found')                       # NOK
     @api.response(404, 'Owner not found')                       # NOK
+    @api.expect(fieldset_parser)
 # -------------------------------- Fonction pour récupérer une place par son id
+    @handle_errors
     def get(self, place_id):
         """
         Retrieve place details by ID.
 
+        The detail view is served from the read-through cache and
+        invalidated by any write to the place, its reviews or amenities.
+        Optional `fields` and `embed` select the returned keys and the
+        nested relations. The response has a strong ETag (following the
+        place and all its relations, like the cached view) and a
+        Last-Modified header; a matching If-None-Match or
+        If-Modified-Since gives a 304.
+
         Args:
             place_id (str): The ID of the place to retrieve.
 
@@ -223,43 +359,19 @@ class PlaceResource(Resource):         # Récupération des méthodes par Resour
             JSON with place and owner details and HTTP 200 on success,
             or error message with HTTP 404 if not found.
         """
-        place = facade.get_place(place_id)        # Récupère l'id de la place
-        if not place:                             # Si pas trouvé = Erreur
-            return {'error': 'Place not found'}, 404
+        shape = get_place_shape()
+        # Version de la vue complète (celle du cache), quel que soit embed
+        version = facade.get_place_detail_version(place_id)
 
-        owner = facade.get_user(place.owner)      # Récupère le owner
-        if not owner:                             # Si il n'existe pas = Erreur
-            return {'error': 'Owner not found'}, 404
-        amenities = []
-        for amenity in place.amenities:
-            amenity_data = {}
-            amenity_data["id"] = amenity.id
-            amenity_data["name"] = amenity.name
-            amenities.append(amenity_data)
-        reviews = []
-        for review in place.reviews:
-            review_data = {}
-            review_data["id"] = review.id
-            review_data["rating"] = review.rating
-            review_data["comment"] = review.text
-            reviews.append(review_data)
+        def build():
+            # Détail (via le cache), avec seulement les relations demandées
+            place = facade.get_place_detail(place_id, shape.embed, version)
+            if not place:                         # Si pas trouvé = Erreur
+                return {'error': 'Place not found'}, 404
+            return shape.apply(place), 200              # Récupération OK
 
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner': {
-                'id': owner.id,
-                'first_name': owner.first_name,
-                'last_name': owner.last_name,
-                'email': owner.email
-            },
-            'amenities': amenities,
-            'reviews': reviews
-        }, 200                                          # Récupération OK
+        # 304 si ni la place ni ses relations n'ont changé
+        return conditional(version, build)
 
 # --------------------------------- Route GET & PUT : /api/v1/places/<place_id>
     @api.expect(place_update_model, validate=True)
@@ -284,12 +396,11 @@ class PlaceResource(Resource):         # Récupération des méthodes par Resour
             JSON with updated place details and HTTP 200 on success,
             or error message with HTTP 400/403/404 on failure.
         """
-        current_user = get_jwt_identity()
         place = facade.get_place(place_id)  # Récupère la place par sont id
-        if str(place.owner) != current_user['id']:
-            return {'error': 'Unauthorized action'}, 403
-        elif not place:              # Si la place n'est pas trouvée = Erreur
+        if not place:                # Si la place n'est pas trouvée = Erreur
             return {'error': 'Place not found'}, 404
+        elif not current_user.owns(place.owner):
+            return {'error': 'Unauthorized action'}, 403
         update_data = api.payload          # Récupère les nouvelles données
         # Vérification que un champ owner est été remplis
         if 'owner' in update_data:
@@ -19,11 +19,18 @@ Models:
 """
 
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.services import facade
 from app.api.v1.users import user_model
 from app.api.v1.amenities import amenity_model
 from app.utils.decorators import handle_errors
+from app.utils.pagination import (
+    pagination_parser, get_pagination_args, paginated)
+from app.utils.fieldsets import fieldset_parser, get_shape
+from app.utils.conditional import conditional
+from app.utils.serializers import review_serializer
+from app.utils.streaming import (
+    get_stream_format, stream_response, streaming_parser)
 
 api = Namespace(  # Namespace permet de regrouper les routes pr une même entité
     'reviews',    # Le nom du Namespace
@@ -103,6 +110,22 @@ review_place_model = api.model('ReviewPlacemodel', {
 })
 
 
+# --------------------------------------------------- Forme des réponses review
+REVIEW_FIELDS = ('id', 'place_id', 'user_id', 'text', 'rating')
+REVIEW_EMBEDS = ('user', 'place')
+
+
+def get_review_shape():
+    """Requested shape of review responses (no relation by default)."""
+    return get_shape(REVIEW_FIELDS, REVIEW_EMBEDS)
+
+
+def review_to_item(review, shape):
+    """Build the dictionary of a review with the requested shape."""
+    # Les relations ne sont sérialisées (et chargées) que si demandées
+    return review_serializer.shaped(shape)(review)
+
+
 # ----------------------------------------- Route POST & GET : /api/v1/reviews/
 @api.route('/')                 # Création d'une route
 class ReviewList(Resource):     # "Resource" = methodes requête (POST, GET, ..)
@@ -146,9 +169,8 @@ class ReviewList(Resource):     # "Resource" = methodes requête (POST, GET, ..)
             400 if user is not allowed to review,
             404 if the place does not exist.
         """
-        current_user = get_jwt_identity()
-        # Récupère l'identité de l'utilisateur connecté via le token JWT
-        user_id = current_user['id']
+        # Identité de l'utilisateur connecté, résolue depuis le token JWT
+        user_id = current_user.id
         review_data = api.payload      # Récup les datas envoyées par le client
         # Extrait l'ID du lieu depuis les données
         place_id = (
@@ -163,10 +185,8 @@ class ReviewList(Resource):     # "Resource" = methodes requête (POST, GET, ..)
         # L'utilisateur ne peut pas commenter son propre lieu
         if place.owner == user_id:
             return {'error': 'You cannot review your own place'}, 400
-        # Récupère les avis existants pour ce lieu
-        existing_reviews = facade.get_reviews_by_place(place_id)
         # Vérifie si l'utilisateur a déjà laissé un avis pour ce lieu
-        if any(review.user_id == user_id for review in existing_reviews):
+        if facade.get_review_by_user_and_place(user_id, place_id):
             return {'error': 'You have already reviewed this place'}, 400
         # Si tout est valide, crée un nouvel avis avec les donnéesfournies
         new_review = facade.create_review(review_data)
@@ -180,30 +200,59 @@ class ReviewList(Resource):     # "Resource" = methodes requête (POST, GET, ..)
             }, 201                              # Création OK
 
 # ----------------------------------------- Route POST & GET : /api/v1/reviews/
+    @api.expect(pagination_parser, fieldset_parser, streaming_parser)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
+    @handle_errors
 # -------------------------------- Fonction pour récupérer la liste des reviews
     def get(self):
         """
         Retrieve all reviews.
 
         Returns a list of all reviews with their details.
+        Optional query parameters `limit` and `cursor` switch to keyset
+        pagination: the response is then {'items', 'next_cursor'}.
+        Optional `fields` and `embed` (user, place) select the returned
+        keys and nested relations. A matching If-None-Match or
+        If-Modified-Since gives a 304 (weak ETag).
+        The full list can be streamed (`Accept: application/x-ndjson`, or
+        `stream=true` for a chunked JSON array).
 
         Returns:
             200 with a list of reviews.
         """
-        # Récupère les reviews dans le _storage
-        reviews = facade.get_all_reviews()
-        reviews_list = []                  # Crée une liste vide
-        for review in reviews:             # Boucle dans le storage
-            reviews_list.append({          # Ajoute chaque review dans la liste
-                'id': review.id,
-                'place_id': review.place_id,
-                'user_id': review.user_id,
-                'text': review.text,
-                'rating': review.rating
-            })
-
-        return reviews_list, 200           # Return la liste
+        shape = get_review_shape()
+        page = get_pagination_args()            # None si pas de pagination
+        stream_format = get_stream_format()     # None si pas de streaming
+        if stream_format and page:
+            raise ValueError("Streaming cannot be combined with pagination")
+
+        def build():
+            if stream_format:
+                # Les reviews sont lues par lots et envoyées une par une
+                return stream_response(
+                    (review_to_item(review, shape)
+                     for review in facade.stream_reviews(shape.embed)),
+                    stream_format), 200
+            next_cursor = None
+            if page:
+                # Récupère une seule page de reviews
+                reviews, next_cursor = facade.get_reviews_page(
+                    *page, shape.embed)
+            else:
+                # Récupère toutes les reviews
+                reviews = facade.get_all_reviews(shape.embed)
+            # Construit chaque review avec la forme demandée
+            reviews_list = [
+                review_to_item(review, shape) for review in reviews]
+
+            if page:
+                return paginated(reviews_list, next_cursor), 200
+            return reviews_list, 200       # Return la liste
+
+        return conditional(
+            facade.get_version('review', embed=shape.embed), build,
+            weak=True, variant=stream_format or 'json')
 
 
 # ----------------------- Route GET, PUT & DELETE : /api/v1/reviews/<review_id>
@@ -221,8 +270,10 @@ class ReviewResource(Resource):        # Récupération des méthodes par Resour
     DELETE:
         Delete an existing review owned by the authenticated user.
     """
+    @api.expect(fieldset_parser)
     @api.response(200, 'Review details retrieved successfully')     # OK
     @api.response(404, 'Review not found')                          # NOK
+    @api.response(400, 'Invalid fields or embed')                   # NOK
     @handle_errors
 # -------------------------------- Fonction pour récupérer un review par son id
     def get(self, review_id):
@@ -236,17 +287,17 @@ class ReviewResource(Resource):        # Récupération des méthodes par Resour
             200 with review data on success,
             404 if review not found.
         """
-    # Récupère l'id par la façade
-        review = facade.get_review(review_id)
-        if not review:                      # Si la review n'est pas trouvé
-            return {'error': 'Review not found'}, 404           # Erreur
-        return {                            # Sinon retourne le review
-            'id': review.id,
-            'place_id': review.place_id,
-            'user_id': review.user_id,
-            'text': review.text,
-            'rating': review.rating
-        }, 200
+        shape = get_review_shape()
+
+        def build():
+            # Récupère l'id par la façade
+            review = facade.get_review(review_id)
+            if not review:                  # Si la review n'est pas trouvé
+                return {'error': 'Review not found'}, 404       # Erreur
+            return review_to_item(review, shape), 200  # Retourne le review
+
+        return conditional(
+            facade.get_version('review', review_id, shape.embed), build)
 
 # ----------------------- Route GET, PUT & DELETE : /api/v1/reviews/<review_id>
     # Vérifie avec review_update_model
@@ -277,8 +328,7 @@ class ReviewResource(Resource):        # Récupération des méthodes par Resour
             404 if review not found,
             400 if payload invalid.
         """
-        current_user = get_jwt_identity()
-        user_id = current_user['id']
+        user_id = current_user.id
         # Try to find the review in the database
         review = facade.get_review_by_id(review_id)
         if not review:
@@ -315,8 +365,7 @@ class ReviewResource(Resource):        # Récupération des méthodes par Resour
             403 if user does not own the review,
             404 if review not found.
         """
-        current_user = get_jwt_identity()
-        user_id = current_user['id']
+        user_id = current_user.id
         review = facade.get_review_by_id(review_id)
         if not review:
             return {'error': "Review not found"}, 404
@@ -339,8 +388,11 @@ class ReviewsByPlace(Resource):        # Récupération des méthodes par Resour
     GET:
         Retrieve all reviews associated with the specified place ID.
     """
+    @api.expect(fieldset_parser)
     @api.response(200, 'List of reviews for the specified place')   # OK
     @api.response(404, 'Place not found')                           # NOK
+    @api.response(400, 'Invalid fields or embed')                   # NOK
+    @handle_errors
     def get(self, place_id):
         """
         Get all reviews for a specific place.
@@ -352,18 +404,16 @@ class ReviewsByPlace(Resource):        # Récupération des méthodes par Resour
             200: A list of reviews for the specified place.
             404: Error if the place is not found.
         """
+        shape = get_review_shape()
         place = facade.get_place(place_id)      # Récupère la place par son id
         if not place:                  # Si la place n'est pas trouvée = Erreur
             return {'error': 'Place not found'}, 404
-        # Récupère les reviews via l'id de la place
-        reviews = facade.get_reviews_by_place(place_id)
-        reviews_place_list = []
-        for review in reviews:
-            reviews_place_list.append({
-                'id': review.id,
-                'place_id': review.place_id,
-                'user_id': review.user_id,
-                'text': review.text,
-                'rating': review.rating
-            })
-        return reviews_place_list, 200          # Return la liste
+
+        def build():
+            # Récupère les reviews via l'id de la place
+            reviews = facade.get_reviews_by_place(place_id, shape.embed)
+            return [review_to_item(review, shape) for review in reviews], 200
+
+        return conditional(
+            facade.get_place_reviews_version(place_id, shape.embed), build,
+            weak=True)
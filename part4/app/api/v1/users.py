@@ -15,9 +15,15 @@ Models:
 - user_update_model: Request schema for updating user information.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.services import facade
 from app.utils.decorators import handle_errors
+from app.utils.pagination import (
+    pagination_parser, get_pagination_args, paginated)
+from app.utils.fieldsets import fieldset_parser, get_shape
+from app.utils.conditional import conditional
+from app.utils.serializers import (
+    owner_view, register_model, user_serializer)
 
 api = Namespace(
     'users',
@@ -48,24 +54,8 @@ user_model = api.model('User', {                # "model" permet de déclarer
         description='User pass_word of new user will be hashed automatically'
     )
 })
-user_place_model = api.model('UserPlaceModel', {   # "model" permet de déclarer
-    'id': fields.String(                         # "fields.String" = string
-        required=True,                           # Champ obligatoire
-        description='Unique identifier of the user'  # Description
-    ),
-    'first_name': fields.String(                 # "fields.String" = string
-        required=True,                           # Champ obligatoire
-        description='First name of the user'     # Description
-    ),
-    'last_name': fields.String(                  # "fields.String" = string
-        required=True,                           # Champ obligatoire
-        description='Last name of the user'      # Description
-    ),
-    'email': fields.String(                      # "fields.String" = string
-        required=True,                           # Champ obligatoire
-        description='Email of the user'          # Description
-    )
-})
+# Schéma de sortie partagé (voir app/utils/serializers.py)
+user_place_model = register_model(api, owner_view)
 user_update_model = api.model('UserUpdate', {
     'first_name': fields.String(
         required=False,
@@ -82,6 +72,22 @@ user_update_model = api.model('UserUpdate', {
 })
 
 
+# ----------------------------------------------------- Forme des réponses user
+USER_FIELDS = ('id', 'first_name', 'last_name', 'email', 'is_admin')
+USER_EMBEDS = ('places',)
+
+
+def get_user_shape():
+    """Requested shape of user responses (no relation by default)."""
+    return get_shape(USER_FIELDS, USER_EMBEDS)
+
+
+def user_to_item(user, shape):
+    """Build the dictionary of a user with the requested shape."""
+    # Les places ne sont sérialisées (et chargées) que si demandées
+    return user_serializer.shaped(shape)(user)
+
+
 # ------------------------------------------- Route POST & GET : /api/v1/users/
 @api.route('/')                 # Création d'une route
 class UserList(Resource):       # "Resource" = methodes requête (POST, GET, ..)
@@ -106,35 +112,75 @@ class UserList(Resource):       # "Resource" = methodes requête (POST, GET, ..)
             }, 201                                                # Création Ok
 
 # ------------------------------------------ Route POST & GET : /api/v1/users/
+    @api.expect(pagination_parser, fieldset_parser)
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
+    @handle_errors
     def get(self):
         """
         Retrieve all users.
 
         Returns a list of all users in the system.
+        Optional query parameters `limit` and `cursor` switch to keyset
+        pagination: the response is then {'items', 'next_cursor'}.
+        Optional `fields` and `embed` (places) select the returned keys
+        and nested relations.
         """
-        users = facade.get_all_users()    # Récupère les users dans le _storage
-        users_list = [user.to_dict() for user in users]
-        return users_list, 200        # Retourne la liste avec code 200
+        shape = get_user_shape()
+        page = get_pagination_args()            # None si pas de pagination
+
+        def build():
+            if page:
+                users, next_cursor = facade.get_users_page(
+                    *page, shape.embed)
+                return paginated(
+                    [user_to_item(user, shape) for user in users],
+                    next_cursor), 200
+            # Récupère les users avec les relations demandées
+            users = facade.get_all_users(shape.embed)
+            users_list = [user_to_item(user, shape) for user in users]
+            return users_list, 200    # Retourne la liste avec code 200
+
+        # 304 si la collection n'a pas changé (ETag faible)
+        return conditional(
+            facade.get_version('user', embed=shape.embed), build, weak=True)
 
 
 # ----------------------------------- Route GET & PUT : /api/v1/users/<user_id>
 @api.route('/<user_id>')        # Création d'une route
 class UserResource(Resource):   # Récupération des méthodes par Resource
     """Handles operations on a single user identified by user_id (GET, PUT)."""
+    @api.expect(fieldset_parser)
     @api.response(200, 'User details retrieved successfully')   # OK
     @api.response(404, 'User not found')                        # NOK
+    @api.response(400, 'Invalid fields or embed')               # NOK
 # ---------------------------------- Fonction pour récupérer un user par son id
+    @handle_errors
     def get(self, user_id):
         """
         Retrieve a user by ID.
 
         Returns user details if the user exists, or a 404 error if not found.
+        Optional `fields` and `embed` (places) select the returned keys
+        and nested relations.
         """
-        user = facade.get_user(user_id)           # Récupère l'id par la façade
-        if not user:                                    # Si user id pas trouvé
-            return {'error': 'User not found'}, 404     # Erreur
-        return user.to_dict(), 200                      # Sinon return le user
+        shape = get_user_shape()
+        version = facade.get_version('user', user_id, shape.embed)
+
+        def build():
+            if shape.embeds('places'):
+                # Vue non mise en cache : charge le user et ses places
+                user = facade.get_user(user_id)
+                if not user:
+                    return {'error': 'User not found'}, 404
+                return user_to_item(user, shape), 200
+            user = facade.get_user_detail(user_id, version)   # Via le cache
+            if not user:                                # Si id pas trouvé
+                return {'error': 'User not found'}, 404     # Erreur
+            return shape.apply(user), 200               # Sinon return le user
+
+        # 304 si le user (et ses places affichées) n'a pas changé
+        return conditional(version, build)
 
 # ----------------------------------- Route GET & PUT : /api/v1/users/<user_id>
     @api.expect(user_update_model, validate=True)
@@ -151,9 +197,8 @@ class UserResource(Resource):   # Récupération des méthodes par Resource
         Only the authenticated user can update their own profile.
         Accepts partial updates of first name, last name, or email.
         """
-        current_user = get_jwt_identity()
         update_data = api.payload              # Récupère nouvelles données
-        if user_id != current_user['id']:
+        if not current_user.owns(user_id):
             return {'error': 'Unauthorized action'}, 403
             # Vérifie les nouvelles données et si OK modifie le user
         updated_user = facade.update_user(user_id, update_data)
@@ -0,0 +1,170 @@
+"""
+ASGI variant of the read endpoints of places, reviews and amenities.
+
+AsyncReadAPI is a plain ASGI application (no framework) serving, through
+AsyncHBnBFacade, the same paths, bodies and errors as the Flask API:
+
+- GET /api/v1/places/ and /api/v1/places/<place_id>
+- GET /api/v1/reviews/ and /api/v1/reviews/<review_id>
+- GET /api/v1/amenities/ and /api/v1/amenities/<amenity_id>
+
+List endpoints accept the `limit` and `cursor` pagination parameters;
+without them they return the full list. The other parameters of the
+Flask API (fields, embed, filters, streaming) and the HTTP validators
+(ETag, 304) are not implemented: such requests get a 400.
+
+It is meant to run next to the Flask app, the reverse proxy sending the
+GET requests of these paths to it and everything else (writes, users,
+auth, search) to gunicorn. Waiting for the database does not hold a
+thread, so one process keeps many slow reads in flight; CPU-bound work
+(serialization, bcrypt) gains nothing from it.
+
+create_async_app() builds it from the same configuration classes as
+create_app() (see asgi_read.py).
+"""
+import re
+from urllib.parse import parse_qs
+from app.utils.pagination import check_pagination, paginated
+from app.utils.serializers import make_encoder
+
+# /api/v1/<ressource>/ ou /api/v1/<ressource>/<id>
+ROUTE = re.compile(r'^/api/v1/(places|reviews|amenities)/([^/]*)$')
+READ_METHODS = ('GET', 'HEAD')
+PAGINATION_PARAMS = ('limit', 'cursor')
+
+
+def parse_query(query_string):
+    """
+    Pagination of a query string, as get_pagination_args() does.
+
+    Returns:
+    - None if the request is not paginated, else a (limit, cursor) tuple.
+
+    Raises:
+    - ValueError: If a parameter is unsupported or invalid.
+    """
+    args = parse_qs(query_string.decode('latin-1'), keep_blank_values=True)
+    unsupported = sorted(set(args) - set(PAGINATION_PARAMS))
+    if unsupported:
+        raise ValueError(f"Unsupported parameter: {', '.join(unsupported)}")
+    limit, cursor = args.get('limit', [None])[0], args.get('cursor', [''])[0]
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+    return check_pagination(limit, cursor)
+
+
+class AsyncReadAPI:
+    """
+    ASGI application of the read endpoints.
+
+    Parameters:
+    - facade: The AsyncHBnBFacade reading the database.
+    - encode: JSON encoder, encode(data) -> bytes (see make_encoder).
+    """
+    def __init__(self, facade, encode):
+        self.facade = facade
+        self.encode = encode
+        # Ressource -> (liste complète, page, détail, message 404)
+        self.resources = {
+            'places': (facade.get_all_places, facade.get_places_page,
+                       facade.get_place_detail, 'Place not found'),
+            'reviews': (facade.get_all_reviews, facade.get_reviews_page,
+                        facade.get_review_detail, 'Review not found'),
+            'amenities': (facade.get_all_amenities,
+                          facade.get_amenities_page,
+                          facade.get_amenity_detail, 'Amenity not found'),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        status, data, headers = await self.respond(
+            scope['method'], scope['path'], scope['query_string'])
+        # Même format que Flask-RESTX : '\n' final
+        body = self.encode(data) + b'\n'
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('ascii')),
+                *headers],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'' if scope['method'] == 'HEAD' else body,
+        })
+
+    async def respond(self, method, path, query_string):
+        """
+        Status, JSON data and extra headers of a request.
+
+        Parameters:
+        - method: HTTP method.
+        - path: Decoded path of the URL.
+        - query_string: Raw query string (bytes).
+
+        Returns:
+        - A tuple (status, data, headers).
+        """
+        match = ROUTE.match(path)
+        if not match:
+            return 404, {'error': 'Not found'}, []
+        if method not in READ_METHODS:
+            return 405, {'error': 'Method not allowed'}, [
+                (b'allow', ', '.join(READ_METHODS).encode('ascii'))]
+        get_all, get_page, get_detail, not_found = self.resources[match[1]]
+        try:
+            page = parse_query(query_string)
+            if match[2]:
+                if page:
+                    raise ValueError("Unsupported parameter: limit, cursor")
+                detail = await get_detail(match[2])
+                if detail is None:
+                    return 404, {'error': not_found}, []
+                return 200, detail, []
+            if page:
+                return 200, paginated(*await get_page(*page)), []
+            return 200, await get_all(), []
+        except ValueError as e:
+            return 400, {'error': str(e)}, []
+
+    async def lifespan(self, receive, send):
+        """ASGI lifespan: close the database connections at shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.facade.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_async_app(config_class='config.DevelopmentConfig'):
+    """
+    Build the ASGI read API of a configuration.
+
+    The Flask app of the same configuration is built first: it resolves
+    the database URLs (instance/ folder) and holds the settings read by
+    the async engines and the JSON encoder.
+
+    Raises:
+    - ValueError: If the database is in memory.
+    - RuntimeError: If 'greenlet' or the async driver is not installed.
+    """
+    from app import create_app
+    from app.persistence.async_repository import make_async_engines
+    from app.services.async_facade import AsyncHBnBFacade
+
+    flask_app = create_app(config_class)
+    engine, replicas = make_async_engines(flask_app)
+    return AsyncReadAPI(
+        AsyncHBnBFacade(engine, replicas),
+        make_encoder(flask_app.config.get('JSON_BACKEND', 'auto')))
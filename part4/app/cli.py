@@ -0,0 +1,115 @@
+"""
+Flask CLI commands for the HBnB application.
+
+Commands are registered on the app by create_app() and run with:
+    flask --app run <command>
+"""
+import json
+import time
+import click
+from flask import current_app
+from app.extensions import db
+from app.persistence import migrations, search_index
+from app.services import facade
+from app.services.bulk_import import DEFAULT_BATCH_SIZE
+from app.utils import compression
+
+
+@click.command('init-db')
+def init_db():
+    """Create the missing tables and upgrade the schema of the database.
+
+    Run it before starting the server, and again after each upgrade of
+    the application: missing columns, indexes and search tables are
+    added to existing tables (see app/persistence/migrations.py). It can
+    be run any number of times.
+    """
+    try:
+        changes = migrations.upgrade(db.session.connection())
+    except migrations.MigrationError as e:
+        db.session.rollback()
+        raise click.ClickException(str(e))
+    db.session.commit()
+    for change in changes:
+        click.echo(change)
+    click.echo(f"Tables ready: {len(db.metadata.tables)}")
+
+
+@click.command('import-ndjson')
+@click.argument('source', type=click.File('rb'))
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Rows per transaction.')
+def import_ndjson(source, batch_size):
+    """Bulk import amenities, places and reviews from an NDJSON file.
+
+    Use - as SOURCE to read from standard input.
+    """
+    start = time.perf_counter()
+    report = facade.bulk_import(source, batch_size)
+    elapsed = time.perf_counter() - start
+    total = sum(report['inserted'].values())
+    click.echo(json.dumps(report, indent=2))
+    click.echo(f"{total} rows inserted in {elapsed:.2f}s "
+               f"({total / elapsed if elapsed else 0:.0f} rows/s)", err=True)
+
+
+@click.command('backfill-ratings')
+def backfill_ratings():
+    """Recompute review_count and rating_sum of every place.
+
+    Needed once after init-db added the two columns, or after writing
+    reviews without the facade.
+    """
+    count = facade.backfill_rating_aggregates()
+    click.echo(f"Rating aggregates recomputed for {count} places")
+
+
+@click.command('backfill-geohash')
+def backfill_geohash():
+    """Compute the missing geohashes used by the geo search.
+
+    Needed once after init-db added the _geohash column, or after
+    writing places without the models.
+    """
+    count = facade.backfill_geohashes()
+    click.echo(f"Geohash computed for {count} places")
+
+
+@click.command('rebuild-search-index')
+def rebuild_search_index():
+    """Rebuild the full-text search index from places and reviews.
+
+    Needed after writing to places/reviews with the triggers disabled.
+    """
+    search_index.rebuild(db.session.connection())
+    db.session.commit()
+    click.echo("Search index rebuilt")
+
+
+@click.command('compress-frontend')
+@click.option('--min-size', type=int, show_default=True,
+              default=compression.DEFAULT_MIN_SIZE,
+              help='Smaller files are served as is (bytes).')
+def compress_frontend(min_size):
+    """Write .br/.gz variants of the frontend assets (build step).
+
+    Only changed files are compressed again; run it after every
+    frontend change, or as part of the deployment.
+    """
+    root = current_app.config['FRONTEND_DIR']
+    for path, size, sizes in compression.precompress_directory(
+            root, min_size):
+        variants = ', '.join(
+            f"{encoding} {compressed} B" for encoding, compressed in
+            sizes.items()) or 'kept as is'
+        click.echo(f"{path}: {size} B -> {variants}")
+
+
+def register_commands(app):
+    """Attach the CLI commands to the Flask app."""
+    app.cli.add_command(init_db)
+    app.cli.add_command(import_ndjson)
+    app.cli.add_command(backfill_ratings)
+    app.cli.add_command(backfill_geohash)
+    app.cli.add_command(rebuild_search_index)
+    app.cli.add_command(compress_frontend)
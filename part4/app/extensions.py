@@ -1,7 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from app.persistence.routing import RoutingSession
+from app.utils.hashing import PasswordHasher
 
-db = SQLAlchemy()
+# Lectures envoyées aux réplicas, écritures à la base principale
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+password_hasher = PasswordHasher()
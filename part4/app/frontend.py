@@ -0,0 +1,38 @@
+"""
+Static frontend served by the API process, under /frontend/.
+
+Files come from FRONTEND_DIR (part4/frontend by default). When the build
+step `flask compress-frontend` has written a .br or .gz variant of a file
+and the client accepts that encoding, the variant is sent as is, with
+Content-Encoding set: nothing is compressed per request. Other files are
+sent unchanged.
+"""
+import mimetypes
+import os
+from flask import Blueprint, abort, current_app, request, send_file
+from werkzeug.security import safe_join
+from app.utils.compression import SUFFIXES, negotiate
+
+bp = Blueprint('frontend', __name__, url_prefix='/frontend')
+
+
+@bp.route('/', defaults={'filename': 'index.html'})
+@bp.route('/<path:filename>')
+def asset(filename):
+    """Send a frontend file, or its precompressed variant."""
+    path = safe_join(current_app.config['FRONTEND_DIR'], filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    # Variantes présentes sur le disque, par ordre de préférence
+    variants = [encoding for encoding, suffix in SUFFIXES.items()
+                if os.path.isfile(path + suffix)]
+    encoding = negotiate(request.accept_encodings, variants)
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = send_file(
+        path + SUFFIXES[encoding] if encoding else path,
+        mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if variants:
+        response.vary.add('Accept-Encoding')
+    return response
@@ -1,5 +1,6 @@
 """Abstract base model with id, timestamps, and basic methods."""
 from app.extensions import db
+from app.persistence.unit_of_work import save
 from datetime import datetime
 import uuid
 
@@ -16,13 +17,15 @@ class BaseModel(db.Model):
     created_at = db.Column(            # Création de la colonne 'created_at'
         db.DateTime,                   # Value = DateTime
         default=datetime.now,          # Value par défaut = date/heure actuelle
-        nullable=False)                # Ne peux pas être NULL
+        nullable=False,                # Ne peux pas être NULL
+        index=True)                    # Index pour la pagination par curseur
 
     updated_at = db.Column(           # Création de la colonne 'updated_at'
         db.DateTime,                  # Value = DateTime
         default=datetime.now,         # Value par défaut = date/heure actuelle
         onupdate=datetime.now,        # Value mise à jour = date/heure actuelle
-        nullable=False)               # Ne peux pas être NULL
+        nullable=False,               # Ne peux pas être NULL
+        index=True)                   # Index pour max(updated_at) (ETag)
 
 # --------------------------------------- Définition des attributs de la classe
     def __init__(self):
@@ -33,8 +36,12 @@ class BaseModel(db.Model):
 
 # ---------------------------------------------------------- Méthode de classe
     # Mise à jour et sauvegarde des champs de Base_model
-    def update(self, data):
-        """Update attributes from a dictionary and commit the changes."""
+    def update(self, data, commit=True):
+        """Update attributes from a dictionary and commit the changes.
+
+        With commit=False, or inside a unit of work, changes are only
+        flushed and committed by the enclosing transaction.
+        """
         # Boucle sur chaque clé et valeur dans le dictionnaire data
         for key, value in data.items():
             # Vérifie si la key/value existe dans la BDD
@@ -44,4 +51,4 @@ class BaseModel(db.Model):
             setattr(self, key, value)           # Modifie la mémoire
 
         self.updated_at = datetime.now()        # Récupère la datetime actuelle
-        db.session.commit()                     # Envoie à la BDD
+        save(commit)                            # Envoie à la BDD
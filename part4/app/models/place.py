@@ -6,6 +6,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy import CheckConstraint
 from .place_amenity import place_amenity
 from .base_model import BaseModel
+from app.utils import geo
 
 
 class Place(BaseModel):
@@ -24,7 +25,8 @@ class Place(BaseModel):
     _price = db.Column(                  # Création de la colonne 'price'
         "_price",                         # Nom pour les checkContraint
         db.Float(),                      # Value = Float
-        nullable=False)                  # Ne peux pas être NULL
+        nullable=False,                  # Ne peux pas être NULL
+        index=True)                      # Index pour les filtres de prix
 
     _latitude = db.Column(               # Création de la colonne 'latitude'
         "_latitude",                      # Nom pour les checkContraint
@@ -36,6 +38,29 @@ class Place(BaseModel):
         db.Float(),                      # Value = Float
         nullable=False)                  # Ne peux pas être NULL
 
+    _geohash = db.Column(                # Geohash des coordonnées
+        db.String(12),                   # Value = String -> 12 char max
+        nullable=True,                   # NULL tant que non calculé
+        index=True)                      # Index pour la recherche par zone
+
+    _search_rowid = db.Column(           # Clé de la ligne dans places_fts
+        db.Integer(),                    # Value = Integer (stable)
+        nullable=True,                   # Rempli par le trigger d'insertion
+        server_default=db.FetchedValue(),  # Valeur écrite par SQLite
+        index=True, unique=True)         # Index unique pour la jointure
+
+    review_count = db.Column(            # Nombre de reviews (dénormalisé)
+        db.Integer(),                    # Value = Integer
+        nullable=False,                  # Ne peux pas être NULL
+        default=0,                       # Aucune review à la création
+        server_default='0')              # Valeur par défaut côté SQL
+
+    rating_sum = db.Column(              # Somme des notes (dénormalisée)
+        db.Integer(),                    # Value = Integer
+        nullable=False,                  # Ne peux pas être NULL
+        default=0,                       # Aucune note à la création
+        server_default='0')              # Valeur par défaut côté SQL
+
     owner_id = db.Column(                # Création de la colonne 'owner_id'
         db.String(),                     # Value = String
         db.ForeignKey("users.id"),       # Relie Place à users.id
@@ -65,7 +90,12 @@ class Place(BaseModel):
             name='check_latitude_range'),
         CheckConstraint(
             '_longitude >= -180 AND _longitude <= 180',
-            name='check_longitude_range'))
+            name='check_longitude_range'),
+        # Un owner ne peut pas avoir deux places identiques
+        db.Index(
+            'ix_places_owner_title_coords',
+            'owner_id', '_title', '_latitude', '_longitude',
+            unique=True))
 
 # --------------------------------------- Définition des attributs de la classe
     def __init__(self, title, price, latitude,
@@ -78,6 +108,8 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner_id = owner.id
+        self.review_count = 0
+        self.rating_sum = 0
 
 # ---------------------------------------- Représentation visuelle de la classe
     def __repr__(self):
@@ -179,6 +211,7 @@ class Place(BaseModel):
             raise ValueError("Latitude must be between -90.0 and 90.0.")
         # Si tout est OK passe value en float et à l'attribut 'latitude'
         self._latitude = float(value)
+        self._update_geohash()
 
 # ----------------------------------------------------- Gestion de la longitude
     @hybrid_property
@@ -197,6 +230,24 @@ class Place(BaseModel):
             raise ValueError("Longitude must be between -180.0 and 180.0.")
         # Si tout est OK passe value en float et à l'attribut 'longitude'
         self._longitude = float(value)
+        self._update_geohash()
+
+    def _update_geohash(self):
+        """Recompute the geohash once both coordinates are known."""
+        if self._latitude is not None and self._longitude is not None:
+            self._geohash = geo.encode(self._latitude, self._longitude)
+
+# ------------------------------------------------- Gestion de la note moyenne
+    @property
+    def average_rating(self):
+        """Average rating of the place, or None if it has no review.
+
+        Computed from the review_count and rating_sum aggregates, which
+        the facade keeps up to date on every review write.
+        """
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
 
 # ------------------------------------------------------------ Gestion du owner
     @hybrid_property
@@ -12,5 +12,9 @@ place_amenity = db.Table(                # Table liaison entre place et amenity
     db.Column('amenity_id',              # Définition de la colonne et son nom
               db.String,                        # Type String
               db.ForeignKey('amenities.id'),    # La donnée = id
-              primary_key=True)                 # Lien avec la table amenity
+              primary_key=True),                # Lien avec la table amenity
+    # La clé primaire (place_id, amenity_id) sert aux recherches par place,
+    # cet index sert aux recherches inverses "places avec l'amenity X"
+    # (couvrant : place_id est lu dans l'index, sans accès à la table)
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id', 'place_id')
 )
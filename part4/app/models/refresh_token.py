@@ -0,0 +1,45 @@
+"""Defines 'refresh_tokens' table: refresh tokens issued and not expired,
+and 'revoked_tokens' table: tokens revoked by a logout, until they expire
+(see app/persistence/token_store.py)."""
+from app.extensions import db
+
+# ---------------------------- Création des colonnes de la table refresh_tokens
+refresh_tokens = db.Table(               # Un refresh token par ligne
+    'refresh_tokens',                    # Nom de la table
+    db.Column('jti',                     # Claim 'jti' du token
+              db.String(36),                    # Type String (uuid)
+              primary_key=True),                # Recherche par jti
+    db.Column('user_id',                 # Propriétaire du token
+              db.String(36),                    # Type String
+              db.ForeignKey('users.id'),        # Lien avec la table users
+              nullable=False),
+    db.Column('family_id',               # Famille : un login et ses rotations
+              db.String(36),                    # Type String (uuid)
+              nullable=False,
+              index=True),                      # Révocation d'une famille
+    db.Column('expires_at',              # Claim 'exp' (secondes epoch)
+              db.Integer,                       # Type Integer
+              nullable=False,
+              index=True),                      # Purge par ordre d'expiration
+    db.Column('used',                    # Déjà échangé (rotation)
+              db.Boolean,                       # Type Boolean
+              nullable=False,
+              default=False)
+)
+
+# ---------------------------- Création des colonnes de la table revoked_tokens
+revoked_tokens = db.Table(               # Une révocation par ligne
+    'revoked_tokens',                    # Nom de la table
+    db.Column('id',                      # Ordre des révocations
+              db.Integer,                       # Type Integer
+              primary_key=True),                # Lecture depuis un curseur
+    db.Column('jti',                     # Claim 'jti' du token révoqué
+              db.String(36),                    # Type String (uuid)
+              nullable=False),
+    db.Column('expires_at',              # Claim 'exp' (secondes epoch)
+              db.Integer,                       # Type Integer
+              nullable=True,                    # NULL : sans expiration
+              index=True),                      # Purge par ordre d'expiration
+    # Identifiants jamais réutilisés : un curseur ne saute aucune ligne
+    sqlite_autoincrement=True
+)
@@ -20,13 +20,20 @@ class Review(BaseModel):
     place_id = db.Column(                   # Création de la colonne 'place_id'
         db.String(),                        # Value = String
         db.ForeignKey("places.id"),         # Relie Review à places.id
-        nullable=False)                     # Ne peux pas être NULL
+        nullable=False,                     # Ne peux pas être NULL
+        index=True)                         # Index pour les reviews d'un lieu
 
     user_id = db.Column(                    # Création de la colonne 'user_id'
         db.String(),                        # Value = String
         db.ForeignKey("users.id"),          # Relie Review à users.id
         nullable=False)                     # Ne peux pas être NULL
 
+    _search_rowid = db.Column(              # Clé de la ligne dans reviews_fts
+        db.Integer(),                       # Value = Integer (stable)
+        nullable=True,                      # Rempli par le trigger d'insertion
+        server_default=db.FetchedValue(),   # Valeur écrite par SQLite
+        index=True, unique=True)            # Index unique pour la jointure
+
     user = db.relationship(                 # Lien avec User
         "User",                             # Nom de la classe liée
         back_populates="reviews")           # Nom de la liste dans User
@@ -36,7 +43,9 @@ class Review(BaseModel):
         back_populates="reviews")           # Nom de la liste dans Place
 
     __table_args__ = (                      # Vérification des données SQL
-        CheckConstraint('_rating BETWEEN 1 AND 5', name='check_rating_range'),)
+        CheckConstraint('_rating BETWEEN 1 AND 5', name='check_rating_range'),
+        # Un seul avis par user et par lieu (comme dans Sql/script.sql)
+        db.Index('ix_reviews_user_place', 'user_id', 'place_id', unique=True))
 
 # --------------------------------------- Définition des attributs de la classe
     def __init__(self, text, rating, place, user):
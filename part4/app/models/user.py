@@ -5,6 +5,16 @@ from app.models.base_model import BaseModel
 import re                                       # Validation syntaxe de l'email
 
 
+def normalize_email(email):
+    """Lookup key of an email: trimmed and lowercased."""
+    return email.strip().lower()
+
+
+def _email_key_default(context):
+    """Fill _email_key on Core inserts that only give _email."""
+    return normalize_email(context.get_current_parameters()['_email'])
+
+
 class User(BaseModel):
     """User model class that stores personal info,
     credentials, and relationships."""
@@ -20,8 +30,14 @@ class User(BaseModel):
 
     _email = db.Column(                # Création de la colonne 'email'
         db.String(120),                # Value = String -> 120 char max
+        nullable=False)                # Ne peux pas être NULL (tel que saisi)
+
+    _email_key = db.Column(            # Création de la colonne 'email_key'
+        db.String(120),                # Email en minuscules (recherches)
         nullable=False,                # Ne peux pas être NULL
-        unique=True)                   # Doit être unique
+        unique=True,                   # Unique sans tenir compte de la casse
+        index=True,                    # Index ix_users__email_key
+        default=_email_key_default)    # Calculé si seul _email est inséré
 
     _password_hash = db.Column(        # Création de la colonne 'password_hash'
         db.String(128),                # Value = String -> 128 char max
@@ -148,6 +164,8 @@ class User(BaseModel):
 
         # Si tout est OK passe la valeur à l'attribut
         self._email = cleaned_email
+        # Clé de recherche : Jane@Example.com == jane@example.com
+        self._email_key = normalize_email(cleaned_email)
 
     @staticmethod
     def is_valid_email(email):
@@ -192,17 +210,19 @@ class User(BaseModel):
         if not password or not password.strip():
             raise ValueError("Password cannot be empty")
 
-        from app import bcrypt                              # Import de Bcrypt
-        # Génère le hashage du password
-        self._password_hash = (
-            bcrypt
-            .generate_password_hash(password)
-            .decode('utf-8'))
+        from app.extensions import password_hasher
+        # Génère le hashage du password (pool de hashage borné)
+        self._password_hash = password_hasher.hash(password)
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        from app import bcrypt
-        return bcrypt.check_password_hash(self._password_hash, password)
+        from app.extensions import password_hasher
+        return password_hasher.verify(self._password_hash, password)
+
+    def password_needs_rehash(self):
+        """True if the password was hashed with another bcrypt cost."""
+        from app.extensions import password_hasher
+        return password_hasher.needs_rehash(self._password_hash)
 
 # ----------------------------------------- Transforme un objet en dictionnaire
     def to_dict(self):
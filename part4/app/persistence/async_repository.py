@@ -0,0 +1,195 @@
+"""
+Asynchronous read repository (SQLAlchemy asyncio).
+
+AsyncSQLAlchemyRepository is the AsyncSession counterpart of the read
+methods of SQLAlchemyRepository: get(), get_all(), get_by_attribute()
+and the keyset get_page(), with the same (created_at, id) order and the
+same cursors. It only reads: writes stay on the synchronous facade,
+which owns the units of work, the cache invalidation and the search
+index.
+
+An AsyncSession cannot load a relationship on attribute access (that
+would be blocking I/O): every relationship read afterwards, by the
+serializers for instance, must be named in `embed` so that it is
+loaded with selectinload.
+
+make_async_engines() builds the async engines of an app from the same
+settings as the synchronous ones: the primary database and its read
+replicas (DB_REPLICA_URLS), the DB_POOL_* options and the SQLITE_*
+pragmas. It needs the 'greenlet' package (sqlalchemy[asyncio]) and an
+async driver: 'aiosqlite' for SQLite, 'asyncpg' for PostgreSQL,
+'aiomysql' for MySQL.
+"""
+import importlib
+from sqlalchemy import event, select, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import selectinload
+from app.persistence.engine import (
+    engine_options, is_memory, pragma_listener, sqlite_pragmas)
+from app.persistence.repository import decode_cursor, encode_cursor
+from app.persistence.routing import replica_engines
+
+# Backend -> (dialect+driver asynchrone, paquet du driver)
+ASYNC_DRIVERS = {
+    'sqlite': ('sqlite+aiosqlite', 'aiosqlite'),
+    'postgresql': ('postgresql+asyncpg', 'asyncpg'),
+    'mysql': ('mysql+aiomysql', 'aiomysql'),
+}
+
+
+def _require(package, feature):
+    """Import `package` or raise a RuntimeError naming it."""
+    try:
+        importlib.import_module(package)
+    except ImportError:
+        raise RuntimeError(f"{feature} needs the '{package}' package")
+
+
+def async_url(url):
+    """
+    URL of the same database through its async driver.
+
+    Raises:
+    - ValueError: If the backend has no known async driver.
+    - RuntimeError: If the driver is not installed.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for the '{backend}' backend")
+    drivername, package = ASYNC_DRIVERS[backend]
+    _require(package, "The async API")
+    return url.set(drivername=drivername)
+
+
+def make_async_engines(app):
+    """
+    Async engines of the primary database and of the replicas of an app.
+
+    Parameters:
+    - app: Flask app whose engines (db.init_app, routing.init_app) exist.
+
+    Returns:
+    - A tuple (primary, replicas) of AsyncEngine and list of AsyncEngine.
+
+    Raises:
+    - ValueError: The database is in memory: its only connection belongs
+      to the synchronous engine and cannot be shared.
+    - RuntimeError: 'greenlet' or the async driver is not installed.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.extensions import db
+
+    if is_memory(app.config['SQLALCHEMY_DATABASE_URI']):
+        raise ValueError("The async API needs a database file or server")
+    _require('greenlet', "The async API")
+    options = engine_options(app.config)
+    pragmas = sqlite_pragmas(app.config)
+
+    def create(sync_engine):
+        engine = create_async_engine(async_url(sync_engine.url), **options)
+        if engine.dialect.name == 'sqlite' and pragmas:
+            # Pragmas posés sur la connexion DBAPI (adaptée) à sa création
+            event.listen(engine.sync_engine, 'connect',
+                         pragma_listener(pragmas, engine.url))
+        return engine
+
+    with app.app_context():
+        # db.engine.url : chemin SQLite déjà résolu dans instance/
+        return create(db.engine), [
+            create(engine) for engine in replica_engines(app)]
+
+
+class AsyncSQLAlchemyRepository:
+    """
+    Read-only repository working on an AsyncSession.
+
+    Each method takes the session to use, opened by the caller (see
+    AsyncHBnBFacade) for one request.
+
+    Attributes:
+    - model: The SQLAlchemy model class read by the repository.
+    - relations: Relations that can be preloaded (exposed name -> model
+      attribute), as in SQLAlchemyRepository.
+    """
+    def __init__(self, model, relations=None):
+        """
+        Initialize the repository with a specific SQLAlchemy model.
+
+        Parameters:
+        - model: The SQLAlchemy model class to read.
+        - relations: Relations accepted in `embed` (none by default).
+        """
+        self.model = model
+        self.relations = relations or {}
+
+    def query_with(self, embed=()):
+        """
+        SELECT of the model preloading the relationships named in `embed`.
+
+        Raises:
+        - KeyError: If a name is not in `relations`.
+        """
+        return select(self.model).options(*(
+            selectinload(self.relations[name]) for name in embed))
+
+    async def get(self, session, obj_id, embed=()):
+        """
+        Retrieve an object by its ID.
+
+        Parameters:
+        - session: The AsyncSession to read with.
+        - obj_id: The primary key of the object.
+        - embed: Relations to preload.
+
+        Returns:
+        - The object if found, else None.
+        """
+        result = await session.execute(
+            self.query_with(embed).where(self.model.id == obj_id))
+        return result.scalars().first()
+
+    async def get_all(self, session, embed=()):
+        """Retrieve all objects from the database."""
+        result = await session.execute(self.query_with(embed))
+        return result.scalars().all()
+
+    async def get_page(self, session, limit, cursor=None, embed=()):
+        """
+        Retrieve one page of objects using keyset pagination.
+
+        Same order and cursors as SQLAlchemyRepository.get_page(): a page
+        can be read from either API.
+
+        Returns:
+        - A tuple (objects, next_cursor); next_cursor is None on the
+          last page.
+
+        Raises:
+        - ValueError: If the cursor is malformed.
+        """
+        query = self.query_with(embed)
+        if cursor:
+            created_at, obj_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id) >
+                tuple_(created_at, obj_id))
+        # Un élément de plus pour savoir s'il existe une page suivante
+        result = await session.execute(query.order_by(
+            self.model.created_at, self.model.id).limit(limit + 1))
+        objs = result.scalars().all()
+        if len(objs) > limit:
+            objs = objs[:limit]
+            return objs, encode_cursor(objs[-1])
+        return objs, None
+
+    async def get_by_attribute(self, session, attr_name, attr_value):
+        """
+        Retrieve the first object where the given attribute matches the value.
+
+        Returns:
+        - The matching object, or None if no match is found.
+        """
+        result = await session.execute(select(self.model).where(
+            getattr(self.model, attr_name) == attr_value).limit(1))
+        return result.scalars().first()
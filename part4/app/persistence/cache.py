@@ -0,0 +1,209 @@
+"""
+Read-through cache used by the facade for single-entity views.
+
+Cached values are the JSON-ready dictionaries returned by the API (never
+ORM objects), so they can live in process memory or in a Redis-compatible
+server alike.
+
+Backends:
+- LRUCache: in-process, least-recently-used eviction and per-entry TTL
+  (default).
+- RedisCache: any server speaking the Redis protocol; needs the optional
+  `redis` package.
+- NullCache: caching disabled.
+
+Configuration keys (see config.py):
+- CACHE_BACKEND: 'memory' (default), 'redis' or 'null'.
+- CACHE_TTL: time to live of an entry, in seconds.
+- CACHE_MAX_ENTRIES: size of the in-process LRU.
+- CACHE_REDIS_URL: URL of the Redis-compatible server.
+"""
+from abc import ABC, abstractmethod
+import json
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class Cache(ABC):
+    """Common interface and hit/miss counters of every backend."""
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value or None."""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_or_set(self, key, loader):
+        """
+        Read-through access: return the cached value, or call `loader`,
+        cache its result (unless None) and return it.
+        """
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def stats(self):
+        """Hit/miss counters and hit ratio."""
+        total = self.hits + self.misses
+        return {
+            'backend': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'size': self.size()
+        }
+
+    @abstractmethod
+    def _get(self, key):
+        """Return the stored value or None, without counting."""
+        pass
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store a value under a key."""
+        pass
+
+    @abstractmethod
+    def delete(self, *keys):
+        """Remove keys from the cache (missing keys are ignored)."""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove every entry."""
+        pass
+
+    def size(self):
+        """Number of entries, or None if unknown."""
+        return None
+
+
+class NullCache(Cache):
+    """Cache that stores nothing: every read is a miss."""
+    name = 'null'
+
+    def _get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return 0
+
+
+class LRUCache(Cache):
+    """
+    In-process LRU cache with a time to live per entry.
+
+    Values are shared with the callers and must be treated as read-only.
+    """
+    name = 'memory'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL,
+                 clock=time.monotonic):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisCache(Cache):
+    """Cache stored in a Redis-compatible server, values as JSON."""
+    name = 'redis'
+
+    def __init__(self, url, ttl=DEFAULT_TTL, prefix='hbnb:', client=None):
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "CACHE_BACKEND='redis' needs the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+def make_cache(config):
+    """Build the cache backend described by a Flask config mapping."""
+    backend = config.get('CACHE_BACKEND', 'memory')
+    ttl = config.get('CACHE_TTL', DEFAULT_TTL)
+    if backend == 'memory':
+        return LRUCache(
+            config.get('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES), ttl)
+    if backend == 'redis':
+        return RedisCache(
+            config.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'), ttl)
+    if backend == 'null':
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
@@ -0,0 +1,138 @@
+"""
+Database engine options and SQLite pragmas.
+
+init_app() turns the DB_POOL_* settings into SQLALCHEMY_ENGINE_OPTIONS
+before Flask-SQLAlchemy creates the engine; set_pragmas() then runs the
+SQLITE_* pragmas on every new SQLite connection:
+
+- journal_mode=WAL: readers no longer wait for a writer to commit and a
+  writer no longer waits for readers, so request threads only queue
+  behind each other for writes.
+- synchronous=NORMAL: in WAL mode, commits stop waiting for an fsync;
+  a power loss can drop the last commits but never corrupts the file.
+- mmap_size / cache_size: pages read through memory mapping and kept in
+  a larger per-connection cache.
+- busy_timeout: a writer waits for the lock instead of failing at once
+  with "database is locked".
+
+An in-memory database (the tests) has a single shared connection: pool
+options do not apply to it and it has no journal to put in WAL mode.
+
+Configuration keys (see config.py):
+- DB_POOL_SIZE, DB_MAX_OVERFLOW: connections kept open, and opened on
+  top of them under load. Their sum should cover the request threads of
+  a worker (HBNB_THREADS).
+- DB_POOL_TIMEOUT: seconds to wait for a free connection.
+- DB_POOL_PRE_PING: check a connection before using it (servers that
+  close idle connections).
+- DB_POOL_RECYCLE: seconds after which a connection is reopened, -1 for
+  never.
+- SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_MMAP_SIZE,
+  SQLITE_CACHE_SIZE, SQLITE_BUSY_TIMEOUT: pragmas; None keeps the
+  SQLite default.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from app.extensions import db
+from app.persistence.routing import replica_engines
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+
+JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+SYNCHRONOUS = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+
+
+def is_memory(uri):
+    """True for an in-memory SQLite database."""
+    url = make_url(uri)
+    return (url.get_backend_name() == 'sqlite'
+            and url.database in (None, '', ':memory:'))
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the configured database.
+
+    Options already given in SQLALCHEMY_ENGINE_OPTIONS are kept.
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_memory(config['SQLALCHEMY_DATABASE_URI']):
+        # StaticPool : une seule connexion, pas de taille de pool
+        return options
+    options.setdefault('pool_size',
+                       config.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE))
+    options.setdefault('max_overflow',
+                       config.get('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW))
+    options.setdefault('pool_timeout',
+                       config.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT))
+    options.setdefault('pool_pre_ping', config.get('DB_POOL_PRE_PING', False))
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', -1))
+    return options
+
+
+def sqlite_pragmas(config, memory=False):
+    """
+    (name, value) of the pragmas to run on each SQLite connection.
+
+    Raises:
+    - ValueError: A setting is not a valid pragma value.
+    """
+    pragmas = []
+    journal_mode = config.get('SQLITE_JOURNAL_MODE')
+    if journal_mode and not memory:
+        if journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Invalid SQLITE_JOURNAL_MODE: {journal_mode}")
+        pragmas.append(('journal_mode', journal_mode.upper()))
+    synchronous = config.get('SQLITE_SYNCHRONOUS')
+    if synchronous:
+        if synchronous.upper() not in SYNCHRONOUS:
+            raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {synchronous}")
+        pragmas.append(('synchronous', synchronous.upper()))
+    for name in ('mmap_size', 'cache_size', 'busy_timeout'):
+        value = config.get(f'SQLITE_{name.upper()}')
+        if value is not None:
+            # Entier imposé : la valeur est insérée dans le PRAGMA
+            pragmas.append((name, int(value)))
+    return pragmas
+
+
+def init_app(app):
+    """Set the pool options; call before db.init_app(app)."""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def pragma_listener(pragmas, url):
+    """connect listener running `pragmas` on the database at `url`."""
+    if url.query.get('mode') == 'ro':
+        # Base en lecture seule (réplica) : son journal est celui du
+        # primaire, le changer serait une écriture
+        pragmas = [pragma for pragma in pragmas if pragma[0] != 'journal_mode']
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def set_pragmas(app):
+    """
+    Run the SQLite pragmas on each new connection of the app engines,
+    replicas included; call after routing.init_app(app).
+    """
+    memory = is_memory(app.config['SQLALCHEMY_DATABASE_URI'])
+    pragmas = sqlite_pragmas(app.config, memory)
+    if not pragmas:
+        return
+
+    with app.app_context():
+        engines = [*db.engines.values(), *replica_engines(app)]
+        for engine in engines:
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect',
+                             pragma_listener(pragmas, engine.url))
@@ -0,0 +1,102 @@
+"""
+Schema upgrades of an existing database.
+
+db.create_all() creates the missing tables, with their indexes and
+search index, but never changes a table that already exists. upgrade()
+brings a database created by an older version of the models up to date
+in one step, run by `flask init-db`:
+
+1. create the missing tables;
+2. add the columns of COLUMNS that a table lacks (ALTER TABLE ... ADD
+   COLUMN), with the initial value their constraints need;
+3. create the missing indexes of the models; a unique index is only
+   created once no two rows share its values;
+4. create the full-text search tables and triggers if missing (or
+   replace those keyed by the SQLite rowid), filled from the base tables
+   like any new index.
+
+Each step first reads the current schema, so upgrade() can run any
+number of times, and resumes where a failed run stopped (SQLite commits
+ALTER TABLE as it runs). Values derived from other rows (rating
+aggregates, geohashes) are recomputed by the backfill-* commands.
+"""
+from sqlalchemy import inspect, text
+from app.extensions import db
+from app.persistence import search_index
+
+# Colonnes ajoutées après la création des tables :
+# (table, colonne, type SQL, valeur des lignes existantes ou None)
+COLUMNS = (
+    ('places', 'review_count', 'INTEGER NOT NULL DEFAULT 0', None),
+    ('places', 'rating_sum', 'INTEGER NOT NULL DEFAULT 0', None),
+    ('places', '_geohash', 'VARCHAR(12)', None),
+    ('users', '_email_key', 'VARCHAR(120)', 'lower(trim(_email))'),
+    ('places', '_search_rowid', 'INTEGER', 'rowid'),
+    ('reviews', '_search_rowid', 'INTEGER', 'rowid'),
+)
+
+
+class MigrationError(Exception):
+    """The schema cannot be upgraded until some rows are fixed by hand."""
+
+
+def upgrade(connection):
+    """
+    Bring the schema of the database up to date.
+
+    Parameters:
+    - connection: A SQLAlchemy connection to the primary database; the
+      caller commits (or rolls back) its transaction.
+
+    Returns:
+    - The list of the changes made, as messages.
+
+    Raises:
+    - MigrationError: A unique index cannot be created because rows
+      share its values (they are listed in the message).
+    """
+    changes = []
+    db.metadata.create_all(connection)
+    for table, column, ddl, initial in COLUMNS:
+        # Nouvel inspecteur : il garde en cache le schéma déjà lu
+        existing = {col['name'] for col in
+                    inspect(connection).get_columns(table)}
+        if column in existing:
+            continue
+        connection.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        if initial:
+            connection.execute(text(
+                f"UPDATE {table} SET {column} = {initial}"))
+        changes.append(f"Added column {table}.{column}")
+
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in
+                    inspect(connection).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                _check_unique(connection, index)
+            index.create(connection)
+            changes.append(f"Created index {index.name}")
+
+    for fts in search_index.create(connection):
+        search_index.rebuild(connection, [fts])
+        changes.append(f"Created search index {fts}")
+    return changes
+
+
+def _check_unique(connection, index):
+    """Raise MigrationError if rows share the values of a unique index."""
+    columns = ', '.join(column.name for column in index.columns)
+    duplicates = connection.execute(text(
+        f"SELECT {columns}, count(*) FROM {index.table.name} "
+        f"GROUP BY {columns} HAVING count(*) > 1")).all()
+    if duplicates:
+        lines = [
+            f"{row[-1]} {index.table.name} share {columns} = "
+            f"{', '.join(str(value) for value in row[:-1])}"
+            for row in duplicates]
+        raise MigrationError(
+            f"Unique index {index.name} not created:\n" + '\n'.join(lines))
@@ -0,0 +1,17 @@
+from app.models.amenity import Amenity
+from app.models.place_amenity import place_amenity
+from app.persistence.repository import SQLAlchemyRepository
+
+
+class AmenityRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Amenity)
+
+    def get_amenities_by_place(self, place_id):
+        """Get the amenities of a place with one join on place_amenity.
+
+        The filter on place_id uses the (place_id, amenity_id) primary key.
+        """
+        return self.model.query.join(
+            place_amenity, place_amenity.c.amenity_id == Amenity.id
+        ).filter(place_amenity.c.place_id == place_id).all()
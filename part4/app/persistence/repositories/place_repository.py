@@ -0,0 +1,232 @@
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.models.place_amenity import place_amenity
+from app.models.review import Review
+from app.persistence.repository import SQLAlchemyRepository, version_columns
+from app.utils import geo
+
+
+# Relations d'une place pouvant être préchargées (nom exposé -> attribut)
+PLACE_RELATIONS = {
+    'owner': Place.owner_rel,
+    'amenities': Place.amenities,
+    'reviews': Place.reviews
+}
+
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Place)
+
+    def get_all_with_relations(self, embed=None):
+        """
+        Get all places with owner, amenities and reviews preloaded.
+
+        Each relationship is loaded with one extra SELECT ... IN query,
+        so the number of queries does not depend on the number of places.
+        `embed` restricts the preloaded relationships (default: all).
+        """
+        return self._with_relations(embed).all()
+
+    def stream_with_relations(self, embed=None):
+        """Iterate over all places, relations preloaded per batch."""
+        return self.stream(self._with_relations(embed))
+
+    def get_with_relations(self, place_id, embed=None):
+        """Get one place with owner, amenities and reviews preloaded."""
+        return self._with_relations(embed).filter(
+            Place.id == place_id).first()
+
+    def get_page_with_relations(self, limit, cursor=None, embed=None):
+        """Get one page of places with their relationships preloaded."""
+        return self.get_page(limit, cursor, query=self._with_relations(embed))
+
+    def get_many_with_relations(self, place_ids, embed=None):
+        """
+        Get places by id with their relationships preloaded.
+
+        Returns a dictionary {id: place}; unknown ids are left out.
+        """
+        if not place_ids:
+            return {}
+        places = self._with_relations(embed).filter(
+            Place.id.in_(list(place_ids))).all()
+        return {place.id: place for place in places}
+
+    def get_coordinates_in_cells(self, cells):
+        """
+        Get (id, latitude, longitude) of the places inside geohash cells.
+
+        Each cell is a range scan on the geohash index
+        (prefix <= geohash < prefix + '~'); only the three columns needed
+        for the exact distance check are read. A cell '' matches every
+        place (full scan).
+        """
+        query = db.session.query(Place.id, Place._latitude, Place._longitude)
+        if '' not in cells:
+            query = query.filter(or_(*(
+                and_(Place._geohash >= cell,
+                     Place._geohash < geo.prefix_upper_bound(cell))
+                for cell in cells)))
+        return query.all()
+
+    def backfill_geohashes(self, batch_size=1000):
+        """
+        Compute the geohash of places created before the column existed.
+
+        Returns the number of updated places.
+        """
+        total = 0
+        while True:
+            rows = db.session.query(
+                Place.id, Place._latitude, Place._longitude
+            ).filter(Place._geohash.is_(None)).limit(batch_size).all()
+            if not rows:
+                return total
+            db.session.execute(update(Place), [
+                {'id': place_id, '_geohash': geo.encode(lat, lon)}
+                for place_id, lat, lon in rows])
+            total += len(rows)
+
+    def filter_query(self, min_price=None, max_price=None,
+                     amenity_ids=None, match='all', query=None):
+        """
+        Restrict a place query by price range and amenities, in SQL.
+
+        Parameters:
+        - min_price, max_price: Inclusive bounds on the price (index range).
+        - amenity_ids: Places must offer all of them (match='all') or at
+          least one of them (match='any').
+        - query: Base query (default: all places).
+
+        Returns:
+        - The filtered query.
+        """
+        if query is None:
+            query = self.model.query
+        if min_price is not None:
+            query = query.filter(Place._price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place._price <= max_price)
+        if amenity_ids:
+            # Chaque sous-requête lit l'index couvrant (amenity_id, place_id)
+            groups = ([[a_id] for a_id in set(amenity_ids)]
+                      if match == 'all' else [set(amenity_ids)])
+            for group in groups:
+                query = query.filter(Place.id.in_(
+                    select(place_amenity.c.place_id).where(
+                        place_amenity.c.amenity_id.in_(group))))
+        return query
+
+    def get_filtered_page(self, limit, cursor=None, embed=None, **filters):
+        """Get one page of filtered places with relations preloaded."""
+        query = self.filter_query(
+            query=self._with_relations(embed), **filters)
+        return self.get_page(limit, cursor, query=query)
+
+    def get_amenity_facets(self, **filters):
+        """
+        Count the filtered places offering each amenity.
+
+        One aggregate query over place_amenity joined to the filtered
+        place ids. Returns a list of (amenity_id, name, count) sorted by
+        decreasing count, then name.
+        """
+        place_ids = self.filter_query(
+            query=db.session.query(Place.id), **filters).subquery()
+        count = func.count(place_amenity.c.place_id)
+        return db.session.query(
+            Amenity.id, Amenity._name, count
+        ).join(
+            place_amenity, place_amenity.c.amenity_id == Amenity.id
+        ).filter(
+            place_amenity.c.place_id.in_(select(place_ids.c.id))
+        ).group_by(Amenity.id, Amenity._name).order_by(
+            count.desc(), Amenity._name).all()
+
+    def relation_version_columns(self, name, place_id=None):
+        """Version subqueries of the owner, amenities or reviews."""
+        if name == 'owner':
+            if place_id is None:
+                return version_columns(User)
+            owner_id = select(Place.owner_id).where(
+                Place.id == place_id).scalar_subquery()
+            return version_columns(User, User.id == owner_id)
+        if name == 'amenities':
+            # Les liens comptent aussi : ajouter une amenity ne touche
+            # pas updated_at de la place
+            if place_id is None:
+                return (version_columns(Amenity) +
+                        version_columns(place_amenity, updated_at=False))
+            linked = select(place_amenity.c.amenity_id).where(
+                place_amenity.c.place_id == place_id)
+            return (version_columns(Amenity, Amenity.id.in_(linked)) +
+                    version_columns(place_amenity,
+                                    place_amenity.c.place_id == place_id,
+                                    updated_at=False))
+        if name == 'reviews':
+            if place_id is None:
+                return version_columns(Review)
+            return version_columns(Review, Review.place_id == place_id)
+        return []
+
+    def get_duplicate(self, owner_id, title, latitude, longitude):
+        """Get the place of an owner with the same title and coordinates.
+
+        Single probe on the unique (owner_id, title, latitude, longitude)
+        index; returns None when there is no such place.
+        """
+        if isinstance(title, str):
+            title = title.strip()
+        return self.model.query.filter_by(
+            owner_id=owner_id, _title=title,
+            _latitude=latitude, _longitude=longitude).first()
+
+    def get_places_by_amenity(self, amenity_id):
+        """Get the places offering an amenity (uses the amenity_id index)."""
+        return self.model.query.join(
+            place_amenity, place_amenity.c.place_id == Place.id
+        ).filter(place_amenity.c.amenity_id == amenity_id).all()
+
+    def adjust_rating(self, place_id, count_delta, sum_delta):
+        """
+        Add deltas to the review_count and rating_sum of a place.
+
+        Done with a single atomic UPDATE (col = col + delta) in the
+        current transaction, so concurrent review writes do not lose
+        updates.
+        """
+        db.session.execute(
+            update(Place)
+            .where(Place.id == place_id)
+            .values(
+                review_count=Place.review_count + count_delta,
+                rating_sum=Place.rating_sum + sum_delta))
+
+    def recompute_rating_aggregates(self):
+        """
+        Recompute review_count and rating_sum of every place from the
+        reviews table in one UPDATE. Returns the number of places.
+        """
+        count = select(func.count(Review.id)).where(
+            Review.place_id == Place.id).scalar_subquery()
+        total = select(func.coalesce(func.sum(Review._rating), 0)).where(
+            Review.place_id == Place.id).scalar_subquery()
+        result = db.session.execute(
+            update(Place).values(review_count=count, rating_sum=total),
+            execution_options={'synchronize_session': False})
+        return result.rowcount
+
+    def _with_relations(self, embed=None):
+        """
+        Base query preloading owner, amenities and reviews, or only the
+        relations named in `embed`.
+        """
+        if embed is None:
+            embed = PLACE_RELATIONS
+        return self.model.query.options(*(
+            selectinload(PLACE_RELATIONS[name]) for name in embed))
@@ -0,0 +1,45 @@
+from sqlalchemy import select
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import (
+    SQLAlchemyRepository, read_version, version_columns)
+
+
+class ReviewRepository(SQLAlchemyRepository):
+    relations = {'user': Review.user, 'place': Review.place}
+
+    def __init__(self):
+        super().__init__(Review)
+
+    def relation_version_columns(self, name, review_id=None):
+        """Version subqueries of the author or the place of reviews."""
+        model, key = {
+            'user': (User, Review.user_id),
+            'place': (Place, Review.place_id)
+        }.get(name, (None, None))
+        if model is None:
+            return []
+        if review_id is None:
+            return version_columns(model)
+        related_id = select(key).where(Review.id == review_id)
+        return version_columns(model, model.id == related_id.scalar_subquery())
+
+    def place_reviews_version(self, place_id, embed=()):
+        """Version of the reviews of a place (see version())."""
+        columns = version_columns(Review, Review.place_id == place_id)
+        for name in embed:
+            columns += self.relation_version_columns(name)
+        return read_version(columns)
+
+    def get_reviews_by_place(self, place_id, embed=()):
+        """Get all reviews of a place (uses the reviews.place_id index)."""
+        return self.query_with(embed).filter_by(place_id=place_id).all()
+
+    def get_review_by_user_and_place(self, user_id, place_id):
+        """Get the review a user wrote for a place, or None.
+
+        Single probe on the unique (user_id, place_id) index.
+        """
+        return self.model.query.filter_by(
+            user_id=user_id, place_id=place_id).first()
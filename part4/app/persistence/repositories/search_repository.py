@@ -0,0 +1,114 @@
+import re
+from sqlalchemy import bindparam, text
+from app.extensions import db
+from app.persistence import search_index  # noqa: F401 (crée l'index FTS)
+
+# Marqueurs des termes trouvés dans les extraits
+SNIPPET_OPEN = '['
+SNIPPET_CLOSE = ']'
+SNIPPET_TOKENS = 12
+# Poids des champs dans BM25 : le titre compte plus que la description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+# Une place trouvée via ses reviews passe après une place trouvée directement
+REVIEW_WEIGHT = 0.5
+
+# MATERIALIZED : bm25() ne peut être appelé que dans la requête qui lit la
+# table FTS, la CTE ne doit donc pas être aplatie
+SEARCH_SQL = text(f"""
+WITH hits AS MATERIALIZED (
+    SELECT places.id AS place_id,
+           bm25(places_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score,
+           'places_fts' AS source, places_fts.rowid AS source_rowid
+    FROM places_fts JOIN places ON places._search_rowid = places_fts.rowid
+    WHERE places_fts MATCH :query
+    UNION ALL
+    SELECT reviews.place_id, bm25(reviews_fts) * {REVIEW_WEIGHT},
+           'reviews_fts', reviews_fts.rowid
+    FROM reviews_fts JOIN reviews ON reviews._search_rowid = reviews_fts.rowid
+    WHERE reviews_fts MATCH :query
+), ranked AS (
+    -- SQLite : source et source_rowid sont pris sur la ligne du min(score)
+    SELECT place_id, min(score) AS score, source, source_rowid
+    FROM hits GROUP BY place_id
+)
+SELECT place_id, score, source, source_rowid FROM ranked
+WHERE :after_score IS NULL OR (score, place_id) > (:after_score, :after_id)
+ORDER BY score, place_id
+LIMIT :limit
+""")
+
+SNIPPET_SQL = {
+    fts: text(
+        f"SELECT rowid, snippet({fts}, -1, :open, :close, '…', "
+        f"{SNIPPET_TOKENS}) FROM {fts} "
+        f"WHERE {fts} MATCH :query AND rowid IN :rowids"
+    ).bindparams(bindparam('rowids', expanding=True))
+    for fts in ('places_fts', 'reviews_fts')
+}
+
+
+def to_match_query(terms):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word is quoted (so FTS5 operators in user input are plain
+    words) and all of them must match; the last one also matches as a
+    prefix, for search-as-you-type.
+
+    Raises:
+    - ValueError: If the text contains no word.
+    """
+    words = re.findall(r'\w+', terms or '')
+    if not words:
+        raise ValueError("q must contain at least one word")
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+class SearchRepository:
+    """Full-text search over places and reviews (SQLite FTS5)."""
+
+    def search_places(self, terms, limit, after=None):
+        """
+        Rank the places matching `terms` with BM25.
+
+        A place matches through its title/description or through the
+        text of one of its reviews; its best match gives its score and
+        snippet. Lower scores are better (FTS5 convention). Snippets are
+        only built for the returned rows.
+
+        Parameters:
+        - terms: Free text typed by the user.
+        - limit: Maximum number of rows.
+        - after: (score, place_id) of the last row of the previous page.
+
+        Returns:
+        - A list of (place_id, score, snippet) tuples.
+        """
+        query = to_match_query(terms)
+        after_score, after_id = after if after else (None, None)
+        rows = db.session.execute(SEARCH_SQL, {
+            'query': query,
+            'after_score': after_score,
+            'after_id': after_id,
+            'limit': limit
+        }).all()
+
+        # Extraits calculés seulement pour les lignes de la page
+        snippets = {}
+        for fts, statement in SNIPPET_SQL.items():
+            rowids = [row.source_rowid for row in rows if row.source == fts]
+            if rowids:
+                snippets[fts] = dict(db.session.execute(statement, {
+                    'query': query,
+                    'open': SNIPPET_OPEN,
+                    'close': SNIPPET_CLOSE,
+                    'rowids': rowids
+                }).all())
+        return [
+            (row.place_id, row.score,
+             snippets.get(row.source, {}).get(row.source_rowid))
+            for row in rows
+        ]
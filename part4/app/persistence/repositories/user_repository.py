@@ -1,12 +1,45 @@
-from app.models.user import User
-from app.persistence.repository import SQLAlchemyRepository
+from sqlalchemy import select
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User, normalize_email
+from app.persistence.repository import SQLAlchemyRepository, version_columns
 
 class UserRepository(SQLAlchemyRepository):
+    relations = {'places': User.places}
+
     def __init__(self):
         super().__init__(User)
 
+    def relation_version_columns(self, name, user_id=None):
+        """Version subqueries of the places of users."""
+        if name != 'places':
+            return []
+        if user_id is None:
+            return version_columns(Place)
+        return version_columns(Place, Place.owner_id == user_id)
+
     def get_user_by_email(self, email):
-        return self.model.query.filter_by(email=email).first()
+        """
+        Get a user by email, whatever its case, through the unique index
+        on the normalized email (_email_key).
+        """
+        if not isinstance(email, str):
+            return None
+        return self.model.query.filter(
+            User._email_key == normalize_email(email)).first()
+
+    def get_identity(self, user_id):
+        """
+        Return {'id', 'email', 'is_admin'} of a user, or None.
+
+        Plain values (no ORM object) that can be cached across requests.
+        """
+        row = db.session.execute(
+            select(User.id, User._email, User._is_admin)
+            .where(User.id == user_id)).first()
+        if row is None:
+            return None
+        return {'id': row[0], 'email': row[1], 'is_admin': bool(row[2])}
 
     def get_admin_users(self):
         """Get all users with admin rights."""
@@ -24,9 +24,113 @@ Classes:
     Mainly used for testing or lightweight prototypes without a database.
 """
 from abc import ABC, abstractmethod
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import selectinload
+from app.persistence.routing import has_replicas, primary
+from app.persistence.unit_of_work import save
+
+# Nombre de lignes lues (et d'objets en mémoire) à la fois en streaming
+STREAM_BATCH_SIZE = 500
 # from app.models import User, Place, Review, Amenity
 
 
+def encode_key(values):
+    """
+    Build an opaque pagination cursor from a list of JSON values.
+
+    Parameter:
+    - values: The sort key of the last item of the current page.
+
+    Returns:
+    - A URL-safe string to pass back as `cursor` to get the next page.
+    """
+    raw = json.dumps(list(values))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_key(cursor, size):
+    """
+    Decode a cursor built by encode_key() back into its list of values.
+
+    Parameters:
+    - cursor: The cursor string.
+    - size: Expected number of values in the key.
+
+    Raises:
+    - ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(obj):
+    """
+    Build an opaque pagination cursor from an object's (created_at, id).
+
+    Parameter:
+    - obj: The last object of the current page.
+
+    Returns:
+    - A URL-safe string to pass back as `cursor` to get the next page.
+    """
+    return encode_key([obj.created_at.isoformat(), obj.id])
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor built by encode_cursor() back into (created_at, id).
+
+    Raises:
+    - ValueError: If the cursor is malformed.
+    """
+    created_at, obj_id = decode_key(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), str(obj_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def version_columns(table, *criteria, updated_at=True):
+    """
+    Scalar subqueries describing the state of some rows of a table:
+    their count and, unless `updated_at` is False, their latest
+    updated_at.
+
+    Parameters:
+    - table: A model class, or a Table when `updated_at` is False.
+    - criteria: Optional WHERE conditions.
+    """
+    columns = [select(func.count()).select_from(table).where(*criteria)]
+    if updated_at:
+        columns.append(select(func.max(table.updated_at)).where(*criteria))
+    return [column.scalar_subquery() for column in columns]
+
+
+def read_version(columns):
+    """
+    Run version subqueries in a single SELECT.
+
+    Returns:
+    - A tuple (last_modified, token): the latest timestamp found (or
+      None) and the tuple of all values, which changes whenever one of
+      the counted rows is added, removed or updated.
+    """
+    from app import db
+    row = tuple(db.session.execute(select(*columns)).one())
+    stamps = [value for value in row if isinstance(value, datetime)]
+    return (max(stamps) if stamps else None), row
+
+
 class Repository(ABC):
     """
     Abstract interface for managing business objects in a generic repository.
@@ -201,7 +305,10 @@ class SQLAlchemyRepository(Repository):
     """
     SQLAlchemy-backed implementation of the Repository interface.
 
-    Provides persistence using SQLAlchemy's ORM system.
+    Provides persistence using SQLAlchemy's ORM system. With read
+    replicas (app/persistence/routing.py), get(), get_all() and the
+    other reads are served by a replica, while add(), update() and
+    delete() write to the primary database.
 
     Attributes:
     - model: The SQLAlchemy model class managed by the repository.
@@ -215,16 +322,63 @@ class SQLAlchemyRepository(Repository):
         """
         self.model = model
 
-    def add(self, obj):
+    # Relations pouvant être préchargées (nom exposé -> attribut du modèle)
+    relations = {}
+
+    def version(self, obj_id=None, embed=()):
+        """
+        Describe the current state of one object or of the whole table,
+        for HTTP validators (ETag, Last-Modified).
+
+        One SELECT of aggregate subqueries (count, max(updated_at)) over
+        the object or table, plus the relations named in `embed`.
+
+        Parameters:
+        - obj_id: ID of the object, or None for the collection.
+        - embed: Relations included in the representation.
+
+        Returns:
+        - A tuple (last_modified, token) as built by read_version(), or
+          None if obj_id is given and the object does not exist.
+        """
+        criteria = [self.model.id == obj_id] if obj_id is not None else []
+        columns = version_columns(self.model, *criteria)
+        # Ordre fixe : le jeton doit être le même dans chaque process
+        for name in sorted(embed):
+            columns += self.relation_version_columns(name, obj_id)
+        last_modified, token = read_version(columns)
+        if obj_id is not None and token[0] == 0:
+            return None
+        return last_modified, token
+
+    def relation_version_columns(self, name, obj_id=None):
+        """Version subqueries of an embedded relation (see version())."""
+        return []
+
+    def query_with(self, embed=()):
+        """
+        Base query preloading the relationships named in `embed`.
+
+        Each relationship costs one extra SELECT ... IN query, whatever
+        the number of rows.
+
+        Raises:
+        - KeyError: If a name is not in `relations`.
+        """
+        return self.model.query.options(*(
+            selectinload(self.relations[name]) for name in embed))
+
+    def add(self, obj, commit=True):
         """
         Add an object to the database.
 
-        Parameter:
+        Parameters:
         - obj: The SQLAlchemy model instance to add.
+        - commit: If False, or inside a unit of work, only flush.
         """
         from app import db
         db.session.add(obj)
-        db.session.commit()
+        save(commit)
 
     def get(self, obj_id):
         """
@@ -238,6 +392,24 @@ class SQLAlchemyRepository(Repository):
         """
         return self.model.query.get(obj_id)
 
+    def get_for_update(self, obj_id):
+        """
+        Retrieve an object from the primary database before modifying it.
+
+        With replicas, the object is reloaded even if the session already
+        holds it: it may have been read from a replica that lags behind.
+
+        Parameter:
+        - obj_id: The primary key of the object.
+
+        Returns:
+        - The object if found, else None.
+        """
+        from app import db
+        with primary():
+            return db.session.get(self.model, obj_id,
+                                  populate_existing=has_replicas())
+
     def get_all(self):
         """
         Retrieve all objects from the database.
@@ -247,35 +419,90 @@ class SQLAlchemyRepository(Repository):
         """
         return self.model.query.all()
 
-    def update(self, obj_id, data):
+    def stream(self, query=None, batch_size=STREAM_BATCH_SIZE):
+        """
+        Iterate over all objects, `batch_size` rows at a time.
+
+        Objects are ordered by (created_at, id) and fetched with
+        yield_per(): selectinload relations are loaded per batch, and
+        objects no longer referenced by the caller can be freed (the
+        identity map only keeps weak references), so memory does not
+        grow with the size of the table.
+
+        Parameters:
+        - query: Optional base query (e.g. with loader options).
+        - batch_size: Number of rows fetched at a time.
+
+        Returns:
+        - An iterator of objects.
+        """
+        if query is None:
+            query = self.model.query
+        return iter(query.order_by(
+            self.model.created_at, self.model.id).yield_per(batch_size))
+
+    def get_page(self, limit, cursor=None, query=None):
+        """
+        Retrieve one page of objects using keyset pagination.
+
+        Objects are ordered by (created_at, id), and the cursor remembers
+        the last key seen, so each page is a single indexed range scan
+        whatever the size of the table.
+
+        Parameters:
+        - limit: Maximum number of objects to return.
+        - cursor: Cursor returned with the previous page, or None.
+        - query: Optional base query (e.g. with loader options).
+
+        Returns:
+        - A tuple (objects, next_cursor); next_cursor is None on the
+          last page.
+        """
+        if query is None:
+            query = self.model.query
+        if cursor:
+            created_at, obj_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(self.model.created_at, self.model.id) >
+                tuple_(created_at, obj_id))
+        # Récupère un élément de plus pour savoir s'il existe une page suivante
+        objs = query.order_by(
+            self.model.created_at, self.model.id).limit(limit + 1).all()
+        if len(objs) > limit:
+            objs = objs[:limit]
+            return objs, encode_cursor(objs[-1])
+        return objs, None
+
+    def update(self, obj_id, data, commit=True):
         """
         Update an existing object in the database.
 
         Parameters:
         - obj_id: The ID of the object to update.
         - data: A dictionary of attribute names and new values.
+        - commit: If False, or inside a unit of work, only flush.
         """
-        from app import db
-        obj = self.get(obj_id)
+        obj = self.get_for_update(obj_id)
         if not obj:
             raise ValueError(f"Object with ID '{obj_id} not found")
 
         for key, value in data.items():
             setattr(obj, key, value)
-        db.session.commit()
+        save(commit)
 
-    def delete(self, obj_id):
+    def delete(self, obj_id, commit=True):
         """
         Delete an object from the database.
 
-        Parameter:
+        Parameters:
         - obj_id: The ID of the object to delete.
+        - commit: If False, or inside a unit of work, only flush.
         """
         from app import db
-        obj = self.get(obj_id)
+        obj = self.get_for_update(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            save(commit)
 
     def get_by_attribute(self, attr_name, attr_value):
         """
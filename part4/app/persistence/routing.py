@@ -0,0 +1,106 @@
+"""
+Read replica routing for the SQLAlchemy session.
+
+db.session is a RoutingSession: when read replicas are configured
+(DB_REPLICA_URLS), each SELECT goes to one of them, picked at random,
+and everything else goes to the primary database:
+
+- writes: flushes (add/update/delete of the repositories) and Core
+  INSERT/UPDATE/DELETE statements;
+- raw SQL (text()), whose effect cannot be known;
+- reads inside a unit of work (@transactional): they prepare a write
+  and must see the current data;
+- reads inside `with primary():`, used by the repositories to load the
+  object they are about to modify;
+- every read of the request after its first write (read-your-writes):
+  the replica may not have received the write yet.
+
+The session, and so this state, lives as long as the request. A write
+is not seen by the replicas of later requests until they catch up;
+callers needing their own writes right away should read them in the
+request that made them.
+
+Replica engines belong to the app (not to Flask-SQLAlchemy: no model is
+bound to them, so create_all() and init-db never touch them) and get the
+same engine options and SQLite pragmas as the primary. A replica is a
+copy of the primary, kept in sync by the database. SQLite replica paths
+must be absolute.
+
+Configuration keys (see config.py):
+- DB_REPLICA_URLS: database URLs of the replicas, none by default.
+"""
+import random
+from contextlib import contextmanager
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+
+_EXTENSION_KEY = 'db_replicas'
+_PRIMARY_KEY = 'routing_primary_depth'
+_STICKY_KEY = 'routing_sticky'
+_REPLICAS_KEY = 'routing_replicas'
+_DEPTH_KEY = 'unit_of_work_depth'       # Voir unit_of_work.py
+
+
+class RoutingSession(Session):
+    """Session sending reads to the replicas and writes to the primary."""
+
+    def replicas(self):
+        """Engines of the replicas (empty list without replica)."""
+        replicas = self.info.get(_REPLICAS_KEY)
+        if replicas is None:
+            replicas = self.info[_REPLICAS_KEY] = replica_engines(
+                current_app)
+        return replicas
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind,
+                                  **kwargs)
+        replicas = self.replicas()
+        if bind is not None or not replicas:
+            return engine
+        if self._flushing or getattr(clause, 'is_dml', False):
+            # Écriture : les lectures suivantes de la requête la voient
+            self.info[_STICKY_KEY] = True
+            return engine
+        if (not getattr(clause, 'is_select', False)
+                or self.info.get(_STICKY_KEY)
+                or self.info.get(_PRIMARY_KEY, 0)
+                or self.info.get(_DEPTH_KEY, 0)):
+            return engine
+        return random.choice(replicas)
+
+
+def _session():
+    """Current session (db.session is a proxy to it)."""
+    from app.extensions import db
+    return db.session()
+
+
+def has_replicas():
+    """True if reads can go to a replica."""
+    return bool(_session().replicas())
+
+
+@contextmanager
+def primary():
+    """Send the reads of the block to the primary database."""
+    info = _session().info
+    info[_PRIMARY_KEY] = info.get(_PRIMARY_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_PRIMARY_KEY] -= 1
+
+
+def replica_engines(app):
+    """Engines of the replicas of an app."""
+    return app.extensions.get(_EXTENSION_KEY, [])
+
+
+def init_app(app):
+    """Create the replica engines; call after db.init_app(app)."""
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    app.extensions[_EXTENSION_KEY] = [
+        create_engine(url, **options)
+        for url in app.config.get('DB_REPLICA_URLS') or ()]
@@ -0,0 +1,156 @@
+"""
+SQLite FTS5 full-text index over place titles/descriptions and reviews.
+
+Two external-content FTS5 tables mirror the text columns:
+- places_fts(_title, _description) over places
+- reviews_fts(_text) over reviews
+
+External content tables read the text back (for snippets) from the
+source columns of the same name.
+
+The FTS rowid of a row is its _search_rowid column, not the SQLite rowid
+of the source table: places and reviews have a TEXT primary key, so their
+rowid is implicit and VACUUM may renumber it, which would point the index
+at other rows. The insert trigger gives each new row the next
+_search_rowid.
+
+They only store the inverted index (the text stays in the base tables)
+and are kept in sync by AFTER INSERT/UPDATE/DELETE triggers, so ORM
+writes, Core bulk inserts and raw SQL all update the index.
+
+The tables and triggers are created with the base tables by
+db.create_all(), or added to an older database by `flask init-db`
+(app/persistence/migrations.py). After writing to places/reviews with
+the triggers disabled, refill them with:
+    flask --app run rebuild-search-index
+"""
+from sqlalchemy import event, text
+from app.models.place import Place
+from app.models.review import Review
+
+# Les accents sont ignorés : "chateau" trouve "château"
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+# Colonne entière stable servant de rowid aux tables FTS
+ROWID_COLUMN = '_search_rowid'
+
+# (table FTS, table source, colonnes indexées)
+INDEXES = (
+    ('places_fts', 'places', ('_title', '_description')),
+    ('reviews_fts', 'reviews', ('_text',)),
+)
+
+
+def _statements(fts, source, source_columns):
+    """CREATE statements of one FTS table and its sync triggers."""
+    columns = ', '.join(source_columns)
+    new_values = ', '.join(f'new.{col}' for col in source_columns)
+    old_values = ', '.join(f'old.{col}' for col in source_columns)
+    # Numérote la nouvelle ligne si l'INSERT ne l'a pas fait
+    number = (f"UPDATE {source} SET {ROWID_COLUMN} = (SELECT "
+              f"coalesce(max({ROWID_COLUMN}), 0) + 1 FROM {source}) "
+              f"WHERE rowid = new.rowid AND {ROWID_COLUMN} IS NULL;")
+    insert = (f"INSERT INTO {fts}(rowid, {columns}) "
+              f"SELECT {ROWID_COLUMN}, {columns} FROM {source} "
+              f"WHERE rowid = new.rowid;")
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+              f"VALUES ('delete', old.{ROWID_COLUMN}, {old_values});")
+    update = (f"INSERT INTO {fts}(rowid, {columns}) "
+              f"VALUES (new.{ROWID_COLUMN}, {new_values});")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{source}', content_rowid='{ROWID_COLUMN}', "
+        f"tokenize='{TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} "
+        f"BEGIN {number} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF "
+        f"{columns} ON {source} "
+        f"BEGIN {delete} {update} END",
+    ]
+
+
+def create(connection, sources=None):
+    """
+    Create the FTS tables and triggers if missing (SQLite only).
+
+    Parameters:
+    - connection: A SQLAlchemy connection.
+    - sources: Names of the source tables to index (default: all).
+
+    Returns:
+    - The names of the FTS tables that did not exist, or were replaced
+      because they used the SQLite rowid of the source table; they are
+      empty until rebuilt.
+    """
+    if connection.dialect.name != 'sqlite':
+        return []
+    created = []
+    for index in INDEXES:
+        if sources is None or index[1] in sources:
+            definition = _definition(connection, index[0])
+            if definition is None:
+                created.append(index[0])
+            elif f"content_rowid='{ROWID_COLUMN}'" not in definition:
+                # Index d'une version antérieure : rowid instable
+                drop(connection, {index[1]})
+                created.append(index[0])
+            for statement in _statements(*index):
+                connection.execute(text(statement))
+    return created
+
+
+def _definition(connection, name):
+    """CREATE statement of a table, or None if it does not exist."""
+    return connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' "
+        "AND name = :name"), {'name': name}).scalar()
+
+
+def drop(connection, sources=None):
+    """Drop the FTS tables and their triggers."""
+    if connection.dialect.name != 'sqlite':
+        return
+    for fts, source, _ in INDEXES:
+        if sources is None or source in sources:
+            for suffix in ('ai', 'ad', 'au'):
+                connection.execute(text(
+                    f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+
+
+def rebuild(connection, tables=None):
+    """
+    Refill FTS tables from the base tables.
+
+    Rows written with the triggers disabled are numbered first.
+
+    Parameters:
+    - connection: A SQLAlchemy connection.
+    - tables: Names of the FTS tables to rebuild (default: all).
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    for fts, source, _ in INDEXES:
+        if tables is None or fts in tables:
+            # max + rowid : valeurs distinctes, au-delà des existantes
+            connection.execute(text(
+                f"UPDATE {source} SET {ROWID_COLUMN} = (SELECT "
+                f"coalesce(max({ROWID_COLUMN}), 0) FROM {source}) + rowid "
+                f"WHERE {ROWID_COLUMN} IS NULL"))
+            connection.execute(text(
+                f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _after_create(target, connection, **kw):
+    create(connection, {target.name})
+
+
+def _before_drop(target, connection, **kw):
+    drop(connection, {target.name})
+
+
+for _table in (Place.__table__, Review.__table__):
+    event.listen(_table, 'after_create', _after_create)
+    event.listen(_table, 'before_drop', _before_drop)
@@ -0,0 +1,443 @@
+"""
+Store of the refresh tokens issued, keyed by their `jti` claim.
+
+A login starts a token family. Refreshing consumes the refresh token
+(each one can be used once) and issues the next token of the family. A
+consumed token presented again is a replay: it was copied by someone
+else, or the client kept an old one. consume() raises TokenReplay and
+the caller revokes the whole family, so whoever holds a token of it has
+to log in again.
+
+The store also records the access and refresh tokens revoked by a
+logout, so that every process can add them to its local denylist
+(app/utils/denylist.py): revoke_token() appends a revocation,
+revoked_since() returns those made after a cursor.
+
+Every backend finds a token by its jti in O(1) and drops tokens in order
+of expiration:
+
+- MemoryTokenStore ('memory'): dicts in process memory and a heap of
+  expiration times. Sessions are lost on restart and not shared between
+  processes; meant as a stand-in for local development and tests.
+- SQLTokenStore ('sqlite'): table refresh_tokens of the app database,
+  so sessions survive restarts and are shared by every worker. Using a
+  token is one UPDATE by primary key; an in-memory index of the tokens
+  seen by the process answers its known replays and expired tokens
+  without SQL. A token the index does not know (issued by another
+  process, or evicted) is looked up in the table. Revocations are rows of revoked_tokens. Expired rows are
+  deleted every PURGE_EVERY tokens issued (or with purge()).
+- RedisTokenStore ('redis'): any server speaking the Redis protocol
+  (Redis, Valkey, KeyDB, ...); needs the optional `redis` package. Keys
+  expire with their token; revocations are a sorted set, numbered and
+  added by one Lua script, purged every PURGE_EVERY revocations.
+
+Configuration keys (see config.py):
+- TOKEN_STORE_BACKEND: 'sqlite' (default), 'memory' or 'redis'.
+- TOKEN_STORE_MAX_ENTRIES: tokens kept in process memory.
+- TOKEN_STORE_REDIS_URL: URL of the Redis-compatible server.
+"""
+from abc import ABC, abstractmethod
+import bisect
+import heapq
+import threading
+import time
+from sqlalchemy import delete, select, update
+from app.extensions import db
+from app.models.refresh_token import refresh_tokens, revoked_tokens
+from app.persistence.unit_of_work import on_commit
+
+DEFAULT_MAX_ENTRIES = 200000
+PURGE_EVERY = 1000
+
+# Numérote et ajoute une révocation en une seule commande atomique : un
+# lecteur ne voit jamais le n° N+1 avant le n° N (son curseur sauterait N)
+# KEYS : ensemble trié, compteur ; ARGV : membre "jti|exp"
+REVOKE_SCRIPT = """
+local number = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], number, ARGV[1])
+return number
+"""
+
+
+class TokenReplay(Exception):
+    """Raised when a refresh token is used a second time."""
+    def __init__(self, family_id):
+        super().__init__("Refresh token reuse detected")
+        self.family_id = family_id
+
+
+class TokenStore(ABC):
+    """Common interface and counters of every backend."""
+    def __init__(self):
+        self.issued = 0
+        self.rotations = 0
+        self.replays = 0
+
+    def add(self, jti, user_id, family_id, expires_at):
+        """
+        Register a refresh token.
+
+        Parameters:
+        - jti: `jti` claim of the token.
+        - user_id: Owner of the token.
+        - family_id: Login the token descends from.
+        - expires_at: `exp` claim (epoch seconds).
+        """
+        self.issued += 1
+        self._add(jti, user_id, family_id, expires_at)
+
+    def consume(self, jti):
+        """
+        Mark a refresh token as used.
+
+        Returns:
+        - {'user_id', 'family_id', 'expires_at'} of the token, or None if
+          it is unknown, expired or revoked.
+
+        Raises:
+        - TokenReplay: The token was already used.
+        """
+        try:
+            record = self._consume(jti)
+        except TokenReplay:
+            self.replays += 1
+            raise
+        if record is not None:
+            self.rotations += 1
+        return record
+
+    def stats(self):
+        """Counters and number of tokens stored."""
+        return {
+            'backend': self.name,
+            'active': self.size(),
+            'issued': self.issued,
+            'rotations': self.rotations,
+            'replays': self.replays
+        }
+
+    @abstractmethod
+    def _add(self, jti, user_id, family_id, expires_at):
+        """Store a token (see add())."""
+        pass
+
+    @abstractmethod
+    def _consume(self, jti):
+        """Mark a token as used and return its record (see consume())."""
+        pass
+
+    @abstractmethod
+    def revoke_family(self, family_id):
+        """Remove every token of a family."""
+        pass
+
+    @abstractmethod
+    def revoke_token(self, jti, expires_at):
+        """
+        Record a revoked token (access or refresh) for every process.
+
+        Parameters:
+        - jti: `jti` claim of the token.
+        - expires_at: `exp` claim (epoch seconds); None keeps it forever.
+        """
+        pass
+
+    @abstractmethod
+    def revoked_since(self, cursor):
+        """
+        Tokens revoked after a cursor, in order of revocation.
+
+        Parameters:
+        - cursor: 0, or the cursor returned by the previous call.
+
+        Returns:
+        - ([(jti, expires_at)], cursor to pass to the next call).
+        """
+        pass
+
+    def size(self):
+        """Number of tokens stored, or None if unknown."""
+        return None
+
+
+class MemoryTokenStore(TokenStore):
+    """Tokens in process memory, evicted in order of expiration."""
+    name = 'memory'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        super().__init__()
+        self.max_entries = max_entries
+        self._clock = clock
+        self._tokens = {}       # jti -> [user_id, family_id, expires_at, used]
+        self._families = {}     # family_id -> {jti}
+        self._expiry = []       # Tas de (expires_at, jti)
+        self._revocations = []  # (n°, jti, expires_at) par n° croissant
+        self._revocation_count = 0
+        self._lock = threading.Lock()
+
+    def _add(self, jti, user_id, family_id, expires_at, used=False):
+        with self._lock:
+            self._tokens[jti] = [user_id, family_id, expires_at, used]
+            self._families.setdefault(family_id, set()).add(jti)
+            heapq.heappush(self._expiry, (expires_at, jti))
+            self._evict()
+
+    def _evict(self):
+        """Drop expired tokens, then the soonest to expire if full."""
+        now = self._clock()
+        expiry = self._expiry
+        while expiry and (expiry[0][0] <= now or
+                          len(self._tokens) > self.max_entries):
+            _, jti = heapq.heappop(expiry)
+            self._forget(jti)           # Déjà absent si famille révoquée
+
+    def _forget(self, jti):
+        entry = self._tokens.pop(jti, None)
+        if entry is not None:
+            family = self._families.get(entry[1])
+            if family is not None:
+                family.discard(jti)
+                if not family:
+                    del self._families[entry[1]]
+
+    def peek(self, jti, expired=False):
+        """
+        Return [user_id, family_id, expires_at, used] or None; an expired
+        token (not yet evicted) only if `expired` is True.
+        """
+        entry = self._tokens.get(jti)
+        if entry is None or (not expired and entry[2] <= self._clock()):
+            return None
+        return entry
+
+    def _consume(self, jti):
+        with self._lock:
+            entry = self.peek(jti)
+            if entry is None:
+                return None
+            if entry[3]:
+                raise TokenReplay(entry[1])
+            entry[3] = True
+            return _record(*entry[:3])
+
+    def mark_used(self, jti, user_id, family_id, expires_at):
+        """Record a token as used (added if unknown)."""
+        with self._lock:
+            entry = self._tokens.get(jti)
+            if entry is not None:
+                entry[3] = True
+                return
+        self._add(jti, user_id, family_id, expires_at, used=True)
+
+    def revoke_family(self, family_id):
+        with self._lock:
+            for jti in self._families.pop(family_id, ()):
+                self._tokens.pop(jti, None)
+
+    def revoke_token(self, jti, expires_at):
+        with self._lock:
+            self._revocation_count += 1
+            self._revocations.append(
+                (self._revocation_count, jti, expires_at))
+            if len(self._revocations) > self.max_entries:
+                now = self._clock()
+                self._revocations = [
+                    entry for entry in self._revocations
+                    if entry[2] is None or entry[2] > now]
+
+    def revoked_since(self, cursor):
+        with self._lock:
+            # Premier n° après le curseur : (n,) précède (n, jti, exp)
+            start = bisect.bisect_left(self._revocations, (cursor + 1,))
+            return ([(jti, expires_at) for _, jti, expires_at
+                     in self._revocations[start:]], self._revocation_count)
+
+    def size(self):
+        return len(self._tokens)
+
+
+class SQLTokenStore(TokenStore):
+    """Tokens in the refresh_tokens table, with an in-memory index."""
+    name = 'sqlite'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        super().__init__()
+        self._clock = clock
+        self.index = MemoryTokenStore(max_entries, clock)
+
+    def _add(self, jti, user_id, family_id, expires_at):
+        db.session.execute(refresh_tokens.insert().values(
+            jti=jti, user_id=user_id, family_id=family_id,
+            expires_at=expires_at, used=False))
+        # L'index ne voit le token qu'une fois la ligne commitée
+        on_commit(lambda: self.index.add(jti, user_id, family_id, expires_at))
+        if self.issued % PURGE_EVERY == 0:
+            self.purge()
+
+    def _consume(self, jti):
+        now = int(self._clock())
+        entry = self.index.peek(jti, expired=True)
+        if entry is not None:
+            if entry[2] <= now:
+                return None                     # Expiré : sans SQL
+            if entry[3]:
+                raise TokenReplay(entry[1])     # Replay connu : sans SQL
+        columns = refresh_tokens.c
+        statement = (
+            update(refresh_tokens)
+            .where(columns.jti == jti, columns.used.is_(False),
+                   columns.expires_at > now)
+            .values(used=True))
+        if db.engine.dialect.update_returning:
+            row = db.session.execute(statement.returning(
+                columns.user_id, columns.family_id,
+                columns.expires_at)).first()
+        else:
+            row = None
+            if db.session.execute(statement).rowcount == 1:
+                row = db.session.execute(select(
+                    columns.user_id, columns.family_id, columns.expires_at)
+                    .where(columns.jti == jti)).first()
+        if row is not None:
+            record = _record(*row)
+            on_commit(lambda: self.index.mark_used(jti, *row))
+            return record
+        # Aucune ligne modifiée : inconnu, expiré ou déjà utilisé (par un
+        # autre process)
+        row = db.session.execute(
+            select(columns.family_id, columns.expires_at)
+            .where(columns.jti == jti)).first()
+        if row is None or row.expires_at <= now:
+            return None
+        raise TokenReplay(row.family_id)
+
+    def revoke_family(self, family_id):
+        db.session.execute(delete(refresh_tokens).where(
+            refresh_tokens.c.family_id == family_id))
+        on_commit(lambda: self.index.revoke_family(family_id))
+
+    def revoke_token(self, jti, expires_at):
+        db.session.execute(revoked_tokens.insert().values(
+            jti=jti, expires_at=expires_at))
+
+    def revoked_since(self, cursor):
+        columns = revoked_tokens.c
+        rows = db.session.execute(
+            select(columns.id, columns.jti, columns.expires_at)
+            .where(columns.id > cursor).order_by(columns.id)).all()
+        if rows:
+            cursor = rows[-1].id
+        return [(row.jti, row.expires_at) for row in rows], cursor
+
+    def purge(self):
+        """Delete the expired rows; return their count."""
+        now = int(self._clock())
+        count = db.session.execute(delete(refresh_tokens).where(
+            refresh_tokens.c.expires_at <= now)).rowcount
+        return count + db.session.execute(delete(revoked_tokens).where(
+            revoked_tokens.c.expires_at <= now)).rowcount
+
+    def size(self):
+        return db.session.execute(
+            select(db.func.count()).select_from(refresh_tokens)).scalar()
+
+
+class RedisTokenStore(TokenStore):
+    """Tokens stored as hashes in a Redis-compatible server."""
+    name = 'redis'
+
+    def __init__(self, url, prefix='hbnb:rt:', client=None, clock=time.time):
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "TOKEN_STORE_BACKEND='redis' needs the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._clock = clock
+
+    def _add(self, jti, user_id, family_id, expires_at):
+        key, family = self.prefix + jti, self.prefix + 'family:' + family_id
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={'user_id': user_id, 'family_id': family_id,
+                                'expires_at': expires_at})
+        pipe.expireat(key, expires_at)          # Expiration gérée par Redis
+        pipe.sadd(family, jti)
+        pipe.expireat(family, expires_at)
+        pipe.execute()
+
+    def _consume(self, jti):
+        key = self.prefix + jti
+        data = {_text(k): _text(v) for k, v in self.client.hgetall(key).items()}
+        if not data or int(data['expires_at']) <= self._clock():
+            return None
+        # HSETNX est atomique : un seul appel voit le champ absent
+        pipe = self.client.pipeline()
+        pipe.hsetnx(key, 'used', 1)
+        pipe.expireat(key, int(data['expires_at']))
+        first_use, _ = pipe.execute()
+        if not first_use:
+            raise TokenReplay(data['family_id'])
+        return _record(data['user_id'], data['family_id'],
+                       int(data['expires_at']))
+
+    def revoke_family(self, family_id):
+        family = self.prefix + 'family:' + family_id
+        keys = [self.prefix + _text(jti)
+                for jti in self.client.smembers(family)]
+        self.client.delete(family, *keys)
+
+    def revoke_token(self, jti, expires_at):
+        key = self.prefix + 'revoked'
+        # Score : n° de la révocation, membre : "jti|exp"
+        expires = '' if expires_at is None else expires_at
+        number = int(self.client.eval(
+            REVOKE_SCRIPT, 2, key, key + ':count', f'{jti}|{expires}'))
+        if number % PURGE_EVERY == 0:
+            self.purge_revoked()
+
+    def revoked_since(self, cursor):
+        revoked = []
+        for member, score in self.client.zrangebyscore(
+                self.prefix + 'revoked', f'({cursor}', '+inf',
+                withscores=True):
+            jti, _, expires = _text(member).partition('|')
+            revoked.append((jti, int(expires) if expires else None))
+            cursor = int(score)
+        return revoked, cursor
+
+    def purge_revoked(self):
+        """Remove the expired revocations; return their count."""
+        key, now = self.prefix + 'revoked', self._clock()
+        expired = [member for member in self.client.zrange(key, 0, -1)
+                   if 0 < int(_text(member).partition('|')[2] or 0) <= now]
+        if expired:
+            self.client.zrem(key, *expired)
+        return len(expired)
+
+
+def _record(user_id, family_id, expires_at):
+    return {'user_id': user_id, 'family_id': family_id,
+            'expires_at': expires_at}
+
+
+def _text(value):
+    """Decode a Redis reply (bytes unless decode_responses)."""
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def make_token_store(config):
+    """Build the token store described by a Flask config mapping."""
+    backend = config.get('TOKEN_STORE_BACKEND', 'sqlite')
+    max_entries = config.get('TOKEN_STORE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    if backend == 'sqlite':
+        return SQLTokenStore(max_entries)
+    if backend == 'memory':
+        return MemoryTokenStore(max_entries)
+    if backend == 'redis':
+        return RedisTokenStore(config.get(
+            'TOKEN_STORE_REDIS_URL', 'redis://localhost:6379/0'))
+    raise ValueError(f"Unknown TOKEN_STORE_BACKEND: {backend}")
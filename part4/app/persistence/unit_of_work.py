@@ -0,0 +1,92 @@
+"""
+Unit of work for the SQLAlchemy persistence layer.
+
+Repositories used to commit after every add/update/delete, so a single
+facade operation could issue several commits. Inside a unit of work they
+only flush, and the outermost unit of work commits once on success or
+rolls everything back on error.
+
+Usage:
+    with unit_of_work():
+        repo.add(obj)
+        repo.update(obj_id, data)      # flushed, not committed
+    # one commit here
+
+    @transactional
+    def create_something(self, data):
+        ...
+
+Units of work can be nested: only the outermost one commits.
+Callbacks registered with on_commit() run after that commit.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from app.extensions import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+_CALLBACKS_KEY = 'unit_of_work_on_commit'
+
+
+def in_unit_of_work():
+    """Return True if a unit of work is open on the current session."""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work():
+    """Group repository writes into a single transaction."""
+    info = db.session.info
+    info[_DEPTH_KEY] = info.get(_DEPTH_KEY, 0) + 1
+    try:
+        yield db.session
+        if info[_DEPTH_KEY] == 1:
+            db.session.commit()
+            for callback in info.pop(_CALLBACKS_KEY, []):
+                callback()
+    except Exception:
+        if info[_DEPTH_KEY] == 1:
+            db.session.rollback()
+            info.pop(_CALLBACKS_KEY, None)
+        raise
+    finally:
+        info[_DEPTH_KEY] -= 1
+
+
+def on_commit(callback):
+    """
+    Run `callback` once the current unit of work has committed.
+
+    Without an open unit of work the callback runs immediately; if the
+    unit of work is rolled back the callback is dropped.
+    """
+    if in_unit_of_work():
+        db.session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
+
+
+def transactional(f):
+    """Decorator running a function inside a unit of work."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        with unit_of_work():
+            return f(*args, **kwargs)
+    return decorated
+
+
+def save(commit=True):
+    """
+    Persist pending changes of the current session.
+
+    Commits when `commit` is True and no unit of work is open, otherwise
+    only flushes so the enclosing transaction decides. A failed commit is
+    rolled back to leave the session usable.
+    """
+    if commit and not in_unit_of_work():
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    else:
+        db.session.flush()
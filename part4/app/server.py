@@ -0,0 +1,93 @@
+"""
+Worker model of the production server.
+
+wsgi.py builds the app once; gunicorn (gunicorn.conf.py) imports it in
+the master process (preload) and forks the workers afterwards, so the
+imports, the serializers and the app factory run once instead of once
+per worker, and the workers share these pages copy-on-write.
+
+Things that must not cross a fork are recreated by after_fork() in each
+worker: the pooled database connections, replicas included (a SQLite or
+PostgreSQL connection cannot be shared by two processes), and the
+threads of the password hashing pool (threads do not survive a fork).
+
+The worker model is read from the environment by worker_settings():
+- HBNB_BIND: address to listen on (0.0.0.0:8000).
+- HBNB_WORKERS: processes (one per CPU by default).
+- HBNB_THREADS: request threads per process (4). Above 1, gunicorn uses
+  its `gthread` worker; threads help while a request waits for the
+  database or for bcrypt, which release the GIL.
+- HBNB_TIMEOUT: seconds before a stuck worker is restarted (30).
+- HBNB_KEEPALIVE: seconds an idle keep-alive connection is kept (5).
+- HBNB_MAX_REQUESTS: requests before a worker is replaced, 0 to never
+  replace it (0); a random jitter of 10% spreads the restarts.
+- HBNB_ACCESS_LOG: access log file, '-' for stderr (off by default).
+"""
+import os
+from app.extensions import db, password_hasher
+from app.persistence.routing import replica_engines
+
+DEFAULT_BIND = '0.0.0.0:8000'
+DEFAULT_THREADS = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_KEEPALIVE = 5
+
+
+def _positive(environ, name, default, minimum=1):
+    """Integer environment variable, at least `minimum`."""
+    raw = environ.get(name)
+    if raw in (None, ''):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    return value
+
+
+def worker_settings(environ=None):
+    """
+    Gunicorn settings of the worker model.
+
+    Parameters:
+    - environ: Mapping read instead of os.environ (tests, benchmarks).
+
+    Returns:
+    - Dict of gunicorn setting names to values.
+
+    Raises:
+    - ValueError: A variable is not a valid number.
+    """
+    environ = os.environ if environ is None else environ
+    threads = _positive(environ, 'HBNB_THREADS', DEFAULT_THREADS)
+    max_requests = _positive(environ, 'HBNB_MAX_REQUESTS', 0, minimum=0)
+    return {
+        'bind': environ.get('HBNB_BIND') or DEFAULT_BIND,
+        'workers': _positive(environ, 'HBNB_WORKERS', os.cpu_count() or 1),
+        'threads': threads,
+        # gthread : plusieurs requêtes par process ; sync : une seule
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'timeout': _positive(environ, 'HBNB_TIMEOUT', DEFAULT_TIMEOUT),
+        'keepalive': _positive(environ, 'HBNB_KEEPALIVE', DEFAULT_KEEPALIVE),
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10,
+        # App chargée par le master avant le fork des workers
+        'preload_app': True,
+        'accesslog': environ.get('HBNB_ACCESS_LOG') or None,
+    }
+
+
+def after_fork(app):
+    """
+    Drop what a forked worker inherited from the master.
+
+    Connections opened by the master stay open for it (close=False) and
+    are simply forgotten by the worker, which opens its own.
+    """
+    with app.app_context():
+        for engine in [*db.engines.values(), *replica_engines(app)]:
+            engine.dispose(close=False)
+    # Les threads du pool ne sont pas copiés par fork() : nouveau pool
+    password_hasher.init_app(app)
@@ -0,0 +1,140 @@
+"""
+AsyncHBnBFacade module.
+
+Asynchronous counterpart of the read methods of HBnBFacade for places,
+reviews and amenities, used by the ASGI read API (app/async_api.py).
+A request waiting for the database no longer holds a thread: one event
+loop serves many concurrent requests.
+
+Each method opens its own AsyncSession, on a replica picked at random
+when DB_REPLICA_URLS is set (these are plain reads), loads the relations
+the view needs, and returns the same dictionaries as the synchronous
+API, built by the same serializers while the session is open.
+
+Writes are not part of this facade: they stay on HBnBFacade. Neither is
+the view cache: an in-process cache would never see the invalidations
+made by the Flask workers.
+"""
+import random
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.async_repository import AsyncSQLAlchemyRepository
+from app.persistence.repositories.place_repository import PLACE_RELATIONS
+from app.persistence.repositories.review_repository import ReviewRepository
+from app.utils.serializers import (
+    amenity_serializer, place_detail_serializer, place_list_serializer,
+    review_serializer)
+
+
+class AsyncHBnBFacade:
+    def __init__(self, engine, replicas=()):
+        """
+        Initialize the read repositories and the session factories.
+
+        Parameters:
+        - engine: AsyncEngine of the primary database.
+        - replicas: AsyncEngines of the read replicas.
+        """
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        self.engines = [engine, *replicas]
+        # Lecture seule : rien n'est commité, rien à expirer
+        self._sessionmakers = [
+            async_sessionmaker(bind, expire_on_commit=False)
+            for bind in (replicas or [engine])]
+        self.place_repository = AsyncSQLAlchemyRepository(
+            Place, PLACE_RELATIONS)
+        self.review_repository = AsyncSQLAlchemyRepository(
+            Review, ReviewRepository.relations)
+        self.amenity_repository = AsyncSQLAlchemyRepository(Amenity)
+
+    def session(self):
+        """New AsyncSession, on a replica if there are any."""
+        return random.choice(self._sessionmakers)()
+
+    async def dispose(self):
+        """Close the pooled connections of every engine."""
+        for engine in self.engines:
+            await engine.dispose()
+
+    async def _all(self, repository, serializer, embed=()):
+        """Serialized list of all the objects of a repository."""
+        async with self.session() as session:
+            objs = await repository.get_all(session, embed)
+            return serializer.many(objs)
+
+    async def _page(self, repository, serializer, limit, cursor, embed=()):
+        """Serialized page of a repository and the next cursor."""
+        async with self.session() as session:
+            objs, next_cursor = await repository.get_page(
+                session, limit, cursor, embed)
+            return serializer.many(objs), next_cursor
+
+    async def _detail(self, repository, serializer, obj_id, embed=()):
+        """Serialized object, or None if it does not exist."""
+        async with self.session() as session:
+            obj = await repository.get(session, obj_id, embed)
+            return serializer(obj) if obj else None
+
+# ------------------------------------------------------- methodes facade place
+    async def get_all_places(self):
+        """Return the list view of all places, relations included."""
+        return await self._all(
+            self.place_repository, place_list_serializer, PLACE_RELATIONS)
+
+    async def get_places_page(self, limit, cursor=None):
+        """Return one page of the place list view and the next cursor."""
+        return await self._page(self.place_repository, place_list_serializer,
+                                limit, cursor, PLACE_RELATIONS)
+
+    async def get_place_detail(self, place_id):
+        """
+        Get the API view of a place with owner, amenities and reviews.
+
+        Returns None if the place does not exist.
+
+        Raises:
+        - ValueError: If the owner of the place does not exist.
+        """
+        async with self.session() as session:
+            place = await self.place_repository.get(
+                session, place_id, PLACE_RELATIONS)
+            if not place:
+                return None
+            if not place.owner_rel:
+                raise ValueError("Owner not found")
+            return place_detail_serializer(place)
+
+# ------------------------------------------------------ methodes facade review
+    async def get_all_reviews(self):
+        """Return the view of all reviews (without user and place)."""
+        return await self._all(
+            self.review_repository, review_serializer.variant(embed=()))
+
+    async def get_reviews_page(self, limit, cursor=None):
+        """Return one page of reviews and the cursor of the next page."""
+        return await self._page(
+            self.review_repository, review_serializer.variant(embed=()),
+            limit, cursor)
+
+    async def get_review_detail(self, review_id):
+        """Get the API view of a review, or None if it does not exist."""
+        return await self._detail(
+            self.review_repository, review_serializer.variant(embed=()),
+            review_id)
+
+# ----------------------------------------------------- methodes facade amenity
+    async def get_all_amenities(self):
+        """Return the view of all amenities."""
+        return await self._all(self.amenity_repository, amenity_serializer)
+
+    async def get_amenities_page(self, limit, cursor=None):
+        """Return one page of amenities and the cursor of the next page."""
+        return await self._page(
+            self.amenity_repository, amenity_serializer, limit, cursor)
+
+    async def get_amenity_detail(self, amenity_id):
+        """Get the API view of an amenity, or None if it does not exist."""
+        return await self._detail(
+            self.amenity_repository, amenity_serializer, amenity_id)
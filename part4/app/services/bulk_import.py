@@ -0,0 +1,316 @@
+"""
+Bulk import of amenities, places and reviews from NDJSON.
+
+Each line of the input is one JSON object with a "type" key:
+- {"type": "amenity", "name": ..., "id": optional}
+- {"type": "place", "title": ..., "price": ..., "latitude": ...,
+   "longitude": ..., "owner_id": ..., "description": optional,
+   "amenities": optional list of amenity ids, "id": optional}
+- {"type": "review", "text": ..., "rating": ..., "place_id": ...,
+   "user_id": ...}
+
+Rows are validated with the model setters, then inserted batch by batch
+with one executemany per table and one commit per batch. A bad row is
+reported with its line number and skipped; it never aborts its batch.
+"""
+import json
+from sqlalchemy import bindparam, inspect
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.place_amenity import place_amenity
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+# Ordre d'insertion dans un batch : les parents avant les enfants
+INSERT_ORDER = ('amenity', 'place', 'review')
+
+
+class _Ref:
+    """Stand-in for a related object: the models only read its id."""
+    def __init__(self, obj_id):
+        self.id = obj_id
+
+
+class _Row:
+    """A validated row waiting to be inserted."""
+    def __init__(self, line, kind, mapping, amenity_ids=()):
+        self.line = line
+        self.kind = kind
+        self.mapping = mapping
+        self.amenity_ids = set(amenity_ids)
+
+
+def _to_mapping(obj):
+    """Return the column values of a model instance as a dictionary."""
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(type(obj)).column_attrs
+    }
+
+
+def _build_amenity(data):
+    """Validate an amenity row through the Amenity setters."""
+    amenity = Amenity(data.get('name'))
+    return amenity, ()
+
+
+def _build_place(data):
+    """Validate a place row through the Place setters."""
+    owner_id = data.get('owner_id') or data.get('owner')
+    if not isinstance(owner_id, str) or not owner_id:
+        raise ValueError("owner_id is required")
+    amenity_ids = data.get('amenities') or []
+    if not isinstance(amenity_ids, list) or not all(
+            isinstance(a_id, str) for a_id in amenity_ids):
+        raise TypeError("amenities must be a list of amenity ids")
+    place = Place(
+        data.get('title'),
+        data.get('price'),
+        data.get('latitude'),
+        data.get('longitude'),
+        _Ref(owner_id),
+        data.get('description')
+    )
+    return place, set(amenity_ids)
+
+
+def _build_review(data):
+    """Validate a review row through the Review setters."""
+    for key in ('place_id', 'user_id'):
+        if not isinstance(data.get(key), str) or not data.get(key):
+            raise ValueError(f"{key} is required")
+    review = Review(
+        data.get('text'),
+        data.get('rating'),
+        _Ref(data['place_id']),
+        _Ref(data['user_id'])
+    )
+    return review, ()
+
+
+BUILDERS = {
+    'amenity': (Amenity, _build_amenity),
+    'place': (Place, _build_place),
+    'review': (Review, _build_review),
+}
+
+
+class BulkImporter:
+    """
+    Streams NDJSON lines into the database in batched transactions.
+
+    Usage:
+        report = BulkImporter(batch_size=500).run(lines)
+
+    The report has the number of inserted rows per type, the number of
+    rejected rows and the first MAX_REPORTED_ERRORS errors.
+    """
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.batch_size = batch_size
+        self.inserted = {kind: 0 for kind in INSERT_ORDER}
+        self.error_count = 0
+        self.errors = []
+
+    def run(self, lines):
+        """Import every line of an iterable of str or bytes."""
+        batch = []
+        for line_no, line in enumerate(lines, start=1):
+            row = self._parse(line_no, line)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+        return self.report()
+
+    def report(self):
+        """Summary of the import so far."""
+        return {
+            'inserted': dict(self.inserted),
+            'error_count': self.error_count,
+            'errors': list(self.errors)
+        }
+
+# ---------------------------------------------------------- Lecture des lignes
+    def _error(self, line_no, message):
+        """Record an error for a line without stopping the import."""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_no, 'error': message})
+
+    def _parse(self, line_no, line):
+        """Decode and validate one line, return a _Row or None."""
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            return None
+        try:
+            data = json.loads(line)
+        except ValueError:
+            self._error(line_no, "Invalid JSON")
+            return None
+        if not isinstance(data, dict):
+            self._error(line_no, "Each line must be a JSON object")
+            return None
+        kind = data.get('type')
+        if kind not in BUILDERS:
+            self._error(line_no, f"Unknown type: {kind}")
+            return None
+        _, build = BUILDERS[kind]
+        try:
+            obj, amenity_ids = build(data)
+        except (TypeError, ValueError) as e:
+            self._error(line_no, f"Invalid {kind} data: {str(e)}")
+            return None
+        if data.get('id') is not None:
+            if not isinstance(data['id'], str) or not data['id']:
+                self._error(line_no, "id must be a non-empty string")
+                return None
+            obj.id = data['id']
+        return _Row(line_no, kind, _to_mapping(obj), amenity_ids)
+
+# --------------------------------------------------------- Écriture des batchs
+    def _flush(self, batch):
+        """Insert one batch in a single transaction."""
+        rows = self._check_references(batch)
+        try:
+            with db.session.begin_nested():
+                self._insert(rows)
+            counts = rows
+        except IntegrityError:
+            # Un doublon dans le batch : on isole les lignes fautives
+            counts = []
+            failed = set()
+            for row in sorted(rows, key=lambda r: INSERT_ORDER.index(r.kind)):
+                parents = {row.mapping.get('place_id')} | row.amenity_ids
+                if parents & failed:
+                    self._error(row.line, "Referenced row was rejected")
+                    continue
+                try:
+                    with db.session.begin_nested():
+                        self._insert([row])
+                    counts.append(row)
+                except IntegrityError:
+                    failed.add(row.mapping['id'])
+                    self._error(
+                        row.line,
+                        f"Duplicate {row.kind} or constraint violation")
+        db.session.commit()
+        for row in counts:
+            self.inserted[row.kind] += 1
+
+    def _insert(self, rows):
+        """One executemany per table, parents first."""
+        for kind in INSERT_ORDER:
+            model, _ = BUILDERS[kind]
+            mappings = [row.mapping for row in rows if row.kind == kind]
+            if mappings:
+                db.session.execute(model.__table__.insert(), mappings)
+        links = [
+            {'place_id': row.mapping['id'], 'amenity_id': amenity_id}
+            for row in rows if row.kind == 'place'
+            for amenity_id in row.amenity_ids
+        ]
+        if links:
+            db.session.execute(place_amenity.insert(), links)
+        self._update_rating_aggregates(rows)
+
+    @staticmethod
+    def _update_rating_aggregates(rows):
+        """Add the imported reviews to review_count/rating_sum of places."""
+        deltas = {}
+        for row in rows:
+            if row.kind == 'review':
+                count, total = deltas.get(row.mapping['place_id'], (0, 0))
+                deltas[row.mapping['place_id']] = (
+                    count + 1, total + row.mapping['_rating'])
+        if not deltas:
+            return
+        places = Place.__table__
+        db.session.execute(
+            places.update()
+            .where(places.c.id == bindparam('place_id'))
+            .values(
+                review_count=places.c.review_count + bindparam('count'),
+                rating_sum=places.c.rating_sum + bindparam('total')),
+            [{'place_id': place_id, 'count': count, 'total': total}
+             for place_id, (count, total) in deltas.items()])
+
+    def _check_references(self, batch):
+        """
+        Drop rows pointing to missing users, places or amenities, and
+        reviews written by the owner of the place.
+
+        SQLite does not enforce foreign keys by default, so references
+        are checked here with one IN query per referenced table; the
+        place query also returns the owners.
+        """
+        wanted = {'user': set(), 'place': set(), 'amenity': set()}
+        for row in batch:
+            if row.kind == 'place':
+                wanted['user'].add(row.mapping['owner_id'])
+                wanted['amenity'].update(row.amenity_ids)
+            elif row.kind == 'review':
+                wanted['user'].add(row.mapping['user_id'])
+                wanted['place'].add(row.mapping['place_id'])
+        known = {
+            'user': self._existing_ids(User, wanted['user']),
+            'amenity': self._existing_ids(Amenity, wanted['amenity']),
+        }
+        owners = self._place_owners(wanted['place'])
+        # Les lignes du batch peuvent référencer des lignes du même batch
+        for row in batch:
+            if row.kind == 'place':
+                owners[row.mapping['id']] = row.mapping['owner_id']
+            elif row.kind == 'amenity':
+                known['amenity'].add(row.mapping['id'])
+
+        valid = []
+        for row in batch:
+            missing = None
+            if row.kind == 'place':
+                if row.mapping['owner_id'] not in known['user']:
+                    missing = "Owner user not found"
+                elif not row.amenity_ids <= known['amenity']:
+                    missing = "Amenity not found"
+            elif row.kind == 'review':
+                if row.mapping['user_id'] not in known['user']:
+                    missing = "User not found"
+                elif row.mapping['place_id'] not in owners:
+                    missing = "Place not found"
+                elif owners[row.mapping['place_id']] == row.mapping['user_id']:
+                    # Même règle que POST /reviews
+                    missing = "You cannot review your own place"
+            if missing:
+                self._error(row.line, missing)
+            else:
+                valid.append(row)
+        return valid
+
+    @staticmethod
+    def _existing_ids(model, ids):
+        """Return the subset of ids present in the model's table."""
+        if not ids:
+            return set()
+        return {
+            obj_id for (obj_id,) in db.session.query(model.id).filter(
+                model.id.in_(ids))
+        }
+
+    @staticmethod
+    def _place_owners(ids):
+        """Return {place id: owner id} for the ids present in places."""
+        if not ids:
+            return {}
+        return dict(db.session.query(Place.id, Place.owner_id).filter(
+            Place.id.in_(ids)))
@@ -6,24 +6,134 @@ the application logic and the database layer. It centralizes operations for
 users, places, amenities, and reviews, handling validation, relationships,
 and business rules.
 """
-from app.persistence.repository import SQLAlchemyRepository
 from app.persistence.repositories.user_repository import UserRepository
+from app.persistence.repositories.place_repository import (
+    PlaceRepository, PLACE_RELATIONS)
+from app.persistence.repositories.review_repository import ReviewRepository
+from app.persistence.repositories.amenity_repository import AmenityRepository
+from app.persistence.repositories.search_repository import SearchRepository
+from app.persistence.unit_of_work import transactional, on_commit
+from app.persistence.cache import LRUCache
+from app.persistence.token_store import MemoryTokenStore
+from sqlalchemy.exc import IntegrityError
 from werkzeug.exceptions import BadRequest
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.services.bulk_import import BulkImporter, DEFAULT_BATCH_SIZE
+from app.persistence.repository import encode_key, decode_key
+from app.utils import geo
+from app.utils.serializers import (
+    amenity_serializer, place_detail_serializer, user_serializer)
+
+
+def _stamp(version):
+    """Version token as stored with a cached view (JSON-safe)."""
+    return None if version is None else repr(version[1])
 
 
 class HBnBFacade:
     def __init__(self):
         """Initialize repositories for users, places, amenities, and reviews"""
         self.user_repository = UserRepository()
-        self.place_repository = SQLAlchemyRepository(Place)
-        self.review_repository = SQLAlchemyRepository(Review)
-        self.amenity_repository = SQLAlchemyRepository(Amenity)
+        self.place_repository = PlaceRepository()
+        self.review_repository = ReviewRepository()
+        self.amenity_repository = AmenityRepository()
+        self.search_repository = SearchRepository()
+        # Cache des vues d'une entité (remplacé par create_app selon config)
+        self.cache = LRUCache()
+        # Identités des users authentifiés, locales au process et courtes
+        self.identity_cache = LRUCache(ttl=30)
+        # Refresh tokens émis (remplacé par create_app selon config)
+        self.token_store = MemoryTokenStore()
+
+    def configure_cache(self, cache):
+        """Replace the cache backend used for single-entity views."""
+        self.cache = cache
+
+    def configure_identity_cache(self, cache):
+        """Replace the cache of the users resolved from JWTs."""
+        self.identity_cache = cache
+
+    def configure_token_store(self, store):
+        """Replace the store of the refresh tokens issued."""
+        self.token_store = store
+
+    def invalidate(self, *keys):
+        """
+        Drop cached views now and again once the transaction commits,
+        so a concurrent read cannot put back data older than the commit.
+        """
+        keys = [key for key in keys if key]
+        self.cache.delete(*keys)
+        on_commit(lambda: self.cache.delete(*keys))
+
+    def _cached_view(self, key, version, load):
+        """
+        Read-through access to a view, checked against the version of
+        its rows.
+
+        invalidate() only sees the writes of this process (other workers,
+        scripts and raw SQL bypass it), so each entry keeps the version
+        token it was built at and is rebuilt once the rows have another
+        one: the body then matches the ETag computed from that version.
+
+        Parameters:
+        - key: Cache key of the view.
+        - version: (last_modified, token) read by the caller, or None to
+          serve any cached entry.
+        - load: Callable building the view (None if not found).
+        """
+        view = self._fresh_view(key, version)
+        if view is None:
+            view = load()
+            if view is not None:
+                self.cache.set(key, [_stamp(version), view])
+        return view
+
+    def _fresh_view(self, key, version):
+        """Cached view of `key` if built at `version`, else None."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        stamp, view = entry
+        if version is not None and stamp != _stamp(version):
+            return None
+        return view
+
+# ----------------------------------------------- methodes facade validateurs
+    def get_version(self, kind, obj_id=None, embed=()):
+        """
+        Return the version of an entity or collection for HTTP caching.
+
+        Parameters:
+        - kind: 'user', 'place', 'review' or 'amenity'.
+        - obj_id: ID of one entity, or None for the whole collection.
+        - embed: Relations included in the representation.
+
+        Returns:
+        - (last_modified, token), or None if the entity does not exist.
+        """
+        repository = {
+            'user': self.user_repository,
+            'place': self.place_repository,
+            'review': self.review_repository,
+            'amenity': self.amenity_repository
+        }[kind]
+        return repository.version(obj_id, embed)
+
+    def get_place_detail_version(self, place_id):
+        """Return the version of a place with all its relations, which its
+        cached detail view is built at."""
+        return self.place_repository.version(place_id, PLACE_RELATIONS)
+
+    def get_place_reviews_version(self, place_id, embed=()):
+        """Return the version of the reviews of a place."""
+        return self.review_repository.place_reviews_version(place_id, embed)
 
 # -------------------------------------------------------- methodes facade user
+    @transactional
     def create_user(self, user_data):
         """Create a new user after validation."""
         if self.get_user_by_email(user_data['email']):
@@ -36,22 +146,73 @@ class HBnBFacade:
         except (ValueError, TypeError) as e:
             # Renvoie le bon message selon l'erreur
             raise ValueError(f"Invalid user data: {str(e)}")
-        # Si OK ajout du user à la table
-        self.user_repository.add(user)
+        try:
+            # Si OK ajout du user à la table
+            self.user_repository.add(user)
+        except IntegrityError:
+            # Même email (à la casse près) inséré entre la vérification
+            # et l'ajout
+            raise ValueError("This email is already registered.")
         return user
 
     def get_user_by_email(self, email):
         """Get a user by their email."""
         return self.user_repository.get_user_by_email(email)
 
-    def get_all_users(self):
-        """Return a list of all users."""
-        return self.user_repository.get_all()
+    def get_user_identity(self, user_id):
+        """
+        Get {'id', 'email', 'is_admin'} of a user for authorization,
+        through the identity cache (no SQL while the entry is fresh).
+        """
+        return self.identity_cache.get_or_set(
+            user_id, lambda: self.user_repository.get_identity(user_id))
+
+    def forget_user_identity(self, user_id):
+        """Drop a cached identity now and once the transaction commits."""
+        self.identity_cache.delete(user_id)
+        on_commit(lambda: self.identity_cache.delete(user_id))
+
+    @transactional
+    def authenticate(self, email, password):
+        """
+        Return the user matching the credentials, or None.
+
+        A password hashed with another bcrypt cost than BCRYPT_LOG_ROUNDS
+        is hashed again while the clear password is known.
+
+        Raises:
+        - HasherBusy: The hashing queue is full.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            # Nouveau hash au coût courant, enregistré au commit
+            user.password = password
+        return user
+
+    def get_all_users(self, embed=()):
+        """Return a list of all users, with the `embed` relations loaded."""
+        return self.user_repository.query_with(embed).all()
+
+    def get_users_page(self, limit, cursor=None, embed=()):
+        """Return one page of users and the cursor of the next page."""
+        return self.user_repository.get_page(
+            limit, cursor, query=self.user_repository.query_with(embed))
 
     def get_user(self, user_id):
         """Get a user by their ID."""
         return self.user_repository.get(user_id)
 
+    def get_user_detail(self, user_id, version=None):
+        """Get the API view of a user, through the cache (see
+        _cached_view() for `version`)."""
+        def load():
+            user = self.get_user(user_id)
+            return user_serializer.variant(embed=())(user) if user else None
+        return self._cached_view(f'user:{user_id}', version, load)
+
+    @transactional
     def update_user(self, user_id, update_data):
         """Update user data after checking permissions and validation."""
         # Récupère le user_id
@@ -86,9 +247,14 @@ class HBnBFacade:
 
         # Si tout est OK modification de la mémoire et de la BDD
         self.user_repository.update(user_id, update_data)
+        # Le user apparaît aussi dans le détail de ses places
+        self.invalidate(f'user:{user_id}',
+                        *(f'place:{place.id}' for place in user.places))
+        self.forget_user_identity(user_id)
         return user
 
 # ----------------------------------------------------- methodes facade amenity
+    @transactional
     def create_amenity(self, amenity_data):
         """Create a new amenity with validation."""
         # Récupère le 'name' de l'amenity
@@ -120,10 +286,25 @@ class HBnBFacade:
         """Return a list of all amenities."""
         return self.amenity_repository.get_all()
 
+    def get_amenities_page(self, limit, cursor=None):
+        """Return one page of amenities and the cursor of the next page."""
+        return self.amenity_repository.get_page(limit, cursor)
+
     def get_amenity(self, amenity_id):
         """Get an amenity by its ID."""
         return self.amenity_repository.get(amenity_id)
 
+    def get_amenity_detail(self, amenity_id, version=None):
+        """Get the API view of an amenity, through the cache (see
+        _cached_view() for `version`)."""
+        def load():
+            amenity = self.get_amenity(amenity_id)
+            if not amenity:
+                return None
+            return amenity_serializer(amenity)
+        return self._cached_view(f'amenity:{amenity_id}', version, load)
+
+    @transactional
     def update_amenity(self, amenity_id, update_data):
         """Update an existing amenity after validation."""
         # Récupère l'obj amenity par son id
@@ -152,33 +333,57 @@ class HBnBFacade:
         except (ValueError, TypeError) as e:
             # Renvoie le bon message selon l'erreur
             raise BadRequest(str(e))
+        # Le nom de l'amenity apparaît dans le détail des places liées
+        self.invalidate(
+            f'amenity:{amenity_id}',
+            *(f'place:{place.id}'
+              for place in self.get_places_by_amenity(amenity_id)))
         return amenity
 
     def get_amenities_by_place(self, place_id):
         """Get all amenities associated with a specific place."""
-        # Création d'une liste vide
-        amenities_list = []
-
-        # Boucle pour parcourir toutes les amenities de la BDD
-        for amenity in self.amenity_repository.get_all():
-            # Vérifie si l'une des places liées a le bon id
-            for place in amenity.places:
-                # Vérifie si l'id de la place match avec celui qu'on cherche
-                if place.id == place_id:
-                    # Ajoute l'amenity à la liste
-                    amenities_list.append({
-                        'id': amenity.id,
-                        'name': amenity.name
-                    })
-                    # Si match pas besoin de chercher plus
-                    break
-        return amenities_list
+        # Une seule requête : jointure sur place_amenity filtrée par place_id
+        amenities = self.amenity_repository.get_amenities_by_place(place_id)
+        return amenity_serializer.many(amenities)
 
 # ------------------------------------------------------- methodes facade place
     def get_place(self, place_id):
         """Get a place by its ID."""
         return self.place_repository.get(place_id)
 
+    def get_place_detail(self, place_id, embed=None, version=None):
+        """Get the API view of a place with owner, amenities and reviews.
+
+        The full view is served from the cache. With `embed` naming only
+        some relations, the cached view is trimmed if present, otherwise
+        only those relations are loaded. `version` is the one returned by
+        get_place_detail_version() (see _cached_view()). Returns None if
+        the place does not exist.
+        """
+        key = f'place:{place_id}'
+        if embed is None or set(embed) >= set(PLACE_RELATIONS):
+            return self._cached_view(
+                key, version, lambda: self._build_place_detail(place_id))
+        detail = self._fresh_view(key, version)
+        if detail is None:
+            return self._build_place_detail(place_id, embed)
+        return {
+            name: value for name, value in detail.items()
+            if name not in PLACE_RELATIONS or name in embed
+        }
+
+    def _build_place_detail(self, place_id, embed=None):
+        """Build the place detail dictionary from the database."""
+        if embed is None:
+            embed = PLACE_RELATIONS
+        place = self.place_repository.get_with_relations(place_id, embed)
+        if not place:
+            return None
+        if 'owner' in embed and not place.owner_rel:
+            raise ValueError("Owner not found")
+        return place_detail_serializer.variant(embed=embed)(place)
+
+    @transactional
     def create_place(self, place_data):
         """Create a new place linked to its owner after validation."""
         # Vérifie si le champ owner est rempli
@@ -194,17 +399,15 @@ class HBnBFacade:
         if not owner:
             raise ValueError(f"Owner user with id {owner_id} does not exist.")
 
-        # Boucle pour parcourir les places
-        for existing in self.place_repository.get_all():
-            # Vérifie que les attributs ensemble n'existent pas
-            if (
-                existing.title == place_data.get("title") and
-                existing.latitude == place_data.get("latitude") and
-                existing.longitude == place_data.get("longitude") and
-                existing.owner_id == owner_id
-            ):
-                raise ValueError(
-                    "A place with the same attributs already exists.")
+        # Vérifie via l'index unique qu'une place identique n'existe pas
+        if self.place_repository.get_duplicate(
+            owner_id,
+            place_data.get("title"),
+            place_data.get("latitude"),
+            place_data.get("longitude")
+        ):
+            raise ValueError(
+                "A place with the same attributs already exists.")
 
         # Supprime l'entrée si elle existe
         place_data.pop('owner', None)
@@ -215,6 +418,10 @@ class HBnBFacade:
             # Ajout de la place dans le storage
             self.place_repository.add(place)
             return place
+        except IntegrityError:
+            # Doublon inséré entre la vérification et l'ajout
+            raise ValueError(
+                "A place with the same attributs already exists.")
         except (TypeError, ValueError) as e:
             # Renvoie le bon message selon l'erreur
             raise ValueError(f"Invalid place data: {str(e)}")
@@ -223,6 +430,66 @@ class HBnBFacade:
         """Return a list of all places."""
         return self.place_repository.get_all()
 
+    def get_all_places_with_relations(self, embed=None):
+        """Return all places with owner, amenities and reviews preloaded.
+
+        `embed` restricts the preloaded relations (default: all).
+        """
+        return self.place_repository.get_all_with_relations(embed)
+
+    def stream_places(self, embed=None):
+        """Iterate over all places in batches (see Repository.stream)."""
+        return self.place_repository.stream_with_relations(embed)
+
+    def get_places_page(self, limit, cursor=None, embed=None):
+        """Return one page of places (relations preloaded) and next cursor."""
+        return self.place_repository.get_page_with_relations(
+            limit, cursor, embed)
+
+    def filter_places(self, limit, cursor=None, min_price=None,
+                      max_price=None, amenity_ids=None, match='all',
+                      embed=None):
+        """
+        Return one page of places matching price and amenity filters.
+
+        Filters are compiled to SQL by the repository; the facet counts
+        (places per amenity among the matches) come from one aggregate
+        query.
+
+        Returns:
+        - A tuple (places, next_cursor, facets), facets being a list of
+          {'id', 'name', 'count'} dictionaries.
+        """
+        if match not in ('all', 'any'):
+            raise ValueError("amenities_match must be 'all' or 'any'")
+        for key, value in (('min_price', min_price),
+                           ('max_price', max_price)):
+            if value is not None and value < 0:
+                raise ValueError(f"{key} must be a positive number")
+        if (min_price is not None and max_price is not None and
+                min_price > max_price):
+            raise ValueError("min_price must not exceed max_price")
+
+        filters = {
+            'min_price': min_price,
+            'max_price': max_price,
+            'amenity_ids': amenity_ids,
+            'match': match
+        }
+        places, next_cursor = self.place_repository.get_filtered_page(
+            limit, cursor, embed, **filters)
+        facets = [
+            {'id': amenity_id, 'name': name, 'count': count}
+            for amenity_id, name, count
+            in self.place_repository.get_amenity_facets(**filters)
+        ]
+        return places, next_cursor, facets
+
+    def get_places_by_amenity(self, amenity_id):
+        """Return all places offering a specific amenity."""
+        return self.place_repository.get_places_by_amenity(amenity_id)
+
+    @transactional
     def update_place(self, place_id, place_data, is_admin=False):
         """Update place data after validation."""
         # Récupère l'obj place par son id
@@ -243,26 +510,120 @@ class HBnBFacade:
             if key not in allowed_fields:
                 raise ValueError(f"Unexpected field: {key}")
 
-        # Si tout est OK -> modifie la BDD
-        self.place_repository.update(place_id, place_data)
+        try:
+            # Si tout est OK -> modifie la BDD
+            self.place_repository.update(place_id, place_data)
+        except IntegrityError:
+            # Même owner, titre et position qu'une autre place
+            raise ValueError(
+                "A place with the same attributs already exists.")
+        self.invalidate(f'place:{place_id}')
         return place
 
+# --------------------------------------------- methodes facade recherche place
+    def search_places_nearby(self, latitude, longitude, radius_km,
+                             limit, cursor=None, embed=None):
+        """
+        Find the places within `radius_km` of a point, nearest first.
+
+        Candidates come from range scans on the geohash index over the
+        cells covering the circle; only their coordinates are read, the
+        exact haversine distance filters and sorts them, and only the
+        places of the requested page are loaded with their relations.
+
+        Returns:
+        - A tuple ([(place, distance_km), ...], next_cursor).
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("lat must be between -90.0 and 90.0")
+        if not -180 <= longitude <= 180:
+            raise ValueError("lon must be between -180.0 and 180.0")
+        if not 0 < radius_km <= geo.MAX_RADIUS_KM:
+            raise ValueError(
+                f"radius_km must be between 0 and {geo.MAX_RADIUS_KM}")
+
+        # Candidats : places dont le geohash est dans les cellules voisines
+        cells = geo.covering_cells(latitude, longitude, radius_km)
+        candidates = self.place_repository.get_coordinates_in_cells(cells)
+
+        # Filtre exact par distance puis tri (distance, id)
+        matches = []
+        for place_id, lat, lon in candidates:
+            distance = geo.haversine_km(latitude, longitude, lat, lon)
+            if distance <= radius_km:
+                matches.append((distance, place_id))
+        matches.sort()
+
+        # Reprise après la dernière clé (distance, id) de la page précédente
+        if cursor:
+            last_distance, last_id = decode_key(cursor, 2)
+            if not isinstance(last_distance, (int, float)):
+                raise ValueError("Invalid cursor")
+            last_key = (last_distance, str(last_id))
+            matches = [key for key in matches if key > last_key]
+
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_key(list(matches[-1]))
+
+        places = self.place_repository.get_many_with_relations(
+            [place_id for _, place_id in matches], embed)
+        return [
+            (places[place_id], distance)
+            for distance, place_id in matches if place_id in places
+        ], next_cursor
+
+    def search_places_text(self, terms, limit, cursor=None, embed=None):
+        """
+        Full-text search over place titles, descriptions and reviews.
+
+        Places are ranked by BM25 (best first) and the page is loaded
+        with its relations in one batch.
+
+        Returns:
+        - A tuple ([(place, score, snippet), ...], next_cursor); higher
+          scores are better.
+        """
+        after = None
+        if cursor:
+            score, place_id = decode_key(cursor, 2)
+            if not isinstance(score, (int, float)):
+                raise ValueError("Invalid cursor")
+            after = (score, str(place_id))
+
+        rows = self.search_repository.search_places(terms, limit + 1, after)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            place_id, score, _ = rows[-1]
+            next_cursor = encode_key([score, place_id])
+
+        places = self.place_repository.get_many_with_relations(
+            [place_id for place_id, _, _ in rows], embed)
+        # BM25 de FTS5 est négatif : on expose un score croissant
+        return [
+            (places[place_id], -score, snippet)
+            for place_id, score, snippet in rows if place_id in places
+        ], next_cursor
+
+    @transactional
+    def backfill_geohashes(self):
+        """Compute the missing geohashes of places."""
+        return self.place_repository.backfill_geohashes()
+
 # ------------------------------------------------------ methodes facade review
-    def get_reviews_by_place(self, place_id):
+    def get_reviews_by_place(self, place_id, embed=()):
         """Get all reviews for a specific place."""
-        # Création d'une liste vide
-        reviews_place = []
-        # Récupération de tout les reviews
-        all_reviews = self.review_repository.get_all()
-
-        # Boucle sur toutes les reviews de la BDD
-        for review in all_reviews:
-            # Vérifie si il y a match
-            if review.place_id == place_id:
-                # Ajoute la review à la liste
-                reviews_place.append(review)
-        return reviews_place
+        # Filtre fait par la BDD sur la colonne indexée place_id
+        return self.review_repository.get_reviews_by_place(place_id, embed)
+
+    def get_review_by_user_and_place(self, user_id, place_id):
+        """Get the review written by a user for a place, or None."""
+        return self.review_repository.get_review_by_user_and_place(
+            user_id, place_id)
 
+    @transactional
     def create_review(self, review_data):
         """Create a new review with validation and relational linking."""
         # Récupère la place
@@ -291,18 +652,39 @@ class HBnBFacade:
             # Gestion des messages selon l'erreur
             raise ValueError(f"Invalid review: {str(e)}")
 
-        # Ajout de la review à la BDD
-        self.review_repository.add(review)
+        try:
+            # Ajout de la review à la BDD
+            self.review_repository.add(review)
+        except IntegrityError:
+            # Même user et même place (ix_reviews_user_place) : l'API ne
+            # vérifie que le user du token, et une autre requête peut
+            # insérer entre la vérification et l'ajout
+            raise ValueError("You have already reviewed this place")
+        # Mise à jour du nombre de reviews et de la somme des notes
+        self.place_repository.adjust_rating(place.id, 1, review.rating)
+        # Le détail de la place contient ses reviews
+        self.invalidate(f'place:{place.id}')
         return review
 
     def get_review(self, review_id):
         """Get a review by its ID."""
         return self.review_repository.get(review_id)
 
-    def get_all_reviews(self):
-        """Return a list of all reviews."""
-        return self.review_repository.get_all()
+    def get_all_reviews(self, embed=()):
+        """Return a list of all reviews, with the `embed` relations loaded."""
+        return self.review_repository.query_with(embed).all()
+
+    def stream_reviews(self, embed=()):
+        """Iterate over all reviews in batches (see Repository.stream)."""
+        return self.review_repository.stream(
+            self.review_repository.query_with(embed))
+
+    def get_reviews_page(self, limit, cursor=None, embed=()):
+        """Return one page of reviews and the cursor of the next page."""
+        return self.review_repository.get_page(
+            limit, cursor, query=self.review_repository.query_with(embed))
 
+    @transactional
     def update_review(self, review_id, update_data):
         """Update review data and linked user/place if necessary."""
         # Récupère la review
@@ -311,6 +693,9 @@ class HBnBFacade:
         # Vérifie si elle existe
         if not review:
             return None
+        # Place et note actuelles, pour invalider et corriger les agrégats
+        old_place_id = review.place_id
+        old_rating = review.rating
 
         # Vérifie si le user_id des nouvelles données
         if 'user_id' in update_data:
@@ -342,8 +727,18 @@ class HBnBFacade:
 
         # Si tout est OK modifie la BDD
         self.review_repository.update(review_id, update_data)
+        # Corrige les agrégats de note (ancienne et nouvelle place)
+        if review.place_id != old_place_id:
+            self.place_repository.adjust_rating(old_place_id, -1, -old_rating)
+            self.place_repository.adjust_rating(
+                review.place_id, 1, review.rating)
+        elif review.rating != old_rating:
+            self.place_repository.adjust_rating(
+                old_place_id, 0, review.rating - old_rating)
+        self.invalidate(f'place:{old_place_id}', f'place:{review.place_id}')
         return review
 
+    @transactional
     def delete_review(self, review_id):
         """Delete a review by its ID."""
         # Récupère la review par son id
@@ -354,9 +749,29 @@ class HBnBFacade:
             raise ValueError("Review not found")
 
         # Suprrime la review
+        place_id = review.place_id
+        rating = review.rating
         self.review_repository.delete(review_id)
+        self.place_repository.adjust_rating(place_id, -1, -rating)
+        self.invalidate(f'place:{place_id}')
         return True
 
     def get_review_by_id(self, review_id):
         """Alias for getting a review by ID (duplicate of get_review)."""
         return self.review_repository.get(review_id)
+
+    @transactional
+    def backfill_rating_aggregates(self):
+        """Recompute review_count and rating_sum of all places."""
+        count = self.place_repository.recompute_rating_aggregates()
+        self.cache.clear()
+        return count
+
+# ------------------------------------------------------- methodes facade import
+    def bulk_import(self, lines, batch_size=DEFAULT_BATCH_SIZE):
+        """Import NDJSON amenities, places and reviews in batches."""
+        try:
+            return BulkImporter(batch_size).run(lines)
+        finally:
+            # Les reviews importées modifient le détail de places existantes
+            self.cache.clear()
@@ -0,0 +1,175 @@
+"""
+Identity of the user behind an authenticated request.
+
+flask-jwt-extended calls load_identity() once per request, when
+@jwt_required() verifies the token, and keeps the result for the rest of
+the request: views and admin_only read `current_user` (an Identity)
+instead of querying the users table.
+
+- `id` comes from the token claims; the user must still exist.
+- `is_admin` comes from the users table, not from the claims, so that
+  revoking the admin flag takes effect on tokens already issued.
+- The row is read through the facade identity cache
+  (IDENTITY_CACHE_TTL seconds, dropped when the user is updated), so
+  authorization costs no SQL while the entry is fresh.
+- Tokens revoked by POST /api/v1/auth/logout are refused (401) through
+  the `jti` denylist of app/utils/denylist.py. revoke() also writes them
+  to the token store, which is shared by the workers (sqlite, redis);
+  each process adds the revocations of the others to its denylist every
+  JWT_DENYLIST_SYNC_INTERVAL seconds.
+
+Refresh tokens rotate: issue_tokens() registers each one in the token
+store (app/persistence/token_store.py) with the family of its login,
+rotate_tokens() consumes it and issues the next one. Reusing a consumed
+refresh token revokes its whole family.
+
+Configuration keys (see config.py):
+- IDENTITY_CACHE_TTL / IDENTITY_CACHE_MAX_ENTRIES: identity cache.
+- JWT_DENYLIST_CAPACITY / JWT_DENYLIST_ERROR_RATE: denylist filter.
+- TOKEN_STORE_*: refresh token store.
+"""
+import time
+import uuid
+from datetime import timedelta
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from app.extensions import jwt
+from app.persistence.cache import LRUCache
+from app.persistence.token_store import TokenReplay, make_token_store
+from app.persistence.unit_of_work import transactional, unit_of_work
+from app.services import facade
+from app.utils.denylist import (
+    TokenDenylist, DEFAULT_CAPACITY, DEFAULT_ERROR_RATE,
+    DEFAULT_SYNC_INTERVAL)
+
+DEFAULT_TTL = 30
+DEFAULT_MAX_ENTRIES = 10000
+
+denylist = TokenDenylist()
+
+
+class Identity:
+    """Authenticated user, as seen by authorization checks."""
+    __slots__ = ('id', 'is_admin', 'email', 'jti')
+
+    def __init__(self, user_id, is_admin, email, jti):
+        self.id = user_id
+        self.is_admin = is_admin
+        self.email = email
+        self.jti = jti
+
+    def __repr__(self):
+        return f"Identity(id={self.id!r}, is_admin={self.is_admin!r})"
+
+    def owns(self, owner_id):
+        """Return True if `owner_id` is this user."""
+        return str(owner_id) == self.id
+
+
+def load_identity(jwt_header, jwt_data):
+    """user_lookup_loader: Identity of a token, or None (401)."""
+    claims = jwt_data['sub']
+    user = facade.get_user_identity(str(claims['id']))
+    if user is None:
+        return None
+    return Identity(user['id'], user['is_admin'], user['email'],
+                    jwt_data.get('jti'))
+
+
+def is_revoked(jwt_header, jwt_data):
+    """token_in_blocklist_loader: True if the token was revoked."""
+    # Révocations des autres workers (au plus une lecture par intervalle)
+    denylist.sync(facade.token_store.revoked_since)
+    return denylist.is_revoked(jwt_data['jti'])
+
+
+def revoke(jwt_data):
+    """
+    Revoke a decoded token until it expires, in this process and in the
+    token store (for the other processes); for a refresh token, its
+    whole family is removed from the token store.
+    """
+    denylist.revoke(jwt_data['jti'], jwt_data.get('exp'))
+    with unit_of_work():
+        facade.token_store.revoke_token(jwt_data['jti'], jwt_data.get('exp'))
+        if jwt_data.get('type') == 'refresh' and jwt_data.get('fam'):
+            facade.token_store.revoke_family(jwt_data['fam'])
+
+
+def _refresh_expires_at():
+    """`exp` of a refresh token issued now (epoch seconds)."""
+    lifetime = current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    if not isinstance(lifetime, timedelta):      # False : pas d'expiration
+        lifetime = timedelta(days=3650)
+    return int(time.time() + lifetime.total_seconds())
+
+
+@transactional
+def issue_tokens(user_id, is_admin, family_id=None):
+    """
+    Create an access token and a registered refresh token.
+
+    Parameters:
+    - user_id, is_admin: Identity put in the tokens.
+    - family_id: Family of the refresh token (None starts a new one).
+
+    Returns:
+    - {'access_token', 'refresh_token'}.
+    """
+    identity = {'id': user_id, 'is_admin': is_admin}
+    jti, expires_at = str(uuid.uuid4()), _refresh_expires_at()
+    family_id = family_id or str(uuid.uuid4())
+    # jti et exp choisis ici pour être enregistrés sans décoder le token
+    refresh_token = create_refresh_token(identity=identity, additional_claims={
+        'jti': jti, 'exp': expires_at, 'fam': family_id})
+    facade.token_store.add(jti, user_id, family_id, expires_at)
+    return {
+        'access_token': create_access_token(identity=identity),
+        'refresh_token': refresh_token
+    }
+
+
+def rotate_tokens(jwt_data):
+    """
+    Exchange a refresh token for new tokens of the same family.
+
+    `is_admin` is read again from the users table: the refresh token may
+    predate a change of the flag.
+
+    Returns:
+    - {'access_token', 'refresh_token'}, or None if the refresh token is
+      unknown to the store, expired or revoked.
+
+    Raises:
+    - TokenReplay: The token was already used; its family is revoked.
+    """
+    try:
+        with unit_of_work():
+            record = facade.token_store.consume(jwt_data['jti'])
+            if record is None:
+                return None
+            user = facade.get_user_identity(record['user_id'])
+            if user is None:                    # User supprimé depuis
+                return None
+            return issue_tokens(record['user_id'], user['is_admin'],
+                                record['family_id'])
+    except TokenReplay as e:
+        # Transaction séparée : la révocation doit survivre à l'erreur
+        with unit_of_work():
+            facade.token_store.revoke_family(e.family_id)
+        raise
+
+
+def init_app(app):
+    """Configure the caches and register the JWT callbacks."""
+    facade.configure_identity_cache(LRUCache(
+        max_entries=app.config.get('IDENTITY_CACHE_MAX_ENTRIES',
+                                   DEFAULT_MAX_ENTRIES),
+        ttl=app.config.get('IDENTITY_CACHE_TTL', DEFAULT_TTL)))
+    denylist.configure(
+        app.config.get('JWT_DENYLIST_CAPACITY', DEFAULT_CAPACITY),
+        app.config.get('JWT_DENYLIST_ERROR_RATE', DEFAULT_ERROR_RATE),
+        app.config.get('JWT_DENYLIST_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL))
+    facade.configure_token_store(make_token_store(app.config))
+    jwt.user_lookup_loader(load_identity)
+    jwt.token_in_blocklist_loader(is_revoked)
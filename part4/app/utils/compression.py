@@ -0,0 +1,173 @@
+"""
+HTTP response compression (gzip, and brotli when installed).
+
+- Dynamic responses (JSON API, HTML, ...) are compressed after the view,
+  with the best encoding accepted by the client (Accept-Encoding), when
+  their body reaches a minimum size.
+- Static frontend assets are compressed once by a build step
+  (`flask compress-frontend`, see precompress_directory()) and served
+  as .br / .gz files (see app/frontend.py).
+
+Compressing changes the bytes but not the meaning of a response, so a
+strong ETag becomes weak (as nginx does): If-None-Match keeps matching
+with the weak comparison used by app/utils/conditional.py.
+
+Configuration keys (see config.py):
+- COMPRESS_ENABLED: compress dynamic responses (default True).
+- COMPRESS_MIN_SIZE: smaller bodies are sent as is, in bytes.
+- COMPRESS_LEVEL: gzip level (1-9).
+- COMPRESS_BR_LEVEL: brotli quality (0-11).
+"""
+import gzip
+import os
+from flask import current_app, request
+
+try:                                    # Dépendance optionnelle
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIN_SIZE = 500
+DEFAULT_LEVEL = 6
+DEFAULT_BR_LEVEL = 4
+
+# Types de contenu compressés à la volée
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'text/html', 'text/css', 'text/javascript', 'text/plain',
+    'image/svg+xml'
+})
+# Extensions des assets précompressés (les images PNG/JPEG le sont déjà)
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.svg', '.json', '.txt')
+
+# Extension des fichiers précompressés, par ordre de préférence
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    """Encodings this process can produce, preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encodings, encodings):
+    """
+    Pick the encoding to use for a response.
+
+    Parameters:
+    - accept_encodings: request.accept_encodings of the client.
+    - encodings: Encodings the server can send, preferred first.
+
+    Returns:
+    - The accepted encoding with the highest quality (server preference
+      on ties), or None for the identity encoding.
+    """
+    best, best_quality = None, 0
+    for encoding in encodings:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level=None):
+    """Compress bytes with 'gzip' or 'br' (None = default level)."""
+    if encoding == 'br':
+        return brotli.compress(
+            data, quality=DEFAULT_BR_LEVEL if level is None else level)
+    # mtime=0 : même entrée, même sortie (ETag et cache stables)
+    return gzip.compress(
+        data, compresslevel=DEFAULT_LEVEL if level is None else level,
+        mtime=0)
+
+
+def _compressible(response):
+    """Return True if the response body can be compressed here."""
+    return (200 <= response.status_code < 300 and
+            response.status_code not in (204, 206) and
+            not response.direct_passthrough and
+            not response.is_streamed and
+            'Content-Encoding' not in response.headers and
+            response.mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def compress_response(response):
+    """after_request hook compressing dynamic responses."""
+    config = current_app.config
+    if not config.get('COMPRESS_ENABLED', True) or not _compressible(
+            response):
+        return response
+    # Le contenu dépend d'Accept-Encoding, même s'il n'est pas compressé
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < config.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE):
+        return response
+    encoding = negotiate(request.accept_encodings, available_encodings())
+    if encoding is None:
+        return response
+    level = config.get(
+        'COMPRESS_BR_LEVEL' if encoding == 'br' else 'COMPRESS_LEVEL')
+    response.set_data(compress(data, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def precompress_directory(root, min_size=DEFAULT_MIN_SIZE, encodings=None):
+    """
+    Write .br / .gz variants of the compressible files of a directory.
+
+    A variant is written only if it is smaller than the source, and
+    rebuilt only if the source changed since; variants no longer useful
+    are removed.
+
+    Parameters:
+    - root: Directory walked recursively.
+    - min_size: Smaller files are served as is.
+    - encodings: Encodings to produce (default: all available).
+
+    Returns:
+    - A list of (relative path, original size, {encoding: size}).
+    """
+    encodings = encodings or available_encodings()
+    report = []
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            sizes = {}
+            for encoding in encodings:
+                target = path + SUFFIXES[encoding]
+                if size < min_size:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                if (os.path.exists(target) and
+                        os.path.getmtime(target) >= os.path.getmtime(path)):
+                    sizes[encoding] = os.path.getsize(target)
+                    continue
+                with open(path, 'rb') as source:
+                    data = compress(source.read(), encoding, _max_level(
+                        encoding))
+                if len(data) >= size:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, 'wb') as output:
+                    output.write(data)
+                sizes[encoding] = len(data)
+            report.append((os.path.relpath(path, root), size, sizes))
+    return report
+
+
+def _max_level(encoding):
+    """Build step: compressed once, so use the best ratio."""
+    return 11 if encoding == 'br' else 9
+
+
+def init_app(app):
+    """Register the response compression hook."""
+    app.after_request(compress_response)
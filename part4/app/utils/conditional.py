@@ -0,0 +1,84 @@
+"""
+Conditional GET helpers (ETag, Last-Modified, 304 Not Modified).
+
+Read endpoints describe the state of what they return with a version
+(last_modified, token) computed by one aggregate query (see
+SQLAlchemyRepository.version()). The ETag hashes that token together with
+the request path and query string, since fields, embed, filters and
+pagination change the representation.
+
+- Single resources get a strong ETag, collections a weak one.
+- If-None-Match is checked first; If-Modified-Since is only used when
+  the request has no If-None-Match.
+- A 304 is returned before the response body is built, so matching
+  requests skip loading relations and serialization entirely.
+- Cached views are only served if built at the same version (see
+  HBnBFacade._cached_view()), so the body always matches its ETag.
+"""
+import hashlib
+from datetime import timezone
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+
+def make_etag(token, weak=False, variant=None):
+    """Build a quoted ETag from a version token and the current URL."""
+    digest = hashlib.sha1(repr(
+        (token, request.path, request.query_string, variant)
+    ).encode('utf-8')).hexdigest()[:32]
+    return quote_etag(digest, weak)
+
+
+def _as_utc(moment):
+    """Timestamps are stored as naive local times."""
+    return moment.astimezone(timezone.utc)
+
+
+def is_not_modified(etag, last_modified):
+    """Evaluate If-None-Match / If-Modified-Since against validators."""
+    if 'If-None-Match' in request.headers:
+        # Comparaison faible, comme le veut la RFC 9110 pour un GET
+        value = etag[3:-1] if etag.startswith('W/') else etag[1:-1]
+        return request.if_none_match.contains_weak(value)
+    since = request.if_modified_since
+    if since is not None and last_modified is not None:
+        # Last-Modified a une précision d'une seconde
+        return int(_as_utc(last_modified).timestamp()) <= int(
+            since.timestamp())
+    return False
+
+
+def conditional(version, build, weak=False, variant=None):
+    """
+    Answer a GET with validators, or 304 if the client copy is current.
+
+    Parameters:
+    - version: (last_modified, token) of the resource, or None if it
+      does not exist (the request is then passed to `build`).
+    - build: Callable returning the usual (body, status) tuple.
+    - weak: True for collections.
+    - variant: Representation chosen from the Accept header (e.g. JSON
+      or NDJSON), if the endpoint has several; it is part of the ETag
+      and the response gets `Vary: Accept`.
+
+    Returns:
+    - A Flask-RESTX compatible response.
+    """
+    if version is None:
+        return build()
+    last_modified, token = version
+    headers = {'ETag': make_etag(token, weak, variant)}
+    if variant is not None:
+        headers['Vary'] = 'Accept'
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(_as_utc(last_modified))
+    if is_not_modified(headers['ETag'], last_modified):
+        return Response(status=304, headers=headers)
+    body, status = build()
+    if status != 200:
+        return body, status
+    if isinstance(body, Response):
+        # Réponse en streaming : construite hors de Flask-RESTX
+        body.headers.update(headers)
+        return body
+    return body, status, headers
@@ -1,4 +1,6 @@
 from functools import wraps
+from flask_jwt_extended.exceptions import RevokedTokenError, UserLookupError
+from app.utils.hashing import HasherBusy
 
 def handle_errors(f):
     @wraps(f)
@@ -11,6 +13,10 @@ def handle_errors(f):
             return {'error': str(e)}, 400
         except TypeError as e:
             return {'error': str(e)}, 400
+        except (RevokedTokenError, UserLookupError):
+            raise                       # 401 renvoyé par flask-jwt-extended
+        except HasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
         except Exception as e:
             return {'error': f'Unexpected error: {str(e)}'}, 400
     return decorated
@@ -0,0 +1,167 @@
+"""
+In-memory denylist of revoked JWTs, keyed by their `jti` claim.
+
+Every authenticated request asks whether its token was revoked, and the
+answer is almost always no. A Bloom filter answers that case with a few
+bit tests and no false negative; only the tokens it flags (the revoked
+ones, plus about JWT_DENYLIST_ERROR_RATE of the others) are looked up in
+the exact set. The exact set keeps each jti until its token expires,
+then prune() drops it and rebuilds the filter.
+
+The denylist lives in the memory of one process. Revocations are also
+written to a shared store (the token store, see app/services/identity.py),
+and sync() adds those made by the other processes at most every
+JWT_DENYLIST_SYNC_INTERVAL seconds: a check stays a local lookup, and a
+token revoked by another worker is refused after that delay at most.
+
+Configuration keys (see config.py):
+- JWT_DENYLIST_CAPACITY: revoked tokens the filter is sized for.
+- JWT_DENYLIST_ERROR_RATE: false positive rate at that capacity.
+- JWT_DENYLIST_SYNC_INTERVAL: seconds between two reads of the store.
+"""
+import math
+import threading
+import time
+
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_SYNC_INTERVAL = 1.0
+MASK_64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Set membership with false positives but no false negatives."""
+    def __init__(self, capacity=DEFAULT_CAPACITY,
+                 error_rate=DEFAULT_ERROR_RATE):
+        # Taille optimale : m = -n.ln(p) / ln(2)², k = m/n.ln(2)
+        self.size = max(8, int(-capacity * math.log(error_rate) /
+                               math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @staticmethod
+    def _hashes(key):
+        """
+        Two 64-bit hashes of a key for double hashing. hash() of a str is
+        computed once and cached by Python; it is salted per process,
+        which is fine for a filter that never leaves the process.
+        """
+        h1 = hash(key) & MASK_64
+        # Mélange multiplicatif (Fibonacci) pour le second hash
+        h2 = ((h1 * 0x9E3779B97F4A7C15) & MASK_64) >> 1 | 1
+        return h1, h2
+
+    def add(self, key):
+        """Add a key."""
+        h1, h2 = self._hashes(key)
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        h1, h2 = self._hashes(key)
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            # Un bit à 0 suffit : cas courant, sort au premier ou second test
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class TokenDenylist:
+    """Revoked token ids: Bloom filter in front of an exact set."""
+    def __init__(self, capacity=DEFAULT_CAPACITY,
+                 error_rate=DEFAULT_ERROR_RATE, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.configure(capacity, error_rate)
+
+    def configure(self, capacity=DEFAULT_CAPACITY,
+                  error_rate=DEFAULT_ERROR_RATE,
+                  sync_interval=DEFAULT_SYNC_INTERVAL):
+        """Resize the filter and forget every revoked token."""
+        with self._lock:
+            self.capacity = capacity
+            self.error_rate = error_rate
+            self.sync_interval = sync_interval
+            self._revoked = {}                  # jti -> expiration (epoch)
+            self._bloom = BloomFilter(capacity, error_rate)
+            self.checks = 0
+            self.bloom_hits = 0
+            # Relu entièrement au premier sync()
+            self.cursor = 0
+            self.synced_at = None
+
+    def revoke(self, jti, expires_at=None):
+        """
+        Revoke a token.
+
+        Parameters:
+        - jti: `jti` claim of the token.
+        - expires_at: `exp` claim (epoch seconds); None keeps it forever.
+        """
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._bloom.add(jti)
+        if len(self._revoked) > self.capacity:
+            self.prune()
+
+    def sync(self, fetch):
+        """
+        Add the tokens revoked by other processes, at most once per
+        sync_interval seconds (the other calls return at once, as do the
+        other threads while one of them reads).
+
+        Parameters:
+        - fetch: Callable(cursor) returning ([(jti, expires_at)], cursor)
+          of the revocations after `cursor` (TokenStore.revoked_since()).
+        """
+        now = self._clock()
+        if self.synced_at is not None and (
+                now < self.synced_at + self.sync_interval):
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            revoked, cursor = fetch(self.cursor)
+            for jti, expires_at in revoked:
+                self.revoke(jti, expires_at)
+            self.cursor, self.synced_at = cursor, now
+        finally:
+            self._sync_lock.release()
+
+    def is_revoked(self, jti):
+        """Return True if the token was revoked."""
+        self.checks += 1
+        if jti not in self._bloom:
+            return False
+        self.bloom_hits += 1
+        return jti in self._revoked
+
+    def prune(self):
+        """Drop expired tokens and rebuild the filter; return the count."""
+        now = self._clock()
+        with self._lock:
+            alive = {jti: exp for jti, exp in self._revoked.items()
+                     if exp is None or exp > now}
+            removed = len(self._revoked) - len(alive)
+            # Toujours plein : le filtre grandit plutôt que de saturer
+            self.capacity = max(self.capacity, 2 * len(alive))
+            bloom = BloomFilter(self.capacity, self.error_rate)
+            for jti in alive:
+                bloom.add(jti)
+            self._revoked, self._bloom = alive, bloom
+        return removed
+
+    def stats(self):
+        """Size of the denylist and Bloom filter counters."""
+        return {
+            'revoked': len(self._revoked),
+            'bloom_bits': self._bloom.size,
+            'bloom_hashes': self._bloom.hashes,
+            'checks': self.checks,
+            'bloom_hits': self.bloom_hits,
+            'synced_at': self.synced_at
+        }
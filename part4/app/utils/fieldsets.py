@@ -0,0 +1,86 @@
+"""
+Sparse fieldsets and embed control shared by the read endpoints.
+
+Read endpoints accept two optional query parameters:
+- fields: comma-separated top-level keys to return (e.g. id,title,price).
+- embed: comma-separated relations to nest (e.g. owner,amenities).
+
+Only the embedded relations are loaded from the database, and only the
+requested keys are serialized. An embedded relation is always returned,
+even if it is not listed in `fields`. When `embed` is missing, the
+relations listed in `fields` are embedded; when both are missing the
+endpoint keeps its default shape.
+"""
+from flask_restx import reqparse
+from app.utils.pagination import parse_query_args
+
+fieldset_parser = reqparse.RequestParser()
+fieldset_parser.add_argument(
+    'fields', type=str, action='split', location='args',
+    help='Comma-separated keys to return')
+fieldset_parser.add_argument(
+    'embed', type=str, action='split', location='args',
+    help='Comma-separated relations to nest')
+
+
+class Shape:
+    """Requested response shape: top-level keys and embedded relations."""
+    def __init__(self, fields=None, embed=()):
+        self.fields = fields                    # None = toutes les clés
+        self.embed = frozenset(embed)
+
+    def wants(self, key):
+        """Return True if the key is part of the response."""
+        return self.fields is None or key in self.fields
+
+    def embeds(self, relation):
+        """Return True if the relation must be loaded and nested."""
+        return relation in self.embed
+
+    def apply(self, item):
+        """Keep only the requested keys of a dictionary."""
+        if self.fields is None:
+            return item
+        return {key: value for key, value in item.items()
+                if key in self.fields}
+
+
+def _names(values):
+    """Clean a split query parameter into a set, or None if absent."""
+    if values is None:
+        return None
+    return {value.strip() for value in values if value.strip()}
+
+
+def get_shape(allowed_fields, relations=(), default_embed=()):
+    """
+    Parse and validate the `fields` and `embed` query parameters.
+
+    Parameters:
+    - allowed_fields: Keys the endpoint can return (relations excluded).
+    - relations: Relations the endpoint can embed.
+    - default_embed: Relations embedded when neither parameter is given.
+
+    Returns:
+    - A Shape.
+
+    Raises:
+    - ValueError: If a field or relation is unknown.
+    """
+    args = parse_query_args(fieldset_parser)
+    fields, embed = _names(args.get('fields')), _names(args.get('embed'))
+    relations = set(relations)
+    if fields is not None:
+        unknown = fields - set(allowed_fields) - relations
+        if unknown:
+            raise ValueError(f"Unknown field: {', '.join(sorted(unknown))}")
+    if embed is not None:
+        unknown = embed - relations
+        if unknown:
+            raise ValueError(f"Cannot embed: {', '.join(sorted(unknown))}")
+
+    if embed is None:
+        embed = fields & relations if fields is not None else default_embed
+    if fields is not None:
+        fields = fields | set(embed)
+    return Shape(fields, embed)
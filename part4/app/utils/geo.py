@@ -0,0 +1,108 @@
+"""
+Geospatial helpers: geohash encoding, covering cells and distances.
+
+A geohash is a base-32 string; places close to each other share a common
+prefix. Each place stores its geohash in an indexed column, so "places
+near a point" becomes a few B-tree range scans (one per covering cell)
+followed by an exact haversine check on the candidates.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9                   # Cellule d'environ 5 m x 5 m
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_RADIUS_KM = 1000                    # Rayon maximal d'une recherche
+MAX_COVERING_CELLS = 16                 # Plages d'index par recherche
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True                          # Les bits pairs codent la longitude
+    while len(chars) < precision:
+        if even:
+            rng, coord = lon_range, longitude
+        else:
+            rng, coord = lat_range, latitude
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (height, width) in degrees of a cell at a precision."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def covering_cells(latitude, longitude, radius_km,
+                   max_cells=MAX_COVERING_CELLS):
+    """
+    Return geohash prefixes whose cells cover the circle.
+
+    Picks the finest precision at which the bounding box of the circle
+    spans at most `max_cells` cells and returns those cells. Returns ['']
+    (no filtering) when the circle is too large or reaches a pole.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    min_lat = max(-90.0, latitude - d_lat)
+    max_lat = min(90.0, latitude + d_lat)
+    # Largeur minimale d'un degré de longitude dans le cercle
+    lon_factor = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if lon_factor * 180 * KM_PER_DEGREE <= radius_km:
+        return ['']
+    d_lon = radius_km / (KM_PER_DEGREE * lon_factor)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        # Les cellules d'une précision forment une grille depuis (-90, -180)
+        first_row = int((min_lat + 90.0) // height)
+        last_row = min(int((max_lat + 90.0) // height),
+                       int(round(180.0 / height)) - 1)
+        first_col = int((longitude - d_lon + 180.0) // width)
+        last_col = int((longitude + d_lon + 180.0) // width)
+        rows = last_row - first_row + 1
+        cols = last_col - first_col + 1
+        if rows * cols > max_cells:
+            continue
+        cells = set()
+        for row in range(first_row, last_row + 1):
+            lat = -90.0 + (row + 0.5) * height
+            for col in range(first_col, last_col + 1):
+                lon = ((col + 0.5) * width) % 360.0 - 180.0
+                cells.add(encode(lat, lon, precision))
+        return sorted(cells)
+    return ['']
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with prefix."""
+    return prefix + '~'                  # '~' est après tous les caractères
@@ -0,0 +1,138 @@
+"""
+Password hashing on a bounded worker pool.
+
+bcrypt is deliberately slow (BCRYPT_LOG_ROUNDS sets its cost). Hashing
+and checking passwords run on a small pool of threads instead of the
+request thread: bcrypt releases the GIL, so at most BCRYPT_WORKERS cores
+are spent on it whatever the number of concurrent logins. Requests wait
+for their turn in a bounded queue; when BCRYPT_QUEUE_SIZE requests are
+already waiting, new ones fail at once with HasherBusy (HTTP 503) instead
+of holding a worker of the web server for seconds, so a login burst
+cannot starve the other endpoints.
+
+Hashes keep their cost, so changing BCRYPT_LOG_ROUNDS only applies to
+new hashes; needs_rehash() tells the login to re-hash an older one.
+
+Configuration keys (see config.py):
+- BCRYPT_LOG_ROUNDS: bcrypt cost of new hashes.
+- BCRYPT_WORKERS: threads hashing in parallel.
+- BCRYPT_QUEUE_SIZE: requests allowed to wait for a thread.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 32
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def hash_cost(password_hash):
+    """Return the cost of a bcrypt hash ($2b$<cost>$...), or None."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """bcrypt hashing and checking on a bounded thread pool."""
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.configure()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the pool from the app config."""
+        self.configure(
+            app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_ROUNDS),
+            app.config.get('BCRYPT_WORKERS', DEFAULT_WORKERS),
+            app.config.get('BCRYPT_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+
+    def configure(self, rounds=DEFAULT_ROUNDS, workers=DEFAULT_WORKERS,
+                  queue_size=DEFAULT_QUEUE_SIZE):
+        """(Re)create the pool; tasks already submitted still complete."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self.rounds = rounds
+            self.workers = workers
+            self.queue_size = queue_size
+            self._executor = ThreadPoolExecutor(
+                workers, thread_name_prefix='hbnb-bcrypt')
+            # Une place par thread + une par requête autorisée à attendre
+            self._slots = threading.BoundedSemaphore(workers + queue_size)
+            self.queue_depth = 0                # Tâches en attente d'un thread
+            self.max_queue_depth = 0
+            self.running = 0
+            self.completed = 0
+            self.rejected = 0
+
+    def _run(self, func, *args):
+        """Run func(*args) on the pool and wait for its result."""
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy("Too many passwords being hashed, retry shortly")
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        def task():
+            with self._lock:
+                self.queue_depth -= 1
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                slots.release()
+
+        try:
+            future = self._executor.submit(task)
+        except RuntimeError:
+            # Pool remplacé entre-temps (configure)
+            with self._lock:
+                self.queue_depth -= 1
+            slots.release()
+            raise
+        return future.result()
+
+    def hash(self, password):
+        """Hash a password with the configured cost."""
+        from app.extensions import bcrypt
+        rounds = self.rounds
+        return self._run(
+            lambda: bcrypt.generate_password_hash(password, rounds)
+        ).decode('utf-8')
+
+    def verify(self, password_hash, password):
+        """Check a password against its hash."""
+        from app.extensions import bcrypt
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Return True if the hash was made with another cost."""
+        return hash_cost(password_hash) != self.rounds
+
+    def stats(self):
+        """Pool size, queue depth and counters."""
+        with self._lock:
+            return {
+                'rounds': self.rounds,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'running': self.running,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
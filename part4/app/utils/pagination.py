@@ -0,0 +1,94 @@
+"""
+Keyset pagination helpers shared by the collection endpoints.
+
+List endpoints accept two optional query parameters:
+- limit: number of items per page (1 to MAX_PAGE_SIZE).
+- cursor: opaque value taken from `next_cursor` of the previous page.
+
+When neither is given, endpoints keep returning the full plain list.
+Otherwise they return {'items': [...], 'next_cursor': <str or null>}.
+
+parse_query_args() parses any query string parser of the API and reports
+an invalid value as a ValueError naming the parameter (400 through
+@handle_errors).
+"""
+from flask_restx import reqparse
+from werkzeug.exceptions import BadRequest
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument(
+    'limit', type=int, location='args',
+    help=f'Items per page (1-{MAX_PAGE_SIZE})')
+pagination_parser.add_argument(
+    'cursor', type=str, location='args',
+    help='Cursor returned as next_cursor by the previous page')
+
+
+def parse_query_args(parser):
+    """
+    Parse the query parameters of `parser`.
+
+    Returns:
+    - The parsed arguments.
+
+    Raises:
+    - ValueError: If a parameter has an invalid value (wrong type or not
+      one of its choices).
+    """
+    try:
+        return parser.parse_args()
+    except BadRequest as e:
+        # reqparse : {'errors': {nom: 'aide + erreur'}} dans e.data
+        errors = (getattr(e, 'data', None) or {}).get('errors') or {}
+        if not errors:
+            raise ValueError(e.description)
+        helps = {arg.name: arg.help for arg in parser.args}
+        messages = []
+        for name, message in errors.items():
+            # Retire le texte d'aide placé devant l'erreur
+            help_text = helps.get(name)
+            if help_text and message.startswith(help_text):
+                message = message[len(help_text):].strip()
+            messages.append(f"Invalid value for '{name}': {message}")
+        raise ValueError('; '.join(messages))
+
+
+def get_pagination_args():
+    """
+    Parse and validate the pagination query parameters.
+
+    Returns:
+    - None if the request is not paginated, else a (limit, cursor) tuple.
+
+    Raises:
+    - ValueError: If limit is not an integer or is out of range.
+    """
+    args = parse_query_args(pagination_parser)
+    return check_pagination(args.get('limit'), args.get('cursor'))
+
+
+def check_pagination(limit, cursor):
+    """
+    Validate parsed pagination parameters (see get_pagination_args).
+
+    Returns:
+    - None if the request is not paginated, else a (limit, cursor) tuple.
+
+    Raises:
+    - ValueError: If limit is out of range.
+    """
+    if limit is None and not cursor:
+        return None
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, cursor
+
+
+def paginated(items, next_cursor):
+    """Build the JSON body of a paginated response."""
+    return {'items': items, 'next_cursor': next_cursor}
@@ -0,0 +1,311 @@
+"""
+Central serialization of API responses.
+
+Output schemas are declared once here as Flask-RESTX models: the
+namespaces register them for the Swagger documentation (register_model), and
+the same definitions are compiled into serializers that turn ORM objects
+into JSON-ready dictionaries.
+
+- Serializer: compiles a schema into a function building the whole dict
+  (nested relations included) in one expression. A serializer restricted
+  to a Shape (fields / embed) is compiled on first use, then reused.
+- JSON encoding: responses are encoded with orjson or msgspec when one of
+  them is installed, else with the standard json module.
+
+Configuration key (see config.py):
+- JSON_BACKEND: 'auto' (default: orjson, then msgspec, then json),
+  'orjson', 'msgspec' or 'json'.
+"""
+import json
+from flask import current_app, make_response
+from flask_restx import Model, fields
+
+# ------------------------------------------------------ schémas de sortie
+amenity_view = Model('AmenityMiniModel', {
+    'id': fields.String(),
+    'name': fields.String()
+})
+
+owner_view = Model('UserPlaceModel', {
+    'id': fields.String(
+        required=True,
+        description='Unique identifier of the user'),
+    'first_name': fields.String(
+        required=True,
+        description='First name of the user'),
+    'last_name': fields.String(
+        required=True,
+        description='Last name of the user'),
+    'email': fields.String(
+        required=True,
+        description='Email of the user')
+})
+
+# Reviews d'une place : 'comment' dans le détail, 'text' dans les listes
+review_detail_mini_view = Model('ReviewMiniModel', {
+    'id': fields.String(),
+    'rating': fields.Integer(),
+    'comment': fields.String(attribute='text')
+})
+
+review_list_mini_view = Model('ReviewListMiniModel', {
+    'id': fields.String(),
+    'rating': fields.Integer(),
+    'text': fields.String()
+})
+
+_place_base = {
+    'id': fields.String(),
+    'title': fields.String(),
+    'description': fields.String(),
+    'price': fields.Float(),
+    'latitude': fields.Float(),
+    'longitude': fields.Float(),
+    'review_count': fields.Integer(),
+    'average_rating': fields.Float()
+}
+
+place_detail_view = Model('PlaceDetailModel', {
+    **_place_base,
+    'owner': fields.Nested(owner_view, attribute='owner_rel'),
+    'amenities': fields.List(fields.Nested(amenity_view)),
+    'reviews': fields.List(fields.Nested(review_detail_mini_view))
+})
+
+place_list_view = Model('PlaceListModel', {
+    **_place_base,
+    'owner': fields.Nested(owner_view, attribute='owner_rel'),
+    'amenities': fields.List(fields.Nested(amenity_view)),
+    'reviews': fields.List(fields.Nested(review_list_mini_view))
+})
+
+place_mini_view = Model('PlaceMiniModel', {
+    'id': fields.String(),
+    'title': fields.String(),
+    'price': fields.Float()
+})
+
+user_view = Model('UserViewModel', {
+    'id': fields.String(),
+    'first_name': fields.String(),
+    'last_name': fields.String(),
+    'email': fields.String(),
+    'is_admin': fields.Boolean(),
+    'places': fields.List(fields.Nested(place_mini_view))
+})
+
+review_view = Model('ReviewViewModel', {
+    'id': fields.String(),
+    'text': fields.String(),
+    'rating': fields.Integer(),
+    'place_id': fields.String(),
+    'user_id': fields.String(),
+    'user': fields.Nested(Model('ReviewAuthorModel', {
+        'id': fields.String(),
+        'first_name': fields.String(),
+        'last_name': fields.String()
+    })),
+    'place': fields.Nested(Model('ReviewPlaceMiniModel', {
+        'id': fields.String(),
+        'title': fields.String()
+    }))
+})
+
+
+# ---------------------------------------------------------- sérialiseurs
+def _nested_model(field):
+    """Return (model, many) for a nested field, or (None, False)."""
+    if isinstance(field, fields.List) and isinstance(
+            field.container, fields.Nested):
+        return field.container.model, True
+    if isinstance(field, fields.Nested):
+        return field.model, False
+    return None, False
+
+
+def _expression(model, var, keys=None, embed=None, names=None):
+    """
+    Python expression building the dict of `var` according to `model`.
+
+    Nested models are inlined: a single dict display (with list
+    comprehensions for lists) serializes an object and its relations.
+    """
+    names = names if names is not None else iter(range(1, 1 << 30))
+    parts = []
+    for key, field in model.items():
+        if keys is not None and key not in keys:
+            continue
+        attribute = field.attribute or key
+        if not attribute.isidentifier():
+            raise ValueError(f"Invalid attribute for '{key}': {attribute}")
+        child, many = _nested_model(field)
+        if child is None:
+            parts.append(f"{key!r}: {var}.{attribute}")
+            continue
+        if embed is not None and key not in embed:
+            continue
+        sub = f"_{next(names)}"
+        inner = _expression(child, sub, names=names)
+        if many:
+            parts.append(f"{key!r}: [{inner} for {sub} in {var}.{attribute}]")
+        else:
+            parts.append(f"{key!r}: ({inner} if ({sub} := {var}.{attribute})"
+                         f" is not None else None)")
+    return '{' + ', '.join(parts) + '}'
+
+
+def register_model(namespace, model):
+    """
+    Register an output schema and its nested schemas on a namespace,
+    for the Swagger documentation.
+
+    Returns:
+    - The model, like Namespace.add_model().
+    """
+    for field in model.values():
+        child, _ = _nested_model(field)
+        if child is not None:
+            register_model(namespace, child)
+    return namespace.add_model(model.name, model)
+
+
+class Serializer:
+    """
+    Compiled serializer of one output schema.
+
+    The schema is turned once into the source of a function returning a
+    dict display, e.g. {'id': obj.id, 'amenities': [{...} for _1 in
+    obj.amenities]}, which is then compiled: serializing costs the same
+    as a hand-written dict. Only names coming from the schema end up in
+    the source.
+
+    Parameters:
+    - model: Flask-RESTX model describing the output.
+    - keys: Keys to keep (None = all).
+    - embed: Nested keys to serialize (None = all).
+    """
+    def __init__(self, model, keys=None, embed=None):
+        self.model = model
+        self.source = (
+            "def serialize(obj):\n"
+            f"    return {_expression(model, 'obj', keys, embed)}\n")
+        namespace = {}
+        exec(compile(self.source, f"<serializer {model.name}>", "exec"),
+             namespace)
+        self._serialize = namespace['serialize']
+        self._variants = {}                     # Variantes déjà compilées
+
+    def __call__(self, obj):
+        """Serialize one object into a dictionary."""
+        return self._serialize(obj)
+
+    def many(self, objs):
+        """Serialize an iterable of objects into a list."""
+        return [self(obj) for obj in objs]
+
+    def variant(self, keys=None, embed=None):
+        """
+        Return the serializer restricted to some keys and nested keys,
+        compiled on first use (None = no restriction).
+        """
+        key = (None if keys is None else frozenset(keys),
+               None if embed is None else frozenset(embed))
+        if key == (None, None):
+            return self
+        serializer = self._variants.get(key)
+        if serializer is None:
+            serializer = self._variants[key] = Serializer(self.model, *key)
+        return serializer
+
+    def shaped(self, shape=None):
+        """
+        Return the serializer of a Shape (see fieldsets): relations are
+        serialized only if embedded (they are the only ones preloaded)
+        and plain keys only if requested.
+        """
+        if shape is None:
+            return self
+        return self.variant(shape.fields, shape.embed)
+
+
+amenity_serializer = Serializer(amenity_view)
+place_detail_serializer = Serializer(place_detail_view)
+place_list_serializer = Serializer(place_list_view)
+user_serializer = Serializer(user_view)
+review_serializer = Serializer(review_view)
+
+
+# ------------------------------------------------------------ encodage JSON
+def _orjson_encoder():
+    import orjson
+
+    def encode(data, indent=False):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return encode
+
+
+def _msgspec_encoder():
+    import msgspec
+
+    def encode(data, indent=False):
+        raw = msgspec.json.encode(data)
+        return msgspec.json.format(raw, indent=2) if indent else raw
+    return encode
+
+
+def _json_encoder():
+    def encode(data, indent=False):
+        return json.dumps(data, indent=4 if indent else None).encode('utf-8')
+    return encode
+
+
+ENCODERS = {
+    'orjson': _orjson_encoder,
+    'msgspec': _msgspec_encoder,
+    'json': _json_encoder
+}
+
+
+def make_encoder(backend='auto'):
+    """
+    Build the JSON encoder of a backend: encode(data, indent) -> bytes.
+
+    Raises:
+    - RuntimeError: If the requested library is not installed.
+    - ValueError: If the backend is unknown.
+    """
+    if backend == 'auto':
+        for name in ('orjson', 'msgspec'):
+            try:
+                return ENCODERS[name]()
+            except ImportError:
+                continue
+        return _json_encoder()
+    if backend not in ENCODERS:
+        raise ValueError(f"Unknown JSON_BACKEND: {backend}")
+    try:
+        return ENCODERS[backend]()
+    except ImportError:
+        raise RuntimeError(
+            f"JSON_BACKEND='{backend}' needs the '{backend}' package")
+
+
+def dumps(data):
+    """Encode data with the JSON encoder of the current application."""
+    return current_app.extensions['json_encoder'](data)
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX representation of application/json responses."""
+    encode = current_app.extensions['json_encoder']
+    # Même format que Flask-RESTX : indentation en debug, '\n' final
+    response = make_response(encode(data, current_app.debug) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
+
+
+def init_app(app, api):
+    """Select the JSON encoder of the app and register it on the API."""
+    app.extensions['json_encoder'] = make_encoder(
+        app.config.get('JSON_BACKEND', 'auto'))
+    api.representations['application/json'] = output_json
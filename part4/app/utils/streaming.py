@@ -0,0 +1,76 @@
+"""
+Streamed responses for large collections.
+
+Unpaginated list endpoints can send their items one by one instead of
+building the whole JSON list in memory:
+- `Accept: application/x-ndjson`: one JSON object per line (NDJSON).
+- `?stream=true`: a regular JSON array, sent in chunks.
+
+Items come from a query read with yield_per() (see
+SQLAlchemyRepository.stream()) and are serialized as they are produced,
+so memory stays flat whatever the size of the collection. Streaming
+cannot be combined with pagination or filters.
+"""
+from flask import Response, request, stream_with_context
+from flask_restx import inputs, reqparse
+from app.utils.pagination import parse_query_args
+from app.utils.serializers import dumps
+
+NDJSON = 'application/x-ndjson'
+
+streaming_parser = reqparse.RequestParser()
+streaming_parser.add_argument(
+    'stream', type=inputs.boolean, location='args',
+    help='Send the list as a chunked JSON array')
+
+
+def get_stream_format():
+    """
+    Return the requested streaming format.
+
+    Returns:
+    - 'ndjson' if the client accepts NDJSON before JSON, 'json' if
+      `stream` is true, else None.
+    """
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON])
+    if best == NDJSON:
+        return 'ndjson'
+    if parse_query_args(streaming_parser).get('stream'):
+        return 'json'
+    return None
+
+
+def _ndjson_lines(items):
+    """One JSON document per line."""
+    for item in items:
+        yield dumps(item) + b'\n'
+
+
+def _json_array_chunks(items):
+    """A JSON array, written item by item."""
+    yield b'['
+    separator = b''
+    for item in items:
+        yield separator + dumps(item)
+        separator = b','
+    yield b']'
+
+
+def stream_response(items, stream_format):
+    """
+    Build a streamed response from an iterable of JSON-ready dicts.
+
+    Parameters:
+    - items: Iterable producing the items lazily.
+    - stream_format: 'ndjson' or 'json' (see get_stream_format()).
+
+    Returns:
+    - A Flask Response whose body is produced while it is sent; the
+      request context (and so the database session) stays open until
+      the last item.
+    """
+    if stream_format == 'ndjson':
+        chunks, mimetype = _ndjson_lines(items), NDJSON
+    else:
+        chunks, mimetype = _json_array_chunks(items), 'application/json'
+    return Response(stream_with_context(chunks), mimetype=mimetype)
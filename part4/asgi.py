@@ -0,0 +1,16 @@
+"""
+ASGI entry point, for servers such as uvicorn:
+
+    uvicorn asgi:app --workers 4
+
+The Flask app stays synchronous: each request runs in the thread pool of
+the ASGI adapter. Needs the 'asgiref' package. uvicorn starts its
+workers without preloading, so every worker builds its own app.
+"""
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    raise RuntimeError("asgi.py needs the 'asgiref' package")
+from wsgi import app as wsgi_app
+
+app = WsgiToAsgi(wsgi_app)
@@ -0,0 +1,15 @@
+"""
+ASGI entry point of the async read API (app/async_api.py):
+
+    uvicorn asgi_read:app --workers 4
+
+Serves only the GET endpoints of places, reviews and amenities; the
+reverse proxy sends every other request to gunicorn (wsgi.py). Uses the
+configuration named by HBNB_CONFIG (config.ProductionConfig by default).
+Needs the 'greenlet' and 'aiosqlite' packages (or the async driver of
+the database).
+"""
+import os
+from app.async_api import create_async_app
+
+app = create_async_app(os.getenv('HBNB_CONFIG', 'config.ProductionConfig'))
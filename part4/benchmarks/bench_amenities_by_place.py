@@ -0,0 +1,39 @@
+"""
+Benchmark: amenities of one place, old nested scan vs join query.
+
+The old implementation loaded every amenity and walked its places, so it
+grew with the catalog size. The join on place_amenity stays flat.
+"""
+from app.services import facade
+from benchmarks.common import make_app, seed, measure, report, db
+from app.models.amenity import Amenity
+
+
+def old_get_amenities_by_place(place_id):
+    """Previous HBnBFacade.get_amenities_by_place, kept for comparison."""
+    amenities_list = []
+    for amenity in Amenity.query.all():
+        for place in amenity.places:
+            if place.id == place_id:
+                amenities_list.append({'id': amenity.id, 'name': amenity.name})
+                break
+    return amenities_list
+
+
+def main():
+    make_app()
+    rows = []
+    for places in (100, 1000, 10000):
+        db.drop_all()
+        db.create_all()
+        _, place_ids, _ = seed(places, amenities=50, amenities_per_place=5)
+        target = place_ids[len(place_ids) // 2]
+        old_p50, _ = measure(lambda: old_get_amenities_by_place(target), 5)
+        new_p50, _ = measure(lambda: facade.get_amenities_by_place(target))
+        rows.append((places, f"{old_p50:.2f}", f"{new_p50:.2f}"))
+    report("get_amenities_by_place (p50, ms)", rows,
+           ("places", "nested scan", "join"))
+
+
+if __name__ == '__main__':
+    main()
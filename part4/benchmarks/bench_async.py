@@ -0,0 +1,164 @@
+"""
+Benchmark: synchronous WSGI stack vs async ASGI read API under many
+concurrent clients.
+
+Seeds an SQLite file, then for each stack loads the read endpoints
+(GET /api/v1/places/<id>, /api/v1/places/?limit=20,
+/api/v1/reviews/?limit=20, /api/v1/amenities/) for `--duration` seconds
+with `--clients` concurrent connections (1000 by default), and reports
+requests per second, p50/p99 latency and errors:
+
+- sync WORKERSxTHREADS (`--sync`): the Flask app (wsgi.py) as in
+  bench_workers, gunicorn if installed, forked werkzeug otherwise;
+- async WORKERS (`--async-workers`): asgi_read.py under uvicorn
+  (needs the 'uvicorn', 'greenlet' and 'aiosqlite' packages).
+
+Both read the database on every request: the view cache is turned off
+(CACHE_BACKEND=null).
+
+The clients are coroutines of one asyncio loop, each sending requests
+one after the other (a new connection per request, like clients that do
+not share connections). On few cores the load generator competes with
+the server: compare the rows with each other.
+
+Usage (from part4/):
+    python -m benchmarks.bench_async [--clients 1000] [--sync 1x4 1x32]
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from functools import partial
+from benchmarks.bench_workers import (
+    HOST, free_port, launch, start_server, stop_server)
+from benchmarks.common import make_app, file_config, seed, report
+
+# Délai maximal d'une requête avant de la compter en erreur
+REQUEST_TIMEOUT = 30
+
+
+def start_async_server(database, port, workers):
+    """Start asgi_read.py under uvicorn; wait until it listens."""
+    if not importlib.util.find_spec('uvicorn'):
+        raise RuntimeError("bench_async needs the 'uvicorn' package")
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}',
+               PYTHONWARNINGS='ignore')
+    command = [sys.executable, '-m', 'uvicorn', 'asgi_read:app',
+               '--host', HOST, '--port', str(port),
+               '--workers', str(workers), '--no-access-log',
+               '--backlog', '2048']
+    return launch(command, env, port, 'uvicorn')
+
+
+async def fetch(port, url):
+    """Status code of one GET on a new connection."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        writer.write(f'GET {url} HTTP/1.1\r\nHost: {HOST}\r\n'
+                     'Connection: close\r\n\r\n'.encode('ascii'))
+        response = await reader.read()
+    finally:
+        writer.close()
+    # 'HTTP/1.1 200 OK' -> 200
+    return int(response.split(b' ', 2)[1]) if response else 0
+
+
+async def load(port, urls, clients, duration):
+    """(requests/s, p50 ms, p99 ms, errors) of `clients` coroutines."""
+    latencies, errors = [], [0]
+    end = time.perf_counter() + duration
+
+    async def client_loop():
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            try:
+                ok = await asyncio.wait_for(
+                    fetch(port, random.choice(urls)),
+                    REQUEST_TIMEOUT) == 200
+            except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, errors[0]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (len(latencies) / elapsed, latencies[len(latencies) // 2], p99,
+            errors[0])
+
+
+def raise_open_files_limit(clients):
+    """Allow one socket per client on both sides, plus some margin."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = 2 * clients + 256
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        if hard != resource.RLIM_INFINITY:
+            needed = min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sync', nargs='*', default=['1x4', '1x32'],
+                        help='WORKERSxTHREADS of the sync stack')
+    parser.add_argument('--async-workers', nargs='*', type=int,
+                        default=[1])
+    parser.add_argument('--server', choices=('auto', 'gunicorn', 'werkzeug'),
+                        default='auto')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--places', type=int, default=500)
+    args = parser.parse_args()
+
+    raise_open_files_limit(args.clients)
+    kind = args.server
+    if kind == 'auto':
+        kind = ('gunicorn' if importlib.util.find_spec('gunicorn')
+                else 'werkzeug')
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    make_app(file_config(database))
+    _, place_ids, _ = seed(args.places, reviews_per_place=1)
+    urls = ['/api/v1/amenities/', '/api/v1/places/?limit=20',
+            '/api/v1/reviews/?limit=20'] + [
+        f'/api/v1/places/{place_id}' for place_id in place_ids[:100]]
+
+    # Les deux piles lisent la base à chaque requête
+    os.environ['CACHE_BACKEND'] = 'null'
+    servers = []
+    for config in args.sync:
+        workers, threads = (int(x) for x in config.split('x'))
+        servers.append((f'sync {kind}', config, partial(
+            start_server, kind, database, workers=workers, threads=threads)))
+    for workers in args.async_workers:
+        servers.append(('async uvicorn', str(workers), partial(
+            start_async_server, database, workers=workers)))
+
+    rows = []
+    for name, config, start in servers:
+        port = free_port()
+        process = start(port=port)
+        try:
+            rate, p50, p99, errors = asyncio.run(
+                load(port, urls, args.clients, args.duration))
+        finally:
+            stop_server(process)
+        rows.append((name, config, f"{rate:.0f}", f"{p50:.1f}",
+                     f"{p99:.1f}", errors))
+    report(f"GET places/reviews/amenities, {args.clients} concurrent "
+           f"clients, {os.cpu_count()} CPU", rows,
+           ("stack", "workers", "req/s", "p50 ms", "p99 ms", "errors"))
+
+
+if __name__ == '__main__':
+    main()
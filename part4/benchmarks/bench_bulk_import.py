@@ -0,0 +1,56 @@
+"""
+Benchmark: place ingestion throughput, one request per row vs bulk import.
+
+Uses an SQLite file so that every commit pays its real cost.
+"""
+import json
+import os
+import tempfile
+import time
+from app.services import facade
+from benchmarks.common import make_app, file_config, seed, report, db
+
+
+def place_rows(owner_id, count, prefix):
+    """Generate `count` valid place rows."""
+    return [{
+        "type": "place", "title": f"{prefix} {i}", "price": 50 + i % 100,
+        "latitude": (i % 180) - 90.0, "longitude": (i % 360) - 180.0,
+        "owner_id": owner_id} for i in range(count)]
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    make_app(file_config(os.path.join(tmp, 'bench.db')))
+    owner_id, _, _ = seed(0, amenities=0)
+    rows = []
+
+    # Ancienne méthode : create_place (un commit par ligne)
+    count = 1000
+    data = place_rows(owner_id, count, "single")
+    start = time.perf_counter()
+    for row in data:
+        facade.create_place({
+            "title": row["title"], "price": row["price"],
+            "latitude": row["latitude"], "longitude": row["longitude"],
+            "owner": owner_id})
+    elapsed = time.perf_counter() - start
+    rows.append(("create_place", count, f"{count / elapsed:.0f}"))
+
+    # Import en masse avec différentes tailles de batch
+    count = 20000
+    for batch_size in (100, 500, 2000):
+        lines = [json.dumps(row) for row in
+                 place_rows(owner_id, count, f"bulk{batch_size}")]
+        start = time.perf_counter()
+        result = facade.bulk_import(lines, batch_size)
+        elapsed = time.perf_counter() - start
+        assert result["inserted"]["place"] == count, result["errors"][:3]
+        rows.append((f"bulk_import({batch_size})", count,
+                     f"{count / elapsed:.0f}"))
+    db.session.remove()
+    report("Place ingestion throughput", rows, ("method", "rows", "rows/s"))
+
+
+if __name__ == '__main__':
+    main()
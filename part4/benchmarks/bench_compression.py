@@ -0,0 +1,106 @@
+"""
+Benchmark: bytes on the wire and CPU cost of response compression.
+
+For GET /api/v1/places/ (several table sizes) and for the frontend
+assets, reports the body size and the CPU time spent per request for:
+identity, gzip at levels 1/6/9, brotli (if installed) and the
+precompressed frontend variants (no work per request).
+
+Usage (from part4/):
+    python -m benchmarks.bench_compression [--sizes 100 1000] [--repeat N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from app.utils import compression
+from benchmarks.common import make_app, seed, report, db
+
+
+def cpu_ms(func, repeat):
+    """Median CPU time of `func`, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        samples.append((time.process_time() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def settings():
+    """(label, encoding, level) of each measured setting."""
+    yield "gzip 1", 'gzip', 1
+    yield "gzip 6", 'gzip', 6
+    yield "gzip 9", 'gzip', 9
+    if compression.brotli is not None:
+        yield "br 4", 'br', 4
+        yield "br 11", 'br', 11
+
+
+def measure_body(name, body, repeat, rows):
+    """Add one row per setting for a response body."""
+    rows.append((name, "identity", len(body), "100%", "0.00"))
+    for label, encoding, level in settings():
+        data = compression.compress(body, encoding, level)
+        cost = cpu_ms(lambda: compression.compress(body, encoding, level),
+                      repeat)
+        rows.append((name, label, len(data),
+                     f"{len(data) * 100 / len(body):.0f}%", f"{cost:.2f}"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    rows = []
+    for places in args.sizes:
+        db.drop_all()
+        db.create_all()
+        seed(places, amenities=10, amenities_per_place=3,
+             reviews_per_place=1)
+        body = client.get("/api/v1/places/").get_data()
+        measure_body(f"/places/ ({places})", body, args.repeat, rows)
+
+        # Coût CPU d'une requête complète, avec et sans compression
+        identity = cpu_ms(lambda: client.get("/api/v1/places/"), args.repeat)
+        gzipped = cpu_ms(lambda: client.get(
+            "/api/v1/places/", headers={"Accept-Encoding": "gzip"}),
+            args.repeat)
+        rows.append((f"/places/ ({places})", "request identity/gzip",
+                     "", "", f"{identity:.2f} / {gzipped:.2f}"))
+
+    # Frontend : variantes précompressées, aucun travail par requête
+    frontend = tempfile.mkdtemp()
+    try:
+        shutil.copytree(app.config['FRONTEND_DIR'], frontend,
+                        dirs_exist_ok=True)
+        raw = packed = 0
+        for path, size, sizes in compression.precompress_directory(
+                frontend, min_size=0):
+            raw += size
+            packed += min(sizes.values(), default=size)
+        images = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for directory, _, names in os.walk(frontend) for name in names
+            if name.endswith('.png'))
+        rows.append(("frontend text assets", "identity", raw, "100%",
+                     "0.00"))
+        rows.append(("frontend text assets", "precompressed", packed,
+                     f"{packed * 100 / raw:.0f}%", "0.00"))
+        rows.append(("frontend images (png)", "as is", images, "100%",
+                     "0.00"))
+    finally:
+        shutil.rmtree(frontend)
+
+    report("Response compression (CPU = median ms per request)", rows,
+           ("payload", "encoding", "bytes", "ratio", "cpu ms"))
+
+
+if __name__ == '__main__':
+    main()
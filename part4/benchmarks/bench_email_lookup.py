@@ -0,0 +1,76 @@
+"""
+Benchmark: user lookup by email as the users table grows.
+
+For each size, bulk inserts that many users and reports the p50/p99 time
+of:
+- "indexed": facade.get_user_by_email() with a mixed-case address, which
+  searches the unique index of the normalized `_email_key` column;
+- "lower() scan": the same case-insensitive match written as
+  lower(_email) = ?, which no index can serve;
+- "login": POST /api/v1/auth/login for one of the users (bcrypt cost of
+  TestingConfig, so the lookup is a visible part of the request).
+
+Usage (from part4/):
+    python -m benchmarks.bench_email_lookup [--sizes 10000 100000 1000000]
+"""
+import argparse
+from datetime import datetime
+from sqlalchemy import func
+from app.extensions import password_hasher
+from app.models.user import User
+from app.services import facade
+from benchmarks.common import make_app, new_id, measure, report, db
+
+
+def add_users(start, stop, password_hash):
+    """Bulk insert users user{start}..user{stop - 1}@example.com."""
+    now = datetime(2024, 1, 1)
+    for first in range(start, stop, 10000):
+        db.session.execute(User.__table__.insert(), [{
+            'id': new_id(), 'created_at': now, 'updated_at': now,
+            '_first_name': 'Bench', '_last_name': 'User',
+            '_email': f'User{i}@Example.com',
+            '_email_key': f'user{i}@example.com',
+            '_password_hash': password_hash, '_is_admin': False}
+            for i in range(first, min(first + 10000, stop))])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    password_hash = password_hasher.hash("secret")
+    rows, count = [], 0
+    for size in sorted(args.sizes):
+        add_users(count, size, password_hash)
+        count = size
+        # Utilisateur du milieu de la table, saisi avec une autre casse
+        email = f'USER{size // 2}@example.COM'
+
+        def scan():
+            db.session.query(User).filter(
+                func.lower(User._email) == email.lower()).first()
+
+        def login():
+            response = client.post("/api/v1/auth/login", json={
+                "email": email, "password": "secret"})
+            assert response.status_code == 200, response.get_json()
+
+        for name, func_ in (
+                ("indexed", lambda: facade.get_user_by_email(email)),
+                ("lower() scan", scan),
+                ("login", login)):
+            p50, p99 = measure(func_, args.repeat)
+            rows.append((size, name, f"{p50:.3f}", f"{p99:.3f}"))
+    report("User lookup by email (ms)", rows,
+           ("users", "query", "p50", "p99"))
+
+
+if __name__ == '__main__':
+    main()
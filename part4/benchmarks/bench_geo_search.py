@@ -0,0 +1,82 @@
+"""
+Benchmark: places near a point, full scan vs geohash index.
+
+The full scan reads the coordinates of every place and computes the
+haversine distance for each of them, so it grows with the catalog. The
+geohash search only reads the places of the cells covering the circle.
+
+Usage (from part4/):
+    python -m benchmarks.bench_geo_search --places 1000000
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from app.models.place import Place
+from app.services import facade
+from app.utils import geo
+from benchmarks.common import make_app, new_id, seed, measure, report, db
+
+# Places réparties sur la France métropolitaine
+LAT_RANGE = (42.0, 51.0)
+LON_RANGE = (-5.0, 8.0)
+BATCH = 50000
+
+
+def seed_places(count, owner_id):
+    """Bulk insert `count` places at random coordinates."""
+    rng = random.Random(42)
+    now = datetime(2024, 1, 1)
+    for start in range(0, count, BATCH):
+        rows = []
+        for i in range(start, min(count, start + BATCH)):
+            lat = rng.uniform(*LAT_RANGE)
+            lon = rng.uniform(*LON_RANGE)
+            created = now + timedelta(seconds=i)
+            rows.append({
+                'id': new_id(), 'created_at': created, 'updated_at': created,
+                '_title': f'Place {i}', '_description': None,
+                '_price': 10.0 + i % 500, '_latitude': lat, '_longitude': lon,
+                '_geohash': geo.encode(lat, lon), 'owner_id': owner_id})
+        db.session.execute(Place.__table__.insert(), rows)
+    db.session.commit()
+
+
+def full_scan(lat, lon, radius_km, limit):
+    """Distance of every place, filtered and sorted in Python."""
+    matches = sorted(
+        (geo.haversine_km(lat, lon, p_lat, p_lon), p_id)
+        for p_id, p_lat, p_lon in db.session.query(
+            Place.id, Place._latitude, Place._longitude)
+        if geo.haversine_km(lat, lon, p_lat, p_lon) <= radius_km)
+    return matches[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--places', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    make_app()
+    owner_id, _, _ = seed(0, amenities=0)
+    seed_places(args.places, owner_id)
+
+    # Centre : Paris
+    lat, lon = 48.8566, 2.3522
+    rows = []
+    for radius_km in (1, 5, 25):
+        scan_p50, _ = measure(
+            lambda: full_scan(lat, lon, radius_km, 20), 3)
+        p50, p99 = measure(
+            lambda: facade.search_places_nearby(lat, lon, radius_km, 20),
+            args.repeat)
+        found = len(full_scan(lat, lon, radius_km, None))
+        rows.append((radius_km, found, f"{scan_p50:.1f}",
+                     f"{p50:.2f}", f"{p99:.2f}"))
+    report(f"places near a point, {args.places} places (ms)", rows,
+           ("radius_km", "matches", "full scan p50", "geohash p50",
+            "geohash p99"))
+
+
+if __name__ == '__main__':
+    main()
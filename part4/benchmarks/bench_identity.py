@@ -0,0 +1,85 @@
+"""
+Benchmark: cost of authorization on protected endpoints.
+
+- GET /api/v1/admin/cache (admin_only, no data access of its own) with
+  the identity cache on and off: latency and SQL statements per request.
+- Denylist lookups of tokens that are not revoked (the common case) and
+  of revoked ones, with `--revoked` tokens in the list: Bloom filter in
+  front of the exact set vs the exact set alone, and memory of each.
+
+Usage (from part4/):
+    python -m benchmarks.bench_identity [--revoked 100000]
+"""
+import argparse
+import sys
+import time
+import uuid
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app.persistence.cache import LRUCache, NullCache
+from app.services import facade
+from app.utils.denylist import TokenDenylist
+from benchmarks.common import make_app, seed, measure, report, db
+
+
+def per_call_ns(func, keys):
+    """Mean time of func(key) over the keys, in nanoseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) * 1e9 / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--revoked', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    owner_id, _, _ = seed(0, amenities=0)
+    token = create_access_token(identity={'id': owner_id, 'is_admin': True})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    rows = []
+    for label, cache in (("identity cache", LRUCache(ttl=30)),
+                         ("no identity cache", NullCache())):
+        facade.configure_identity_cache(cache)
+        client.get("/api/v1/admin/cache", headers=headers)
+        statements.clear()
+        p50, p99 = measure(
+            lambda: client.get("/api/v1/admin/cache", headers=headers),
+            args.repeat)
+        rows.append((label, f"{len(statements) / args.repeat:.1f}",
+                     f"{p50:.3f}", f"{p99:.3f}"))
+    report("GET /api/v1/admin/cache (admin_only)", rows,
+           ("identity", "SQL/request", "p50 ms", "p99 ms"))
+
+    denylist = TokenDenylist(capacity=args.revoked)
+    revoked = [str(uuid.uuid4()) for _ in range(args.revoked)]
+    for jti in revoked:
+        denylist.revoke(jti)
+    valid = [str(uuid.uuid4()) for _ in range(100000)]
+    exact = denylist._revoked
+    bloom = denylist._bloom
+    exact_bytes = sys.getsizeof(exact) + sum(map(sys.getsizeof, exact))
+    rows = [
+        ("bloom + exact set", f"{per_call_ns(denylist.is_revoked, valid):.0f}",
+         f"{per_call_ns(denylist.is_revoked, revoked[:100000]):.0f}",
+         f"{len(bloom._bits) // 1024} KB + {exact_bytes // 1024} KB"),
+        ("exact set only", f"{per_call_ns(exact.__contains__, valid):.0f}",
+         f"{per_call_ns(exact.__contains__, revoked[:100000]):.0f}",
+         f"{exact_bytes // 1024} KB"),
+    ]
+    false_positives = sum(jti in bloom for jti in valid)
+    report(f"Denylist with {args.revoked} revoked tokens "
+           f"(bloom false positives: {false_positives / len(valid):.3%})",
+           rows, ("lookup", "valid ns", "revoked ns", "memory"))
+
+
+if __name__ == '__main__':
+    main()
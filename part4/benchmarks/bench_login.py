@@ -0,0 +1,115 @@
+"""
+Benchmark: login burst vs latency of the other endpoints.
+
+`--clients` threads (the request threads of a WSGI server) post logins in
+a loop for `--duration` seconds while one thread keeps reading
+GET /api/v1/amenities/. For each size of the hashing pool, reports the
+logins served per second, the logins rejected with 503, the maximum
+queue depth and the p50/p99 latency of the read endpoint. The last row
+("per request") gives every request thread its own bcrypt slot, as when
+hashing ran in the request thread.
+
+Usage (from part4/):
+    python -m benchmarks.bench_login [--rounds 10] [--clients 16]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from app.extensions import password_hasher
+from app.models.amenity import Amenity
+from app.models.user import User
+from benchmarks.common import make_app, file_config, report, db
+
+
+def percentile(samples, ratio):
+    """Value at `ratio` of the sorted samples, in milliseconds."""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * ratio))] * 1000
+
+
+def run(app, clients, duration):
+    """Run one burst and return (logins, rejected, probe latencies)."""
+    stop = threading.Event()
+    counts = {200: 0, 503: 0}
+    latencies = []
+    lock = threading.Lock()
+
+    def login():
+        client = app.test_client()
+        while not stop.is_set():
+            response = client.post("/api/v1/auth/login", json={
+                "email": "bench@example.com", "password": "secret"})
+            with lock:
+                counts[response.status_code] = counts.get(
+                    response.status_code, 0) + 1
+            if response.status_code == 503:
+                # Le client respecte Retry-After
+                stop.wait(int(response.headers['Retry-After']))
+
+    def probe():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get("/api/v1/amenities/")
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login) for _ in range(clients)]
+    threads.append(threading.Thread(target=probe))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts[200], counts[503], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    app = make_app(file_config(os.path.join(tmp, 'bench.db')))
+    app.config['BCRYPT_LOG_ROUNDS'] = args.rounds
+    password_hasher.init_app(app)
+    db.session.add(User("Bench", "User", "bench@example.com", "secret"))
+    db.session.add_all(Amenity(f"Amenity {i}") for i in range(20))
+    db.session.commit()
+    db.session.remove()
+
+    # Latence de référence, sans logins
+    idle = run(app, 0, 1.0)[2]
+    rows = [("idle", "-", "-", "-", "-",
+             f"{statistics.median(idle) * 1000:.1f}",
+             f"{percentile(idle, 0.99):.1f}")]
+
+    cpus = os.cpu_count() or 1
+    settings = [(f"{w} worker(s)", w, args.queue_size)
+                for w in sorted({1, cpus, 2 * cpus})]
+    settings.append(("per request", args.clients, 0))
+    for label, workers, queue_size in settings:
+        password_hasher.configure(args.rounds, workers, queue_size)
+        logins, rejected, latencies = run(app, args.clients, args.duration)
+        stats = password_hasher.stats()
+        rows.append((
+            label, f"{logins / args.duration:.1f}", rejected,
+            stats['max_queue_depth'], len(latencies),
+            f"{statistics.median(latencies) * 1000:.1f}",
+            f"{percentile(latencies, 0.99):.1f}"))
+
+    report(f"Login burst: {args.clients} clients, bcrypt cost {args.rounds}, "
+           f"{cpus} CPU(s)", rows,
+           ("hashing pool", "logins/s", "503", "max queue", "reads",
+            "read p50 ms", "read p99 ms"))
+
+
+if __name__ == '__main__':
+    main()
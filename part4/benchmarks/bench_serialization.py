@@ -0,0 +1,107 @@
+"""
+Benchmark: GET /api/v1/places/ with hand-built dicts vs compiled
+serializers, and with each available JSON encoder.
+
+"hand-built + json" restores the previous place_to_list_item with the
+standard json encoder (what the default Flask-RESTX representation used),
+so it measures the endpoint as it was before app/utils/serializers.py.
+
+Usage (from part4/):
+    python -m benchmarks.bench_serialization [--places N] [--requests N]
+
+Variants are measured in turns, to spread machine noise evenly. The last
+column isolates what this layer changes: building the dicts of already
+loaded places and encoding them.
+"""
+import argparse
+import time
+from app.api.v1 import places as places_api
+from app.services import facade
+from app.utils import serializers
+from benchmarks.common import make_app, seed, report
+
+
+def legacy_place_to_list_item(place, shape=None):
+    """Previous place_to_list_item (full shape), kept for comparison."""
+    item = {}
+    for key in places_api.PLACE_FIELDS:
+        item[key] = getattr(place, key)
+    owner = place.owner_rel
+    item["owner"] = {
+        "id": owner.id,
+        "first_name": owner.first_name,
+        "last_name": owner.last_name,
+        "email": owner.email
+    } if owner else None
+    item["amenities"] = [
+        {"id": amenity.id, "name": amenity.name}
+        for amenity in place.amenities
+    ]
+    item["reviews"] = [
+        {"id": review.id, "rating": review.rating, "text": review.text}
+        for review in place.reviews
+    ]
+    return item
+
+
+def variants():
+    """(name, place_to_list_item, JSON backend) of each measured setup."""
+    yield "hand-built + json", legacy_place_to_list_item, 'json'
+    for backend in ('json', 'msgspec', 'orjson'):
+        try:
+            serializers.make_encoder(backend)
+        except RuntimeError:
+            continue                            # Librairie non installée
+        yield f"compiled + {backend}", places_api.place_to_list_item, backend
+
+
+def summary(samples):
+    """Return (per second, p50 in ms) of a list of durations in seconds."""
+    samples = sorted(samples)
+    return len(samples) / sum(samples), samples[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--places', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=30)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(args.places, amenities=10, amenities_per_place=3,
+         reviews_per_place=1)
+    client = app.test_client()
+    setups = [(name, to_item, serializers.make_encoder(backend))
+              for name, to_item, backend in variants()]
+    compiled = places_api.place_to_list_item
+    places = facade.get_all_places_with_relations()   # Relations chargées
+
+    # Les variantes sont mesurées à tour de rôle pour lisser le bruit
+    requests = {name: [] for name, _, _ in setups}
+    stage = {name: [] for name, _, _ in setups}
+    for _ in range(args.requests + 1):
+        for name, to_item, encode in setups:
+            places_api.place_to_list_item = to_item
+            app.extensions['json_encoder'] = encode
+            start = time.perf_counter()
+            response = client.get("/api/v1/places/")
+            requests[name].append(time.perf_counter() - start)
+            assert response.status_code == 200
+            # Sérialisation + encodage seuls, sur des places déjà chargées
+            start = time.perf_counter()
+            encode([to_item(place) for place in places])
+            stage[name].append(time.perf_counter() - start)
+    places_api.place_to_list_item = compiled
+
+    rows = []
+    for name, _, _ in setups:
+        # Le premier tour sert d'échauffement
+        rps, p50 = summary(requests[name][1:])
+        _, stage_p50 = summary(stage[name][1:])
+        rows.append((name, f"{rps:.1f}", f"{p50:.1f}", f"{stage_p50:.1f}"))
+    report(f"GET /api/v1/places/ ({args.places} places)", rows,
+           ("serializer", "req/s", "p50 ms", "serialize+encode p50 ms"))
+
+
+if __name__ == '__main__':
+    main()
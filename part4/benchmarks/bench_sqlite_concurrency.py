@@ -0,0 +1,115 @@
+"""
+Benchmark: concurrent reads and writes on an SQLite file, with and
+without the connection pragmas of app/persistence/engine.py.
+
+`--threads` threads (the request threads of a worker) run for
+`--duration` seconds on the same database file; `--writers` of them
+create amenities (one commit each), the others read a place and its
+amenities. Each operation opens and releases its session as a request
+does. Reports writes and reads per second, read p50/p99 and failed
+operations ("database is locked"), for:
+- "sqlite defaults": rollback journal, synchronous=FULL, no pragma;
+- "tuned": the configured pragmas (WAL, synchronous=NORMAL, ...).
+
+Usage (from part4/):
+    python -m benchmarks.bench_sqlite_concurrency [--threads 8 --writers 2]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from sqlalchemy.exc import OperationalError
+from app.services import facade
+from benchmarks.common import make_app, file_config, seed, report, db
+
+
+def variant_config(path, tuned):
+    """File config with the pragmas on, or every SQLITE_* left unset."""
+    base = file_config(path)
+    overrides = {'CACHE_BACKEND': 'null'}
+    if not tuned:
+        overrides.update(SQLITE_JOURNAL_MODE=None, SQLITE_SYNCHRONOUS=None,
+                         SQLITE_MMAP_SIZE=None, SQLITE_CACHE_SIZE=None,
+                         SQLITE_BUSY_TIMEOUT=None)
+    return type('BenchConfig', (base,), overrides)
+
+
+def run(app, place_ids, threads, writers, duration):
+    """(writes/s, reads/s, read p50 ms, read p99 ms, failures)."""
+    stop = threading.Event()
+    reads, counts = [], {'writes': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def write():
+        facade.create_amenity({'name': uuid.uuid4().hex[:20]})
+
+    def read():
+        place = facade.get_place(random.choice(place_ids))
+        len(place.amenities)
+
+    def loop(operation):
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    operation()
+                    ok = True
+                except OperationalError:
+                    ok = False
+                finally:
+                    db.session.remove()
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    if not ok:
+                        counts['failed'] += 1
+                    elif operation is write:
+                        counts['writes'] += 1
+                    else:
+                        reads.append(elapsed)
+
+    pool = [threading.Thread(target=loop,
+                             args=(write if i < writers else read,))
+            for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in pool:
+        thread.join()
+    reads.sort()
+    p99 = reads[min(len(reads) - 1, int(len(reads) * 0.99))] if reads else 0
+    p50 = reads[len(reads) // 2] if reads else 0
+    return (counts['writes'] / duration, len(reads) / duration, p50, p99,
+            counts['failed'])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--places', type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = []
+    for name, tuned in (("sqlite defaults", False), ("tuned", True)):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+        app = make_app(variant_config(path, tuned))
+        _, place_ids, _ = seed(args.places)
+        db.session.commit()
+        db.session.remove()
+        writes, reads, p50, p99, failed = run(
+            app, place_ids, args.threads, args.writers, args.duration)
+        rows.append((name, f"{writes:.0f}", f"{reads:.0f}", f"{p50:.2f}",
+                     f"{p99:.2f}", failed))
+    report(f"{args.writers} writers, {args.threads - args.writers} readers "
+           f"on one SQLite file", rows,
+           ("pragmas", "writes/s", "reads/s", "read p50 ms", "read p99 ms",
+            "failed"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: full-text search, LIKE '%term%' scan vs FTS5 index.
+
+A LIKE with a leading wildcard cannot use an index and reads every row,
+without any ranking. The FTS5 query reads the posting lists of the
+terms and ranks the matches with BM25.
+
+Usage (from part4/):
+    python -m benchmarks.bench_text_search --sizes 100000 1000000
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from app.models.place import Place
+from app.services import facade
+from app.utils import geo
+from benchmarks.common import make_app, new_id, seed, measure, report, db
+
+BATCH = 50000
+# Vocabulaire : mots fréquents, moyens et rares
+COMMON = ['room', 'house', 'bed', 'kitchen', 'view', 'quiet', 'city']
+MEDIUM = [f'word{i}' for i in range(500)]
+RARE = [f'rare{i}' for i in range(20000)]
+TERMS = (('common', 'kitchen'), ('medium', 'word42'), ('rare', 'rare123'))
+
+
+def description(rng):
+    """Random description of about 20 words."""
+    words = rng.choices(COMMON, k=12) + rng.choices(MEDIUM, k=6)
+    words += rng.choices(RARE, k=2)
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def seed_places(count, owner_id):
+    """Bulk insert `count` places (the FTS triggers index them)."""
+    rng = random.Random(42)
+    now = datetime(2024, 1, 1)
+    for start in range(0, count, BATCH):
+        rows = []
+        for i in range(start, min(count, start + BATCH)):
+            created = now + timedelta(seconds=i)
+            rows.append({
+                'id': new_id(), 'created_at': created, 'updated_at': created,
+                '_title': f'{rng.choice(COMMON).title()} {i}',
+                '_description': description(rng),
+                '_price': 10.0 + i % 500, '_latitude': 45.0,
+                '_longitude': 5.0, '_geohash': geo.encode(45.0, 5.0),
+                'owner_id': owner_id})
+        db.session.execute(Place.__table__.insert(), rows)
+    db.session.commit()
+
+
+def like_scan(term):
+    """Every place whose title or description contains the term."""
+    pattern = f'%{term}%'
+    return db.session.query(Place.id).filter(or_(
+        Place._title.like(pattern), Place._description.like(pattern))).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    make_app()
+    rows = []
+    for size in args.sizes:
+        db.drop_all()
+        db.create_all()
+        owner_id, _, _ = seed(0, amenities=0)
+        seed_places(size, owner_id)
+        for label, term in TERMS:
+            matches = len(like_scan(term))
+            like_p50, like_p99 = measure(lambda: like_scan(term), 5)
+            fts_p50, fts_p99 = measure(
+                lambda: facade.search_places_text(term, 20), args.repeat)
+            rows.append((size, label, matches,
+                         f"{like_p50:.1f}", f"{like_p99:.1f}",
+                         f"{fts_p50:.1f}", f"{fts_p99:.1f}"))
+    report("text search, first page of 20 (ms)", rows,
+           ("places", "term", "matches", "LIKE p50", "LIKE p99",
+            "FTS5 p50", "FTS5 p99"))
+
+
+if __name__ == '__main__':
+    main()
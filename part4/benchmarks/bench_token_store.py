@@ -0,0 +1,162 @@
+"""
+Load test: refresh token rotation with many active sessions.
+
+1. Store level: with `--sessions` active sessions, median and p99 time of
+   a rotation (consume the token, register the next one) and of a replay
+   check, for the memory and SQLite stores. Lookups being O(1), the
+   times should not grow with the number of sessions.
+2. HTTP level: `--clients` threads each log in once and then rotate their
+   refresh token through POST /api/v1/auth/refresh as fast as they can;
+   reports rotations per second and checks that no rotation was mistaken
+   for a replay.
+
+Uses an SQLite file so that every commit pays its real cost.
+
+Usage (from part4/):
+    python -m benchmarks.bench_token_store [--sessions 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from app.models.refresh_token import refresh_tokens
+from app.models.user import User
+from app.persistence.token_store import (
+    MemoryTokenStore, SQLTokenStore, TokenReplay)
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+from benchmarks.common import make_app, file_config, seed, report, db
+
+
+def timed(func, samples):
+    """Run func() and append its duration (ms) to samples."""
+    start = time.perf_counter()
+    func()
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+def p99(samples):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def fill(store, user_id, sessions):
+    """Register one token per session; return their jti."""
+    expires_at = int(time.time()) + 3600
+    jtis = [str(uuid.uuid4()) for _ in range(sessions)]
+    if isinstance(store, SQLTokenStore):
+        db.session.execute(refresh_tokens.delete())
+        for start in range(0, sessions, 10000):
+            db.session.execute(refresh_tokens.insert(), [{
+                'jti': jti, 'user_id': user_id, 'family_id': jti,
+                'expires_at': expires_at, 'used': False}
+                for jti in jtis[start:start + 10000]])
+        db.session.commit()
+    else:
+        for jti in jtis:
+            store.add(jti, user_id, jti, expires_at)
+    return jtis
+
+
+def measure_store(store, user_id, sessions, rotations):
+    """(rotation p50, p99, replay p50, p99) in ms."""
+    jtis = fill(store, user_id, sessions)
+    used = random.sample(jtis, rotations)
+    expires_at = int(time.time()) + 3600
+    rotate, replay = [], []
+
+    def rotation(jti):
+        with unit_of_work():
+            record = store.consume(jti)
+            store.add(str(uuid.uuid4()), user_id, record['family_id'],
+                      expires_at)
+
+    def replayed(jti):
+        try:
+            with unit_of_work():
+                store.consume(jti)
+        except TokenReplay:
+            return
+        raise AssertionError("replay not detected")
+
+    for jti in used:
+        timed(lambda: rotation(jti), rotate)
+    for jti in used:
+        timed(lambda: replayed(jti), replay)
+    return (statistics.median(rotate), p99(rotate),
+            statistics.median(replay), p99(replay))
+
+
+def http_load(app, clients, duration):
+    """(rotations/s, failures) of `clients` threads refreshing."""
+    stop = threading.Event()
+    counts = {'ok': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def client_loop(index):
+        client = app.test_client()
+        token = client.post("/api/v1/auth/login", json={
+            "email": f"load{index}@example.com",
+            "password": "secret"}).get_json()['refresh_token']
+        while not stop.is_set():
+            response = client.post("/api/v1/auth/refresh", headers={
+                "Authorization": f"Bearer {token}"})
+            with lock:
+                counts['ok' if response.status_code == 200 else 'failed'] += 1
+            if response.status_code != 200:
+                return
+            token = response.get_json()['refresh_token']
+
+    threads = [threading.Thread(target=client_loop, args=(i,))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts['ok'] / duration, counts['failed']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--rotations', type=int, default=500)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    app = make_app(file_config(os.path.join(tmp, 'bench.db')))
+    user_id, _, _ = seed(0, amenities=0)
+
+    rows = []
+    for sessions in args.sessions:
+        for store in (MemoryTokenStore(), SQLTokenStore()):
+            result = measure_store(store, user_id, sessions, args.rotations)
+            rows.append((store.name, sessions,
+                         *(f"{value:.3f}" for value in result)))
+    report("Refresh token store (ms)", rows,
+           ("store", "sessions", "rotate p50", "rotate p99",
+            "replay p50", "replay p99"))
+
+    for index in range(args.clients):
+        db.session.add(User("Load", "Test", f"load{index}@example.com",
+                            "secret"))
+    db.session.commit()
+    rows = []
+    for store in (MemoryTokenStore(), SQLTokenStore()):
+        facade.configure_token_store(store)
+        rate, failed = http_load(app, args.clients, args.duration)
+        rows.append((store.name, args.clients, f"{rate:.0f}", failed))
+    report("POST /api/v1/auth/refresh under load", rows,
+           ("store", "clients", "rotations/s", "failed"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmark: throughput and latency of each worker model.
+
+For every `--configs` entry (WORKERSxTHREADS), starts the production
+entry point (wsgi.py) on a seeded SQLite file, loads it for `--duration`
+seconds with `--clients` threads reading GET /api/v1/places/<id> and
+GET /api/v1/amenities/, then reports requests per second, p50/p99
+latency and errors.
+
+Servers (`--server`):
+- gunicorn: `gunicorn wsgi:app` with gunicorn.conf.py and HBNB_WORKERS /
+  HBNB_THREADS, as in production.
+- werkzeug: the same model without gunicorn: the app is loaded once,
+  `workers` processes are forked on a shared socket, each serving with a
+  pool of `threads` threads and calling app.server.after_fork().
+- auto (default): gunicorn if installed, werkzeug otherwise.
+
+The load generator runs on the same machine: on few cores it competes
+with the server, so compare the rows with each other, not with numbers
+from another machine.
+
+Usage (from part4/):
+    python -m benchmarks.bench_workers [--configs 1x1 1x4 2x4 4x1]
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import make_app, file_config, seed, report
+
+HOST = '127.0.0.1'
+PART4 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """A TCP port nobody listens on right now."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def serve_prefork(port, workers, threads):
+    """Serve wsgi.app with `workers` forked processes of `threads` threads."""
+    from werkzeug.serving import BaseWSGIServer
+    from app.server import after_fork
+    from wsgi import app
+
+    class PooledServer(BaseWSGIServer):
+        """Requests handled by a fixed pool of threads."""
+        # Lue par listen() dans __init__ : même backlog que gunicorn
+        request_queue_size = 2048
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.handle_in_thread, request, client_address)
+
+        def handle_in_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server = PooledServer(HOST, port, app)
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = None
+            break
+        children.append(pid)
+    # Chaque process (master compris) sert sur le même socket
+    after_fork(app)
+    server.pool = ThreadPoolExecutor(threads)
+    if children:
+        def stop(signum, frame):
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+            sys.exit(0)
+        signal.signal(signal.SIGTERM, stop)
+    server.serve_forever()
+
+
+def start_server(kind, database, port, workers, threads):
+    """Start the server in its own process group; wait until it listens."""
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}',
+               HBNB_BIND=f'{HOST}:{port}', HBNB_WORKERS=str(workers),
+               HBNB_THREADS=str(threads), PYTHONWARNINGS='ignore')
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', 'wsgi:app']
+    else:
+        command = [sys.executable, '-m', 'benchmarks.bench_workers',
+                   '--serve', str(port), str(workers), str(threads)]
+    return launch(command, env, port, kind)
+
+
+def launch(command, env, port, name):
+    """Run `command` in its own process group; wait until it listens."""
+    process = subprocess.Popen(command, cwd=PART4, env=env,
+                               start_new_session=True,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError(f"{name} did not start on port {port}")
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait(timeout=30)
+
+
+def load(port, urls, clients, duration):
+    """(requests/s, p50 ms, p99 ms, errors) of `clients` threads."""
+    stop = threading.Event()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def client_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                connection = http.client.HTTPConnection(HOST, port,
+                                                        timeout=10)
+                connection.request('GET', random.choice(urls))
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                ok = response.status == 200
+            except OSError:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, errors[0]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (len(latencies) / duration, latencies[len(latencies) // 2], p99,
+            errors[0])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--configs', nargs='+',
+                        default=['1x1', '1x4', '2x4', '4x1'])
+    parser.add_argument('--server', choices=('auto', 'gunicorn', 'werkzeug'),
+                        default='auto')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--places', type=int, default=200)
+    parser.add_argument('--serve', nargs=3, type=int,
+                        metavar=('PORT', 'WORKERS', 'THREADS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve_prefork(*args.serve)
+        return
+
+    kind = args.server
+    if kind == 'auto':
+        kind = ('gunicorn' if importlib.util.find_spec('gunicorn')
+                else 'werkzeug')
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    make_app(file_config(database))
+    _, place_ids, _ = seed(args.places)
+    urls = ['/api/v1/amenities/'] + [
+        f'/api/v1/places/{place_id}' for place_id in place_ids]
+
+    rows = []
+    for config in args.configs:
+        workers, threads = (int(x) for x in config.split('x'))
+        port = free_port()
+        process = start_server(kind, database, port, workers, threads)
+        try:
+            rate, p50, p99, errors = load(port, urls, args.clients,
+                                          args.duration)
+        finally:
+            stop_server(process)
+        rows.append((kind, workers, threads, f"{rate:.0f}", f"{p50:.1f}",
+                     f"{p99:.1f}", errors))
+    report(f"GET places/amenities, {args.clients} clients, "
+           f"{os.cpu_count()} CPU", rows,
+           ("server", "workers", "threads", "req/s", "p50 ms", "p99 ms",
+            "errors"))
+
+
+if __name__ == '__main__':
+    main()
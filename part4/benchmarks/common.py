@@ -0,0 +1,110 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against an in-memory SQLite database (TestingConfig) and
+seed data with Core bulk inserts, so no password hashing is involved.
+
+Usage (from part4/):
+    python -m benchmarks.<script_name>
+"""
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.models.place_amenity import place_amenity
+from app.utils import geo
+
+
+def file_config(path):
+    """TestingConfig variant using an SQLite file (real commits/fsyncs)."""
+    from config import TestingConfig
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    return FileConfig
+
+
+def make_app(config_class="config.TestingConfig"):
+    """Create an app, push its context and create the tables."""
+    app = create_app(config_class)
+    app.app_context().push()
+    db.create_all()
+    return app
+
+
+def new_id():
+    """Return a new UUID string, like BaseModel does."""
+    return str(uuid.uuid4())
+
+
+def seed(places, amenities=10, amenities_per_place=3, reviews_per_place=0):
+    """
+    Bulk insert one owner, `places` places, `amenities` amenities and the
+    place_amenity links. Returns (owner_id, place_ids, amenity_ids).
+    """
+    now = datetime(2024, 1, 1)
+    owner_id = new_id()
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'created_at': now, 'updated_at': now,
+        '_first_name': 'Bench', '_last_name': 'Owner',
+        '_email': 'bench@example.com', '_password_hash': 'x',
+        '_is_admin': False}])
+    amenity_ids = [new_id() for _ in range(amenities)]
+    if amenity_ids:
+        db.session.execute(Amenity.__table__.insert(), [{
+            'id': a_id, 'created_at': now, 'updated_at': now,
+            '_name': f'Amenity {i}'} for i, a_id in enumerate(amenity_ids)])
+    place_ids = [new_id() for _ in range(places)]
+    rows = []
+    for i, p_id in enumerate(place_ids):
+        created = now + timedelta(seconds=i)
+        lat, lon = (i % 180) - 90.0, (i % 360) - 180.0
+        rows.append({
+            'id': p_id, 'created_at': created, 'updated_at': created,
+            '_title': f'Place {i}', '_description': None,
+            '_price': 10.0 + i % 500, '_latitude': lat, '_longitude': lon,
+            '_geohash': geo.encode(lat, lon), 'owner_id': owner_id})
+    if rows:
+        db.session.execute(Place.__table__.insert(), rows)
+    links = [
+        {'place_id': p_id,
+         'amenity_id': amenity_ids[(i + k) % amenities]}
+        for i, p_id in enumerate(place_ids)
+        for k in range(min(amenities_per_place, amenities))]
+    if links:
+        db.session.execute(place_amenity.insert(), links)
+    if reviews_per_place and place_ids:
+        db.session.execute(Review.__table__.insert(), [{
+            'id': new_id(), 'created_at': now, 'updated_at': now,
+            '_text': 'Nice', '_rating': 1 + (i + k) % 5,
+            'place_id': p_id, 'user_id': owner_id}
+            for i, p_id in enumerate(place_ids)
+            for k in range(reviews_per_place)])
+    db.session.commit()
+    return owner_id, place_ids, amenity_ids
+
+
+def measure(func, repeat=20):
+    """Run `func` `repeat` times and return (p50, p99) in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+        db.session.expunge_all()
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+def report(title, rows, headers):
+    """Print a small aligned table."""
+    print(f"\n{title}")
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+    for row in (headers, *rows):
+        print("  ".join(str(x).rjust(w) for x, w in zip(row, widths)))
@@ -18,9 +18,78 @@ class Config:
     Attributes:
     - SECRET_KEY: Used for session management and security features.
     - DEBUG: Set to False by default.
+    - JWT_VERIFY_SUB: Disabled because the JWT identity is a dict.
+    - CACHE_*: Read-through cache settings (see app/persistence/cache.py).
+    - JSON_BACKEND: JSON encoder of responses (see app/utils/serializers.py).
+    - COMPRESS_*: Response compression (see app/utils/compression.py).
+    - FRONTEND_DIR: Static frontend served under /frontend/.
+    - BCRYPT_*: Password hashing cost and pool (see app/utils/hashing.py).
+    - IDENTITY_CACHE_*: Users resolved from JWTs (see
+      app/services/identity.py).
+    - JWT_DENYLIST_*: Revoked tokens filter (see app/utils/denylist.py).
+    - TOKEN_STORE_*: Refresh token store (see
+      app/persistence/token_store.py).
+    - DB_POOL_*, SQLITE_*: Connection pool and SQLite pragmas (see
+      app/persistence/engine.py).
+    - DB_REPLICA_URLS: Read replicas (see app/persistence/routing.py).
     """
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # L'identité JWT est un dict {'id', 'is_admin'} et non une string
+    JWT_VERIFY_SUB = False
+    # Cache des GET d'une entité : 'memory' (LRU), 'redis' ou 'null'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Encodeur JSON : 'auto' (orjson, msgspec ou json), 'orjson', ...
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    # Compression gzip/brotli des réponses à partir de COMPRESS_MIN_SIZE octets
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+    FRONTEND_DIR = os.getenv('FRONTEND_DIR', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'frontend'))
+    # Coût bcrypt des nouveaux hashs (les anciens sont refaits au login)
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Threads de hashage, et requêtes autorisées à attendre (sinon 503)
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 2))
+    BCRYPT_QUEUE_SIZE = int(os.getenv('BCRYPT_QUEUE_SIZE', 32))
+    # Users des tokens gardés en mémoire : pas de SQL pour l'autorisation
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 30))
+    IDENTITY_CACHE_MAX_ENTRIES = int(
+        os.getenv('IDENTITY_CACHE_MAX_ENTRIES', 10000))
+    # Filtre de Bloom des jti révoqués (logout)
+    JWT_DENYLIST_CAPACITY = int(os.getenv('JWT_DENYLIST_CAPACITY', 100000))
+    JWT_DENYLIST_ERROR_RATE = float(
+        os.getenv('JWT_DENYLIST_ERROR_RATE', 0.001))
+    # Délai max avant qu'un worker refuse un token révoqué par un autre
+    JWT_DENYLIST_SYNC_INTERVAL = float(
+        os.getenv('JWT_DENYLIST_SYNC_INTERVAL', 1.0))
+    # Refresh tokens à usage unique : 'sqlite' (base de l'app), 'memory'
+    # ou 'redis'
+    TOKEN_STORE_BACKEND = os.getenv('TOKEN_STORE_BACKEND', 'sqlite')
+    TOKEN_STORE_MAX_ENTRIES = int(
+        os.getenv('TOKEN_STORE_MAX_ENTRIES', 200000))
+    TOKEN_STORE_REDIS_URL = os.getenv(
+        'TOKEN_STORE_REDIS_URL', 'redis://localhost:6379/0')
+    # Pool de connexions (ignoré pour une base SQLite en mémoire)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '0') == '1'
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', -1))
+    # PRAGMA de chaque connexion SQLite (None : défaut de SQLite)
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    # Négatif : en Kio (64 Mo par connexion)
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))   # ms
+    # Réplicas en lecture seule, URLs séparées par des virgules
+    DB_REPLICA_URLS = [url for url in
+                       os.getenv('DB_REPLICA_URLS', '').split(',') if url]
 
 
 class DevelopmentConfig(Config):
@@ -31,9 +100,42 @@ class DevelopmentConfig(Config):
     """
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 10))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+
+
+class ProductionConfig(Config):
+    """
+    Production configuration, used by wsgi.py.
+
+    The database is given by DATABASE_URL. The schema is not created at
+    startup: run `flask --app wsgi init-db` (which also upgrades an older
+    schema) before starting the server.
+    """
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connexions fermées par le serveur de base : testées et renouvelées
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+
+
+class TestingConfig(Config):
+    """
+    Testing-specific configuration.
+
+    Uses an in-memory SQLite database so tests never touch development.db.
+    """
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4                   # Hashage rapide pour les tests
+
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
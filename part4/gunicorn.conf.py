@@ -0,0 +1,17 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts in part4/.
+
+The worker model comes from the HBNB_* environment variables described
+in app/server.py, e.g.:
+
+    HBNB_WORKERS=4 HBNB_THREADS=8 gunicorn wsgi:app
+"""
+from app.server import after_fork, worker_settings
+
+globals().update(worker_settings())
+
+
+def post_fork(server, worker):
+    """Give each worker its own connections and hashing threads."""
+    from wsgi import app
+    after_fork(app)
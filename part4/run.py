@@ -6,22 +6,20 @@ and starts the development server with debug mode enabled.
 
 Usage:
 -------
+$ flask --app run init-db       # creates or upgrades the tables
 $ python run.py
 
 Note:
 ------
-Debug mode should only be used during local development.
+Debug mode should only be used during local development. In production,
+serve wsgi.py with gunicorn instead (see gunicorn.conf.py).
 """
 import logging
 from app import create_app
-from app.extensions import db
-from app.models import user
 
 logging.basicConfig(filename='app.log', level=logging.DEBUG,
                     format='%(asctime)s %(levelname)s: %(message)s')
 app = create_app()
-with app.app_context():
-    db.create_all()
 
 if __name__ == '__main__':
     app.run(debug=True)
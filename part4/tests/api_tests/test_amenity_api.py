@@ -1,14 +1,21 @@
 
 import unittest
-from app import create_app
-
-app = create_app()
+from app import create_app, db
 
 class AmenityApiTestCase(unittest.TestCase):
     def setUp(self):
-        self.client = app.test_client()
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
         self.base_url = "/api/v1/amenities/"
 
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
     def test_create_amenity_valid(self):
         data = {"name": "Wi-Fi"}
         response = self.client.post(self.base_url, json=data)
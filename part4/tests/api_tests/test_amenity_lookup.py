@@ -0,0 +1,60 @@
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.services import facade
+
+
+class AmenityLookupTestCase(unittest.TestCase):
+    """Amenity <-> place lookups go through place_amenity indexes."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.wifi = Amenity("WiFi")
+        self.pool = Amenity("Pool")
+        self.house = Place("House", 100.0, 45.0, 5.0, owner)
+        self.flat = Place("Flat", 80.0, 45.0, 5.0, owner)
+        self.house.amenities.extend([self.wifi, self.pool])
+        self.flat.amenities.append(self.wifi)
+        db.session.add_all([owner, self.house, self.flat])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_get_amenities_by_place(self):
+        names = sorted(a['name'] for a in
+                       facade.get_amenities_by_place(self.house.id))
+        self.assertEqual(names, ["Pool", "WiFi"])
+        self.assertEqual(facade.get_amenities_by_place(self.flat.id),
+                         [{'id': self.wifi.id, 'name': "WiFi"}])
+        self.assertEqual(facade.get_amenities_by_place("unknown"), [])
+
+    def test_get_places_by_amenity(self):
+        titles = sorted(p.title for p in
+                        facade.get_places_by_amenity(self.wifi.id))
+        self.assertEqual(titles, ["Flat", "House"])
+        self.assertEqual(
+            [p.title for p in facade.get_places_by_amenity(self.pool.id)],
+            ["House"])
+
+    def test_lookups_use_indexes(self):
+        for column in ("place_id", "amenity_id"):
+            plan = db.session.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM place_amenity "
+                f"WHERE {column} = 'x'")).fetchall()
+            detail = " ".join(row[-1] for row in plan)
+            self.assertIn("USING", detail)
+            self.assertNotIn("SCAN place_amenity", detail)
+
+
+if __name__ == "__main__":
+    unittest.main()
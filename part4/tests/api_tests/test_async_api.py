@@ -0,0 +1,172 @@
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app, db
+from app.async_api import create_async_app, parse_query
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from config import TestingConfig
+
+HAS_ASYNC_DRIVER = all(importlib.util.find_spec(name)
+                       for name in ("greenlet", "aiosqlite"))
+
+
+class ParseQueryTestCase(unittest.TestCase):
+
+    def test_pagination(self):
+        self.assertIsNone(parse_query(b""))
+        self.assertEqual(parse_query(b"limit=5"), (5, ""))
+        self.assertEqual(parse_query(b"cursor=abc"), (20, "abc"))
+
+    def test_invalid_parameters(self):
+        for query in (b"limit=0", b"limit=x", b"fields=id"):
+            with self.assertRaises(ValueError):
+                parse_query(query)
+
+
+@unittest.skipUnless(HAS_ASYNC_DRIVER, "needs greenlet and aiosqlite")
+class AsyncReadAPITestCase(unittest.TestCase):
+    """The ASGI read API answers like the Flask API."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.config = type("AsyncConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI":
+                f"sqlite:///{os.path.join(cls.tmp, 'hbnb.db')}",
+        })
+        cls.app = create_app(cls.config)
+        with cls.app.app_context():
+            db.create_all()
+            owner = User("Owner", "Test", "owner@example.com", "pw")
+            guest = User("Guest", "Test", "guest@example.com", "pw")
+            wifi, pool = Amenity("Wifi"), Amenity("Pool")
+            places = [Place(f"Place {i}", 50.0 + i, 45.0, 5.0, owner)
+                      for i in range(3)]
+            places[0].amenities.extend([wifi, pool])
+            db.session.add_all([owner, guest, wifi, pool, *places])
+            db.session.flush()
+            db.session.add(Review("Great", 5, places[0], guest))
+            db.session.commit()
+            cls.place_id, cls.amenity_id = places[0].id, wifi.id
+            cls.review_id = places[0].reviews[0].id
+            db.session.remove()
+        cls.client = cls.app.test_client()
+        cls.api = create_async_app(cls.config)
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(cls.tmp)
+
+    def request(self, path, method="GET"):
+        """Call the ASGI app; returns (status, headers, body)."""
+        path, _, query = path.partition("?")
+        scope = {"type": "http", "method": method, "path": path,
+                 "query_string": query.encode(), "headers": []}
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        async def run():
+            try:
+                await self.api(scope, receive, send)
+            finally:
+                # Connexions liées à la boucle de ce asyncio.run()
+                await self.api.facade.dispose()
+
+        asyncio.run(run())
+        start, body = messages
+        return start["status"], dict(start["headers"]), body["body"]
+
+    def assertSameResponse(self, path):
+        status, headers, body = self.request(path)
+        response = self.client.get(path)
+        self.assertEqual(status, response.status_code, path)
+        self.assertEqual(headers[b"content-type"], b"application/json")
+        self.assertEqual(json.loads(body), response.get_json(), path)
+        return json.loads(body)
+
+    def test_lists_match_the_flask_api(self):
+        for resource in ("places", "reviews", "amenities"):
+            items = self.assertSameResponse(f"/api/v1/{resource}/")
+            self.assertTrue(items)
+
+    def test_details_match_the_flask_api(self):
+        place = self.assertSameResponse(f"/api/v1/places/{self.place_id}")
+        self.assertEqual(len(place["amenities"]), 2)
+        self.assertEqual(place["reviews"][0]["rating"], 5)
+        self.assertSameResponse(f"/api/v1/reviews/{self.review_id}")
+        self.assertSameResponse(f"/api/v1/amenities/{self.amenity_id}")
+
+    def test_pages_match_the_flask_api(self):
+        page = self.assertSameResponse("/api/v1/places/?limit=2")
+        self.assertEqual(len(page["items"]), 2)
+        last = self.assertSameResponse(
+            f"/api/v1/places/?limit=2&cursor={page['next_cursor']}")
+        self.assertEqual(len(last["items"]), 1)
+        self.assertIsNone(last["next_cursor"])
+        self.assertSameResponse("/api/v1/reviews/?limit=1")
+        self.assertSameResponse("/api/v1/amenities/?limit=1")
+
+    def test_errors_match_the_flask_api(self):
+        for path in ("/api/v1/places/unknown", "/api/v1/reviews/unknown",
+                     "/api/v1/amenities/unknown",
+                     "/api/v1/places/?limit=0",
+                     "/api/v1/places/?cursor=invalid"):
+            self.assertSameResponse(path)
+
+    def test_unsupported_requests(self):
+        status, _, body = self.request("/api/v1/places/?fields=id")
+        self.assertEqual(status, 400)
+        self.assertEqual(json.loads(body),
+                         {"error": "Unsupported parameter: fields"})
+        status, headers, _ = self.request("/api/v1/places/", "POST")
+        self.assertEqual(status, 405)
+        self.assertEqual(headers[b"allow"], b"GET, HEAD")
+        status, _, _ = self.request("/api/v1/users/")
+        self.assertEqual(status, 404)
+
+    def test_head_has_no_body(self):
+        status, headers, body = self.request("/api/v1/amenities/", "HEAD")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"")
+        self.assertNotEqual(headers[b"content-length"], b"0")
+
+    def test_lifespan_disposes_the_engines(self):
+        messages = iter([{"type": "lifespan.startup"},
+                         {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(self.api({"type": "lifespan"}, receive, send))
+        self.assertEqual(sent, ["lifespan.startup.complete",
+                                "lifespan.shutdown.complete"])
+
+
+@unittest.skipUnless(HAS_ASYNC_DRIVER, "needs greenlet and aiosqlite")
+class InMemoryDatabaseTestCase(unittest.TestCase):
+
+    def test_in_memory_database_is_refused(self):
+        with self.assertRaises(ValueError):
+            create_async_app("config.TestingConfig")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.cli import import_ndjson
+
+
+class BulkImportTestCase(unittest.TestCase):
+    """NDJSON bulk import through the admin endpoint and the CLI."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw",
+                          is_admin=True)
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        db.session.add_all([self.owner, self.guest])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self, is_admin=True):
+        user = self.owner if is_admin else self.guest
+        token = create_access_token(
+            identity={'id': user.id, 'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def _ndjson(self):
+        rows = [
+            {"type": "amenity", "id": "wifi", "name": "WiFi"},
+            {"type": "place", "id": "p1", "title": "House", "price": 100,
+             "latitude": 45.0, "longitude": 5.0,
+             "owner_id": self.owner.id, "amenities": ["wifi"]},
+            {"type": "place", "title": "Bad", "price": -1,
+             "latitude": 45.0, "longitude": 5.0, "owner_id": self.owner.id},
+            {"type": "review", "text": "Nice", "rating": 5,
+             "place_id": "p1", "user_id": self.guest.id},
+            {"type": "review", "text": "Again", "rating": 4,
+             "place_id": "p1", "user_id": self.guest.id},
+            {"type": "place", "title": "Ghost", "price": 10,
+             "latitude": 0.0, "longitude": 0.0, "owner_id": "nobody"},
+        ]
+        lines = [json.dumps(row) for row in rows]
+        lines.insert(3, "{not json")
+        return "\n".join(lines) + "\n"
+
+    def test_admin_import_reports_errors_per_line(self):
+        resp = self.client.post(
+            "/api/v1/admin/import?batch_size=3", data=self._ndjson(),
+            content_type="application/x-ndjson", headers=self._headers())
+        self.assertEqual(resp.status_code, 200)
+        report = resp.get_json()
+        self.assertEqual(report["inserted"],
+                         {"amenity": 1, "place": 1, "review": 1})
+        self.assertEqual(report["error_count"], 4)
+        self.assertEqual(sorted(e["line"] for e in report["errors"]),
+                         [3, 4, 6, 7])
+
+        place = Place.query.get("p1")
+        self.assertEqual([a.name for a in place.amenities], ["WiFi"])
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_owner_cannot_review_own_place(self):
+        db.session.add(Place("Flat", 80.0, 46.0, 6.0, self.owner))
+        db.session.commit()
+        flat = Place.query.filter_by(_title="Flat").one()
+        rows = [
+            {"type": "place", "id": "p1", "title": "House", "price": 100,
+             "latitude": 45.0, "longitude": 5.0, "owner_id": self.owner.id},
+            # Place du même batch, puis place déjà en base
+            {"type": "review", "text": "Mine", "rating": 5,
+             "place_id": "p1", "user_id": self.owner.id},
+            {"type": "review", "text": "Mine too", "rating": 5,
+             "place_id": flat.id, "user_id": self.owner.id},
+            {"type": "review", "text": "Nice", "rating": 4,
+             "place_id": flat.id, "user_id": self.guest.id},
+        ]
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(
+            import_ndjson, ["-"],
+            input="\n".join(json.dumps(row) for row in rows) + "\n")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(
+            result.output.count("You cannot review your own place"), 2)
+        self.assertEqual([r.user_id for r in Review.query.all()],
+                         [self.guest.id])
+        db.session.refresh(flat)
+        self.assertEqual((flat.review_count, flat.rating_sum), (1, 4))
+
+    def test_admin_import_requires_admin(self):
+        resp = self.client.post(
+            "/api/v1/admin/import", data=self._ndjson(),
+            content_type="application/x-ndjson",
+            headers=self._headers(is_admin=False))
+        self.assertEqual(resp.status_code, 403)
+        self.assertEqual(Amenity.query.count(), 0)
+
+    def test_cli_import(self):
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(import_ndjson, ["-"], input=self._ndjson())
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(Place.query.count(), 1)
+        self.assertEqual(Review.query.count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
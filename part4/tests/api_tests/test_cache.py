@@ -0,0 +1,120 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.cache import Cache, LRUCache, make_cache, NullCache
+from app.services import facade
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    """In-process LRU cache with TTL."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = LRUCache(max_entries=2, ttl=10, clock=lambda: self.now)
+
+    def test_hit_and_miss_counters(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", {"x": 1})
+        self.assertEqual(self.cache.get("a"), {"x": 1})
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.now = 11
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+
+    def test_make_cache(self):
+        self.assertIsInstance(make_cache({'CACHE_BACKEND': 'null'}), NullCache)
+        with self.assertRaises(ValueError):
+            make_cache({'CACHE_BACKEND': 'unknown'})
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class Incomplete(Cache):
+            def _get(self, key):
+                return None
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class EntityCacheTestCase(unittest.TestCase):
+    """Single-entity GETs are cached and invalidated by writes."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw",
+                          is_admin=True)
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner)
+        db.session.add_all([self.owner, self.guest, self.place])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self, user, is_admin=False):
+        token = create_access_token(
+            identity={'id': user.id, 'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def _get_place(self):
+        resp = self.client.get(f"/api/v1/places/{self.place.id}")
+        self.assertEqual(resp.status_code, 200)
+        return resp.get_json()
+
+    def test_second_get_is_a_hit(self):
+        self._get_place()
+        self._get_place()
+        self.assertEqual(facade.cache.stats()["hits"], 1)
+        self.assertEqual(facade.cache.stats()["misses"], 1)
+
+    def test_new_review_invalidates_place_detail(self):
+        self.assertEqual(self._get_place()["reviews"], [])
+        resp = self.client.post(
+            "/api/v1/reviews/", headers=self._headers(self.guest), json={
+                "place_id": self.place.id, "user_id": self.guest.id,
+                "text": "Lovely", "rating": 5})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(
+            [r["comment"] for r in self._get_place()["reviews"]], ["Lovely"])
+
+    def test_update_invalidates_place_and_owner_views(self):
+        self._get_place()
+        facade.update_place(self.place.id, {"title": "New title"})
+        self.assertEqual(self._get_place()["title"], "New title")
+
+        self.client.get(f"/api/v1/users/{self.owner.id}")
+        facade.update_user(self.owner.id, {"first_name": "Renamed"})
+        resp = self.client.get(f"/api/v1/users/{self.owner.id}")
+        self.assertEqual(resp.get_json()["first_name"], "Renamed")
+        self.assertEqual(self._get_place()["owner"]["first_name"], "Renamed")
+
+    def test_stats_endpoint_is_admin_only(self):
+        self._get_place()
+        resp = self.client.get(
+            "/api/v1/admin/cache", headers=self._headers(self.guest))
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.get(
+            "/api/v1/admin/cache", headers=self._headers(self.owner, True))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app, db
+from app.cli import compress_frontend
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.utils import compression
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+class CompressionTestCase(unittest.TestCase):
+    """gzip/brotli API responses and precompressed frontend assets."""
+
+    def setUp(self):
+        self.frontend = tempfile.mkdtemp()
+        source = os.path.join(
+            os.path.dirname(__file__), "..", "..", "frontend")
+        shutil.copytree(source, self.frontend, dirs_exist_ok=True)
+        self.app = create_app("config.TestingConfig")
+        self.app.config["FRONTEND_DIR"] = self.frontend
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.wifi = Amenity("Wifi")
+        db.session.add(owner)
+        db.session.add(self.wifi)
+        for i in range(20):
+            db.session.add(Place(f"House {i}", 100.0, 45.0, 5.0, owner,
+                                 "A quiet house near the lake"))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.frontend)
+
+    def test_json_is_compressed_when_accepted(self):
+        plain = self.client.get("/api/v1/places/")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertIn("Accept-Encoding", plain.headers["Vary"])
+
+        response = self.client.get("/api/v1/places/", headers=GZIP)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(response.mimetype, "application/json")
+        body = gzip.decompress(response.data)
+        self.assertEqual(json.loads(body), plain.get_json())
+        self.assertEqual(int(response.headers["Content-Length"]),
+                         len(response.data))
+        self.assertLess(len(response.data), len(body) // 4)
+
+    def test_threshold_and_refusal(self):
+        # Détail d'une amenity : quelques dizaines d'octets
+        response = self.client.get(
+            f"/api/v1/amenities/{self.wifi.id}", headers=GZIP)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+        response = self.client.get(
+            "/api/v1/places/", headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+        self.app.config["COMPRESS_ENABLED"] = False
+        response = self.client.get("/api/v1/places/", headers=GZIP)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_level_is_configurable(self):
+        self.app.config["COMPRESS_LEVEL"] = 1
+        fast = self.client.get("/api/v1/places/", headers=GZIP).data
+        self.app.config["COMPRESS_LEVEL"] = 9
+        best = self.client.get("/api/v1/places/", headers=GZIP).data
+        self.assertEqual(gzip.decompress(fast), gzip.decompress(best))
+        self.assertLessEqual(len(best), len(fast))
+
+    @unittest.skipIf(compression.brotli is None, "brotli not installed")
+    def test_brotli_preferred(self):
+        response = self.client.get(
+            "/api/v1/places/", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(
+            json.loads(compression.brotli.decompress(response.data)),
+            self.client.get("/api/v1/places/").get_json())
+
+    def test_weak_etag_still_validates(self):
+        place_id = Place.query.first().id
+        url = f"/api/v1/places/{place_id}"
+        self.app.config["COMPRESS_MIN_SIZE"] = 0
+        plain = self.client.get(url)
+        response = self.client.get(url, headers=GZIP)
+        self.assertEqual(response.headers["ETag"], "W/" + plain.headers["ETag"])
+        response = self.client.get(url, headers={
+            **GZIP, "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_streamed_responses_are_left_alone(self):
+        response = self.client.get("/api/v1/places/", headers={
+            **GZIP, "Accept": "application/x-ndjson"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(len(response.get_data().splitlines()), 20)
+
+    def test_precompressed_frontend(self):
+        result = self.app.test_cli_runner().invoke(compress_frontend)
+        self.assertEqual(result.exit_code, 0, result.output)
+        css = os.path.join(self.frontend, "styles.css")
+        self.assertTrue(os.path.exists(css + ".gz"))
+        # Les images PNG ne sont pas recompressées
+        self.assertFalse(os.path.exists(
+            os.path.join(self.frontend, "images", "logo.png.gz")))
+
+        with open(css, "rb") as source:
+            original = source.read()
+        response = self.client.get("/frontend/styles.css", headers=GZIP)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/css")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(gzip.decompress(response.get_data()), original)
+
+        response = self.client.get("/frontend/styles.css")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_data(), original)
+
+        response = self.client.get("/frontend/images/logo.png", headers=GZIP)
+        self.assertEqual(response.mimetype, "image/png")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(
+            self.client.get("/frontend/../config.py").status_code, 404)
+
+    def test_build_step_is_incremental(self):
+        css = os.path.join(self.frontend, "styles.css")
+        report = dict((path, sizes) for path, _, sizes in
+                      compression.precompress_directory(self.frontend))
+        self.assertIn("gzip", report["styles.css"])
+        before = os.path.getmtime(css + ".gz")
+
+        # Source inchangée : la variante n'est pas réécrite
+        compression.precompress_directory(self.frontend)
+        self.assertEqual(os.path.getmtime(css + ".gz"), before)
+
+        # Source modifiée : la variante suit
+        with open(css, "a") as source:
+            source.write("footer { color: red; }\n" * 10)
+        os.utime(css, (before + 10, before + 10))
+        compression.precompress_directory(self.frontend)
+        with open(css, "rb") as source, open(css + ".gz", "rb") as variant:
+            self.assertEqual(gzip.decompress(variant.read()), source.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import event, update
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.services import facade
+
+
+class ConditionalGetTestCase(unittest.TestCase):
+    """ETag / Last-Modified validators and 304 responses on read endpoints."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.wifi = Amenity("Wifi")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner, "Nice")
+        self.place.amenities.append(self.wifi)
+        db.session.add_all([self.owner, self.guest, self.place])
+        db.session.commit()
+        self.ids = {
+            "place": self.place.id, "owner": self.owner.id,
+            "guest": self.guest.id, "wifi": self.wifi.id}
+        self.place_url = f"/api/v1/places/{self.ids['place']}"
+        db.session.expunge_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, url, headers=None, **params):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            response = self.client.get(
+                url, headers=headers or {}, query_string=params)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        return response, len(statements)
+
+    def _etag(self, url, **params):
+        return self._get(url, **params)[0].headers["ETag"]
+
+    def test_detail_strong_list_weak(self):
+        detail, _ = self._get(self.place_url)
+        self.assertEqual(detail.status_code, 200)
+        self.assertFalse(detail.headers["ETag"].startswith("W/"))
+        self.assertIn("Last-Modified", detail.headers)
+
+        for url in ("/api/v1/places/", "/api/v1/users/",
+                    "/api/v1/amenities/", "/api/v1/reviews/"):
+            response, _ = self._get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["ETag"].startswith("W/"), url)
+
+    def test_if_none_match_returns_304_with_one_query(self):
+        etag = self._etag(self.place_url)
+        response, queries = self._get(
+            self.place_url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+        # Seule la requête de version est exécutée
+        self.assertEqual(queries, 1)
+
+        etag = self._etag("/api/v1/places/")
+        response, queries = self._get(
+            "/api/v1/places/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(queries, 1)
+
+    def test_if_modified_since(self):
+        last_modified = self._get(self.place_url)[0].headers["Last-Modified"]
+        response, _ = self._get(
+            self.place_url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+        response, _ = self._get(
+            self.place_url,
+            headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_on_update(self):
+        detail = self._etag(self.place_url)
+        listing = self._etag("/api/v1/places/")
+        facade.update_place(self.ids["place"], {"price": 120.0})
+        response, _ = self._get(
+            self.place_url, headers={"If-None-Match": detail})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["price"], 120.0)
+        self.assertNotEqual(self._etag("/api/v1/places/"), listing)
+
+    def test_etag_follows_embedded_relations(self):
+        etag = self._etag(self.place_url)
+        facade.create_review({
+            "text": "Great", "rating": 5, "place_id": self.ids["place"],
+            "user_id": self.ids["guest"]})
+        self.assertNotEqual(self._etag(self.place_url), etag)
+
+        # Un nouveau lien place/amenity ne modifie aucune ligne horodatée
+        etag = self._etag(self.place_url, embed="amenities")
+        place = db.session.get(Place, self.ids["place"])
+        place.amenities.append(Amenity("Pool"))
+        db.session.commit()
+        self.assertNotEqual(
+            self._etag(self.place_url, embed="amenities"), etag)
+
+        etag = self._etag(
+            f"/api/v1/reviews/places/{self.ids['place']}/reviews")
+        self.assertTrue(etag.startswith("W/"))
+
+    def test_cached_view_follows_writes_of_other_processes(self):
+        # Écritures qui ne passent pas par facade.invalidate() (autre
+        # worker, script SQL) : la vue en cache ne doit pas être servie
+        etag = self._etag(self.place_url)
+        db.session.execute(
+            update(Place).where(Place.id == self.ids["place"])
+            .values(_title="Villa", updated_at=datetime.now()))
+        db.session.execute(
+            update(Amenity).where(Amenity.id == self.ids["wifi"])
+            .values(_name="Fiber", updated_at=datetime.now()))
+        db.session.commit()
+        response, _ = self._get(self.place_url)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["title"], "Villa")
+
+        place = db.session.get(Place, self.ids["place"])
+        place.amenities.append(Amenity("Pool"))
+        db.session.commit()
+        response, _ = self._get(self.place_url, embed="amenities")
+        self.assertEqual(
+            sorted(a["name"] for a in response.get_json()["amenities"]),
+            ["Fiber", "Pool"])
+
+    def test_representation_is_part_of_etag(self):
+        self.assertNotEqual(
+            self._etag(self.place_url),
+            self._etag(self.place_url, fields="id,title"))
+        self.assertNotEqual(
+            self._etag("/api/v1/places/"),
+            self._etag("/api/v1/places/", limit=1))
+
+    def test_missing_entity_has_no_validators(self):
+        response, _ = self._get("/api/v1/places/unknown")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
+        response, _ = self._get("/api/v1/amenities/unknown")
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
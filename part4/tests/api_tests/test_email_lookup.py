@@ -0,0 +1,101 @@
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db
+from app.cli import init_db
+from app.models.user import User
+from app.services import facade
+
+
+class EmailLookupTestCase(unittest.TestCase):
+    """Emails are matched without regard to case, through an index."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.user = User("Jane", "Doe", " Jane.Doe@Example.com", "secret")
+        db.session.add(self.user)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_email_is_kept_as_typed(self):
+        self.assertEqual(self.user.email, "Jane.Doe@Example.com")
+        self.assertEqual(self.user._email_key, "jane.doe@example.com")
+
+    def test_login_ignores_case(self):
+        response = self.client.post("/api/v1/auth/login", json={
+            "email": "JANE.DOE@example.COM", "password": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(facade.get_user_by_email(None))
+
+    def test_registration_conflict_ignores_case(self):
+        with self.assertRaises(ValueError):
+            facade.create_user({"first_name": "J", "last_name": "D",
+                                "email": "jane.doe@EXAMPLE.com",
+                                "password": "pw"})
+        # Contrainte unique même sans la vérification préalable
+        db.session.add(User("J", "D", "JANE.DOE@example.com", "pw"))
+        with self.assertRaises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_update_conflict_ignores_case(self):
+        other = facade.create_user({"first_name": "J", "last_name": "D",
+                                    "email": "john@example.com",
+                                    "password": "pw"})
+        with self.assertRaises(ValueError):
+            facade.update_user(other.id, {"email": "Jane.Doe@example.com"})
+
+    def test_lookup_uses_the_index(self):
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM users WHERE _email_key = :k"),
+            {"k": "jane.doe@example.com"}).all()
+        self.assertIn("ix_users__email_key", plan[0][-1])
+
+    def test_init_db_adds_the_column(self):
+        # Table créée avant la colonne _email_key
+        db.session.execute(text("DROP INDEX ix_users__email_key"))
+        db.session.execute(text("ALTER TABLE users DROP COLUMN _email_key"))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(init_db)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Added column users._email_key", result.output)
+        self.assertIn("Created index ix_users__email_key", result.output)
+        db.session.expire_all()
+        self.assertEqual(
+            facade.get_user_by_email("jane.doe@example.com").id, self.user.id)
+
+    def test_init_db_reports_duplicates(self):
+        db.session.execute(text("DROP INDEX ix_users__email_key"))
+        db.session.execute(text("ALTER TABLE users DROP COLUMN _email_key"))
+        db.session.execute(text(
+            "INSERT INTO users (id, created_at, updated_at, _first_name, "
+            "_last_name, _email, _password_hash, _is_admin) VALUES "
+            "('2', '2024-01-01', '2024-01-01', 'J', 'D', "
+            "'JANE.DOE@example.com', 'x', 0)"))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(init_db)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("2 users share _email_key = jane.doe@example.com",
+                      result.output)
+
+        # Doublon fusionné à la main : init-db reprend où il s'était arrêté
+        db.session.rollback()
+        db.session.execute(text("DELETE FROM users WHERE id = '2'"))
+        db.session.commit()
+        result = self.app.test_cli_runner().invoke(init_db)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Created index ix_users__email_key", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.engine import engine_options, sqlite_pragmas
+from config import ProductionConfig, TestingConfig
+
+
+def file_config(path, **overrides):
+    """TestingConfig on an SQLite file."""
+    overrides['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    return type('FileConfig', (TestingConfig,), overrides)
+
+
+class EngineOptionsTestCase(unittest.TestCase):
+    """Pool options and pragmas derived from the config."""
+
+    def test_pool_options(self):
+        options = engine_options({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:////tmp/x.db',
+            'DB_POOL_SIZE': 8, 'DB_MAX_OVERFLOW': 4,
+            'SQLALCHEMY_ENGINE_OPTIONS': {'pool_recycle': 60}})
+        self.assertEqual((options['pool_size'], options['max_overflow']),
+                         (8, 4))
+        self.assertEqual(options['pool_recycle'], 60)
+        self.assertFalse(options['pool_pre_ping'])
+
+    def test_memory_database_has_no_pool_options(self):
+        self.assertEqual(engine_options(
+            {'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}), {})
+
+    def test_production_checks_connections(self):
+        self.assertTrue(ProductionConfig.DB_POOL_PRE_PING)
+        self.assertGreater(ProductionConfig.DB_POOL_RECYCLE, 0)
+
+    def test_pragmas(self):
+        config = {'SQLITE_JOURNAL_MODE': 'wal', 'SQLITE_SYNCHRONOUS': 'normal',
+                  'SQLITE_BUSY_TIMEOUT': 100, 'SQLITE_CACHE_SIZE': None}
+        self.assertEqual(sqlite_pragmas(config), [
+            ('journal_mode', 'WAL'), ('synchronous', 'NORMAL'),
+            ('busy_timeout', 100)])
+        # Pas de journal pour une base en mémoire
+        self.assertEqual(sqlite_pragmas(config, memory=True)[0][0],
+                         'synchronous')
+        for bad in ({'SQLITE_JOURNAL_MODE': 'WAL; DROP TABLE users'},
+                    {'SQLITE_SYNCHRONOUS': 'fast'},
+                    {'SQLITE_MMAP_SIZE': '1; --'}):
+            with self.assertRaises(ValueError):
+                sqlite_pragmas(bad)
+
+
+class SQLiteFileTestCase(unittest.TestCase):
+    """Pragmas applied to the connections of an SQLite file."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.app = create_app(file_config(os.path.join(self.tmp, 'hbnb.db')))
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.tmp)
+
+    def _pragma(self, name):
+        return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_connection_pragmas(self):
+        self.assertEqual(self._pragma("journal_mode"), "wal")
+        self.assertEqual(self._pragma("synchronous"), 1)       # NORMAL
+        self.assertEqual(self._pragma("busy_timeout"), 5000)
+        self.assertEqual(self._pragma("cache_size"), -64000)
+        self.assertEqual(db.engine.pool.size(), 5)
+
+    def test_writer_is_not_blocked_by_open_read(self):
+        reader = db.engine.connect()
+        reader.exec_driver_sql("BEGIN")
+        count = "SELECT count(*) FROM amenities"
+        self.assertEqual(reader.exec_driver_sql(count).scalar(), 0)
+        # WAL : le commit n'attend pas la fin de la lecture
+        db.session.execute(text(
+            "INSERT INTO amenities (id, created_at, updated_at, _name) "
+            "VALUES ('a', '2024-01-01', '2024-01-01', 'Wifi')"))
+        db.session.commit()
+        # La lecture en cours garde sa vue de la base
+        self.assertEqual(reader.exec_driver_sql(count).scalar(), 0)
+        reader.rollback()
+        self.assertEqual(reader.exec_driver_sql(count).scalar(), 1)
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+
+
+class FieldsetsTestCase(unittest.TestCase):
+    """?fields= and ?embed= on place, review and user endpoints."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner, "Nice")
+        self.place.amenities.append(Amenity("Wifi"))
+        self.review = Review("Great", 5, self.place, self.guest)
+        db.session.add_all([self.owner, self.guest, self.place, self.review])
+        db.session.commit()
+        self.ids = {
+            "place": self.place.id, "review": self.review.id,
+            "owner": self.owner.id}
+        db.session.expunge_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, url, **params):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            response = self.client.get(url, query_string=params)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        return response, len(statements)
+
+    def test_place_listing_fields_skip_relations(self):
+        full, full_queries = self._get("/api/v1/places/")
+        sparse, sparse_queries = self._get(
+            "/api/v1/places/", fields="id,title,price")
+        self.assertEqual(
+            sparse.get_json(),
+            [{"id": self.ids["place"], "title": "House", "price": 100.0}])
+        # Requête de version (ETag) + une requête : aucune relation chargée
+        self.assertEqual(sparse_queries, 2)
+        self.assertEqual(full_queries, 5)
+        self.assertLess(len(sparse.data), len(full.data))
+
+    def test_place_listing_embed_selects_relations(self):
+        response, queries = self._get(
+            "/api/v1/places/", fields="title", embed="owner")
+        item = response.get_json()[0]
+        self.assertEqual(set(item), {"title", "owner"})
+        self.assertEqual(item["owner"]["id"], self.ids["owner"])
+        self.assertEqual(queries, 3)
+
+    def test_place_listing_relation_in_fields_is_embedded(self):
+        response, _ = self._get("/api/v1/places/", fields="id,amenities")
+        item = response.get_json()[0]
+        self.assertEqual(set(item), {"id", "amenities"})
+        self.assertEqual(item["amenities"][0]["name"], "Wifi")
+
+    def test_place_detail_shape(self):
+        url = f"/api/v1/places/{self.ids['place']}"
+        response, _ = self._get(url, embed="amenities")
+        body = response.get_json()
+        self.assertIn("amenities", body)
+        self.assertNotIn("reviews", body)
+        self.assertNotIn("owner", body)
+        self.assertEqual(body["title"], "House")
+
+        # Vue complète en cache, puis vue réduite servie depuis le cache
+        self._get(url)
+        response, queries = self._get(url, fields="id,price")
+        self.assertEqual(
+            response.get_json(), {"id": self.ids["place"], "price": 100.0})
+        self.assertEqual(queries, 1)            # Requête de version seule
+
+    def test_review_embed_user_and_place(self):
+        response, _ = self._get(
+            "/api/v1/reviews/", fields="rating", embed="user,place")
+        item = response.get_json()[0]
+        self.assertEqual(item["rating"], 5)
+        self.assertEqual(item["user"]["first_name"], "Guest")
+        self.assertEqual(item["place"]["title"], "House")
+        self.assertEqual(set(item), {"rating", "user", "place"})
+
+        response, _ = self._get(
+            f"/api/v1/reviews/{self.ids['review']}", fields="id,text")
+        self.assertEqual(response.get_json(),
+                         {"id": self.ids["review"], "text": "Great"})
+
+        response, _ = self._get(
+            f"/api/v1/reviews/places/{self.ids['place']}/reviews",
+            fields="text")
+        self.assertEqual(response.get_json(), [{"text": "Great"}])
+
+    def test_user_fields_and_places(self):
+        response, _ = self._get("/api/v1/users/", fields="email")
+        self.assertEqual(
+            sorted(item["email"] for item in response.get_json()),
+            ["guest@example.com", "owner@example.com"])
+        self.assertTrue(all(set(i) == {"email"} for i in response.get_json()))
+
+        response, _ = self._get(
+            f"/api/v1/users/{self.ids['owner']}",
+            fields="first_name", embed="places")
+        self.assertEqual(response.get_json(), {
+            "first_name": "Owner",
+            "places": [
+                {"id": self.ids["place"], "title": "House", "price": 100.0}]
+        })
+
+    def test_unknown_field_or_relation(self):
+        self.assertEqual(
+            self._get("/api/v1/places/", fields="id,secret")[0].status_code,
+            400)
+        self.assertEqual(
+            self._get("/api/v1/reviews/", embed="owner")[0].status_code, 400)
+        self.assertEqual(
+            self._get(f"/api/v1/users/{self.ids['owner']}",
+                      fields="password")[0].status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.cli import backfill_geohash
+from app.models.user import User
+from app.models.place import Place
+from app.utils import geo
+
+
+class GeoSearchTestCase(unittest.TestCase):
+    """GET /api/v1/places/search?lat=&lon=&radius_km="""
+
+    # Centre : Paris
+    LAT, LON = 48.8566, 2.3522
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.places = {
+            "center": Place("Center", 10.0, 48.8566, 2.3522, owner),
+            "near": Place("Near", 10.0, 48.8600, 2.3600, owner),
+            "mid": Place("Mid", 10.0, 48.9000, 2.4000, owner),
+            "versailles": Place("Versailles", 10.0, 48.8049, 2.1204, owner),
+            "lyon": Place("Lyon", 10.0, 45.7640, 4.8357, owner),
+        }
+        db.session.add_all([owner, *self.places.values()])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _search(self, **params):
+        params.setdefault("lat", self.LAT)
+        params.setdefault("lon", self.LON)
+        return self.client.get("/api/v1/places/search", query_string=params)
+
+    def test_geohash_follows_coordinates(self):
+        place = self.places["center"]
+        self.assertEqual(place._geohash, geo.encode(48.8566, 2.3522))
+        self.assertTrue(place._geohash.startswith("u09tv"))
+
+    def test_results_within_radius_sorted_by_distance(self):
+        response = self._search(radius_km=20)
+        self.assertEqual(response.status_code, 200)
+        items = response.get_json()["items"]
+        self.assertEqual(
+            [item["title"] for item in items],
+            ["Center", "Near", "Mid", "Versailles"])
+        distances = [item["distance_km"] for item in items]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(distances[0], 0.0)
+        self.assertIsNone(response.get_json()["next_cursor"])
+
+    def test_small_radius_excludes_far_places(self):
+        items = self._search(radius_km=1).get_json()["items"]
+        self.assertEqual(
+            [item["title"] for item in items], ["Center", "Near"])
+
+    def test_pagination_walks_all_results(self):
+        titles = []
+        cursor = None
+        while True:
+            params = {"radius_km": 500, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = self._search(**params).get_json()
+            titles += [item["title"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(
+            titles, ["Center", "Near", "Mid", "Versailles", "Lyon"])
+
+    def test_candidates_use_geohash_index(self):
+        cells = geo.covering_cells(self.LAT, self.LON, 5)
+        self.assertNotEqual(cells, [""])
+        condition = " OR ".join(
+            f"(_geohash >= '{cell}' AND _geohash < '{cell}~')"
+            for cell in cells)
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id, _latitude, _longitude "
+            f"FROM places WHERE {condition}")).fetchall()
+        self.assertIn("ix_places__geohash", " ".join(str(r) for r in plan))
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self._search().status_code, 400)
+        self.assertEqual(self._search(lat=91, radius_km=5).status_code, 400)
+        self.assertEqual(self._search(radius_km=0).status_code, 400)
+        self.assertEqual(
+            self._search(radius_km=geo.MAX_RADIUS_KM + 1).status_code, 400)
+        self.assertEqual(
+            self._search(radius_km=5, cursor="bad").status_code, 400)
+
+    def test_backfill_command_fills_missing_geohash(self):
+        db.session.execute(text("UPDATE places SET _geohash = NULL"))
+        db.session.commit()
+        self.assertEqual(self._search(radius_km=5).get_json()["items"], [])
+
+        result = self.app.test_cli_runner().invoke(backfill_geohash)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(len(self._search(radius_km=5).get_json()["items"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+from flask_jwt_extended import create_access_token, decode_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+from app.services.identity import denylist
+from app.utils.denylist import BloomFilter, TokenDenylist
+
+
+class DenylistTestCase(unittest.TestCase):
+    """Bloom filter in front of the exact set of revoked jti."""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.denylist = TokenDenylist(capacity=100, error_rate=0.01,
+                                      clock=lambda: self.now)
+
+    def test_bloom_filter_has_no_false_negative(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f"jti-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_revoke_and_check(self):
+        self.assertFalse(self.denylist.is_revoked("a"))
+        self.denylist.revoke("a", expires_at=2000)
+        self.assertTrue(self.denylist.is_revoked("a"))
+        self.assertFalse(self.denylist.is_revoked("b"))
+        stats = self.denylist.stats()
+        self.assertEqual((stats["revoked"], stats["checks"]), (1, 3))
+
+    def test_expired_tokens_are_pruned(self):
+        self.denylist.revoke("old", expires_at=1500)
+        self.denylist.revoke("new", expires_at=3000)
+        self.now = 2000
+        self.assertEqual(self.denylist.prune(), 1)
+        self.assertFalse(self.denylist.is_revoked("old"))
+        self.assertTrue(self.denylist.is_revoked("new"))
+
+    def test_sync_reads_the_store_once_per_interval(self):
+        calls = []
+
+        def fetch(cursor):
+            calls.append(cursor)
+            return [("a", 2000)], cursor + 1
+        self.denylist.sync(fetch)
+        self.assertTrue(self.denylist.is_revoked("a"))
+        self.now += self.denylist.sync_interval / 2
+        self.denylist.sync(fetch)
+        self.now += self.denylist.sync_interval
+        self.denylist.sync(fetch)
+        self.assertEqual(calls, [0, 1])
+
+    def test_filter_grows_when_full(self):
+        for i in range(250):
+            self.denylist.revoke(f"jti-{i}", expires_at=5000)
+        self.assertGreaterEqual(self.denylist.capacity, 250)
+        self.assertTrue(all(self.denylist.is_revoked(f"jti-{i}")
+                            for i in range(250)))
+
+
+class IdentityTestCase(unittest.TestCase):
+    """Request-scoped identity, identity cache and logout."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.user = User("Jane", "Doe", "jane@example.com", "pw")
+        db.session.add(self.user)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self, token=None, is_admin=False):
+        token = token or create_access_token(
+            identity={'id': self.user.id, 'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def _get(self, url, headers):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            response = self.client.get(url, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        return response, len(statements)
+
+    def test_authorization_costs_no_sql_once_cached(self):
+        self.user.is_admin = True
+        db.session.commit()
+        headers = self._headers(is_admin=True)
+        response, queries = self._get("/api/v1/admin/cache", headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 2)        # User et révocations partagées
+        response, queries = self._get("/api/v1/admin/cache", headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 0)
+
+    def test_admin_flag_comes_from_the_database(self):
+        # Le claim is_admin du token ne suffit pas
+        response, _ = self._get("/api/v1/admin/cache",
+                                self._headers(is_admin=True))
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_admin = True
+        db.session.commit()
+        facade.forget_user_identity(self.user.id)
+        response, _ = self._get("/api/v1/admin/cache", self._headers())
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_drops_cached_identity(self):
+        headers = self._headers()
+        self.client.get("/api/v1/auth/protected", headers=headers)
+        self.assertEqual(
+            facade.identity_cache.get(self.user.id)["email"],
+            "jane@example.com")
+        response = self.client.put(f"/api/v1/users/{self.user.id}",
+                                   headers=headers,
+                                   json={"email": "jane@example.org"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(facade.identity_cache.get(self.user.id))
+
+    def test_unknown_user_is_rejected(self):
+        token = create_access_token(identity={'id': 'gone', 'is_admin': True})
+        response = self.client.get("/api/v1/admin/cache",
+                                   headers=self._headers(token))
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_the_token(self):
+        headers = self._headers()
+        other = self._headers()
+        response = self.client.post("/api/v1/auth/logout", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        for url in ("/api/v1/auth/protected", "/api/v1/auth/logout"):
+            method = self.client.post if "logout" in url else self.client.get
+            self.assertEqual(method(url, headers=headers).status_code, 401)
+        # Vue avec @handle_errors : toujours 401, pas 400
+        response = self.client.put(f"/api/v1/users/{self.user.id}",
+                                   headers=headers, json={"first_name": "J"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.get(
+            "/api/v1/auth/protected", headers=other).status_code, 200)
+        self.assertEqual(denylist.stats()["revoked"], 1)
+
+    def test_revocation_by_another_worker(self):
+        headers = self._headers()
+        jti = decode_token(headers["Authorization"][7:])["jti"]
+        self.assertEqual(self.client.get(
+            "/api/v1/auth/protected", headers=headers).status_code, 200)
+        # Logout servi par un autre process : seul le store le voit
+        with unit_of_work():
+            facade.token_store.revoke_token(jti, None)
+        denylist.synced_at -= denylist.sync_interval
+        self.assertEqual(self.client.get(
+            "/api/v1/auth/protected", headers=headers).status_code, 401)
+
+    def test_logout_with_refresh_token(self):
+        refresh = self.client.post("/api/v1/auth/login", json={
+            "email": "jane@example.com", "password": "pw"
+        }).get_json()["refresh_token"]
+        headers = self._headers(refresh)
+        self.client.post("/api/v1/auth/logout", headers=headers)
+        self.assertEqual(self.client.post(
+            "/api/v1/auth/refresh", headers=headers).status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
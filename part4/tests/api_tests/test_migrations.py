@@ -0,0 +1,104 @@
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.cli import backfill_geohash, backfill_ratings, init_db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import search_index
+from app.services import facade
+
+
+class SchemaUpgradeTestCase(unittest.TestCase):
+    """init-db upgrades a database created by older models."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User("Owner", "Test", "owner@example.com", "pw")
+        guest = User("Guest", "Test", "guest@example.com", "pw")
+        place = Place("Mountain cabin", 80.0, 45.0, 6.0, owner)
+        db.session.add_all([owner, guest, place])
+        db.session.flush()
+        db.session.add(Review("Cosy", 4, place, guest))
+        db.session.commit()
+        self.place_id = place.id
+        self._downgrade()
+        self.runner = self.app.test_cli_runner()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _downgrade(self):
+        """Schema of the first versions: no aggregates, geohash, email key
+        nor review index; places_fts keyed by the SQLite rowid."""
+        connection = db.session.connection()
+        search_index.drop(connection)
+        for index in ("ix_places__geohash", "ix_users__email_key",
+                      "ix_places__search_rowid", "ix_reviews__search_rowid"):
+            connection.execute(text(f"DROP INDEX {index}"))
+        for table, column in (("places", "review_count"),
+                              ("places", "rating_sum"),
+                              ("places", "_geohash"),
+                              ("places", "_search_rowid"),
+                              ("reviews", "_search_rowid"),
+                              ("users", "_email_key")):
+            connection.execute(text(
+                f"ALTER TABLE {table} DROP COLUMN {column}"))
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE places_fts USING fts5(_title, "
+            "_description, content='places', content_rowid='rowid')"))
+        connection.execute(text(
+            "INSERT INTO places_fts(places_fts) VALUES ('rebuild')"))
+        db.session.commit()
+
+    def _invoke(self, command):
+        result = self.runner.invoke(command)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output
+
+    def test_init_db_upgrades_then_does_nothing(self):
+        output = self._invoke(init_db)
+        for change in ("Added column places.review_count",
+                       "Added column places._geohash",
+                       "Added column users._email_key",
+                       "Added column reviews._search_rowid",
+                       "Created index ix_places__geohash",
+                       "Created index ix_users__email_key",
+                       "Created search index places_fts",
+                       "Created search index reviews_fts"):
+            self.assertIn(change, output)
+        # Deuxième passage : schéma déjà à jour
+        self.assertEqual(self._invoke(init_db).splitlines(),
+                         [f"Tables ready: {len(db.metadata.tables)}"])
+
+    def test_upgraded_database_serves_the_api(self):
+        self._invoke(init_db)
+        self._invoke(backfill_ratings)
+        self._invoke(backfill_geohash)
+        client = self.app.test_client()
+
+        response = client.get("/api/v1/places/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()[0]["average_rating"], 4.0)
+        response = client.get("/api/v1/places/search",
+                              query_string={"q": "cabin"})
+        self.assertEqual([item["id"] for item in response.get_json()["items"]],
+                         [self.place_id])
+        response = client.get(
+            "/api/v1/places/search",
+            query_string={"lat": 45.0, "lon": 6.0, "radius_km": 5})
+        self.assertEqual(len(response.get_json()["items"]), 1)
+        # Index reconstruit sur _search_rowid, suivi par les triggers
+        facade.update_place(self.place_id, {"title": "Seaside hut"})
+        response = client.get("/api/v1/places/search",
+                               query_string={"q": "hut"})
+        self.assertEqual(len(response.get_json()["items"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime
+from app import create_app, db
+from app.models.amenity import Amenity
+
+
+class PaginationTestCase(unittest.TestCase):
+    """Keyset pagination of the collection endpoints."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        # Même created_at pour certains : l'id sert à départager
+        same_time = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(7):
+            amenity = Amenity(f"Amenity {i}")
+            if i < 4:
+                amenity.created_at = same_time
+            db.session.add(amenity)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_without_params_returns_plain_list(self):
+        resp = self.client.get("/api/v1/amenities/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.get_json()), 7)
+
+    def test_walk_all_pages(self):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            url = "/api/v1/amenities/?limit=3"
+            if cursor:
+                url += f"&cursor={cursor}"
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            body = resp.get_json()
+            self.assertLessEqual(len(body["items"]), 3)
+            seen.extend(item["id"] for item in body["items"])
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_invalid_cursor(self):
+        resp = self.client.get("/api/v1/amenities/?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_limit_out_of_range(self):
+        resp = self.client.get("/api/v1/places/?limit=0")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.get("/api/v1/users/?limit=1000")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_other_collections_are_paginated(self):
+        for path in ("places", "reviews", "users"):
+            resp = self.client.get(f"/api/v1/{path}/?limit=5")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(
+                resp.get_json(), {"items": [], "next_cursor": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
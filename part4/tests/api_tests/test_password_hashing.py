@@ -0,0 +1,133 @@
+import threading
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.extensions import password_hasher
+from app.models.user import User
+from app.utils.hashing import HasherBusy, PasswordHasher, hash_cost
+
+
+class PasswordHasherTestCase(unittest.TestCase):
+    """bcrypt on a bounded thread pool."""
+
+    def setUp(self):
+        self.hasher = PasswordHasher()
+        self.hasher.configure(rounds=4, workers=1, queue_size=1)
+
+    def test_hash_and_verify(self):
+        hashed = self.hasher.hash("secret")
+        self.assertEqual(hash_cost(hashed), 4)
+        self.assertTrue(self.hasher.verify(hashed, "secret"))
+        self.assertFalse(self.hasher.verify(hashed, "wrong"))
+        self.assertFalse(self.hasher.needs_rehash(hashed))
+        self.hasher.configure(rounds=5)
+        self.assertTrue(self.hasher.needs_rehash(hashed))
+        self.assertIsNone(hash_cost("not a hash"))
+
+    def test_full_queue_is_rejected(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        # Un hash en cours, un en attente : la file est pleine
+        threads = [threading.Thread(target=self.hasher._run, args=(slow,))
+                   for _ in range(2)]
+        threads[0].start()
+        started.wait(5)
+        threads[1].start()
+        while self.hasher.stats()["queue_depth"] < 1:
+            release.wait(0.01)
+        with self.assertRaises(HasherBusy):
+            self.hasher.hash("secret")
+
+        stats = self.hasher.stats()
+        self.assertEqual((stats["running"], stats["queue_depth"]), (1, 1))
+        self.assertEqual(stats["rejected"], 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        stats = self.hasher.stats()
+        self.assertEqual((stats["completed"], stats["max_queue_depth"]), (2, 1))
+        # Les places sont libérées
+        self.assertTrue(self.hasher.verify(self.hasher.hash("pw"), "pw"))
+
+
+class LoginHashingTestCase(unittest.TestCase):
+    """Login through the pool, rehash on cost change and 503 when busy."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.user = User("Jane", "Doe", "jane@example.com", "secret")
+        db.session.add(self.user)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        password_hasher.init_app(self.app)
+
+    def _login(self, password="secret"):
+        return self.client.post("/api/v1/auth/login", json={
+            "email": "jane@example.com", "password": password})
+
+    def test_login(self):
+        self.assertEqual(self._login().status_code, 200)
+        self.assertEqual(self._login("wrong").status_code, 401)
+
+    def test_password_rehashed_when_cost_changes(self):
+        self.assertEqual(hash_cost(self.user._password_hash), 4)
+        self.app.config["BCRYPT_LOG_ROUNDS"] = 5
+        password_hasher.init_app(self.app)
+
+        # Mauvais password : le hash ne change pas
+        self.assertEqual(self._login("wrong").status_code, 401)
+        self.assertEqual(hash_cost(self.user._password_hash), 4)
+
+        self.assertEqual(self._login().status_code, 200)
+        db.session.expire_all()
+        self.assertEqual(hash_cost(db.session.get(
+            User, self.user.id)._password_hash), 5)
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_login_rejected_when_queue_is_full(self):
+        slots = password_hasher._slots
+        taken = 0
+        while slots.acquire(blocking=False):
+            taken += 1
+        try:
+            response = self._login()
+        finally:
+            for _ in range(taken):
+                slots.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_admin_stats_and_password_update(self):
+        self.user.is_admin = True
+        db.session.commit()
+        token = create_access_token(
+            identity={'id': self.user.id, 'is_admin': True})
+        headers = {'Authorization': f'Bearer {token}'}
+        response = self.client.put(
+            f"/api/v1/admin/users/{self.user.id}", headers=headers,
+            json={"password": "changed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._login("changed").status_code, 200)
+
+        stats = self.client.get(
+            "/api/v1/admin/hashing", headers=headers).get_json()
+        self.assertEqual(stats["rounds"], 4)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertGreaterEqual(stats["completed"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
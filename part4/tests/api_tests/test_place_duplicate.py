@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+from sqlalchemy import text
+from app import create_app, db
+from app.models.user import User
+from app.services import facade
+
+
+class PlaceDuplicateTestCase(unittest.TestCase):
+    """Duplicate places are detected through a unique index."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        db.session.add(self.owner)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place_data(self, title="House"):
+        return {
+            "title": title,
+            "price": 100.0,
+            "latitude": 45.0,
+            "longitude": 5.0,
+            "owner": self.owner.id
+        }
+
+    def test_duplicate_is_rejected(self):
+        facade.create_place(self._place_data())
+        with self.assertRaises(ValueError):
+            facade.create_place(self._place_data())
+        facade.create_place(self._place_data("Other house"))
+        self.assertEqual(len(facade.get_all_places()), 2)
+
+    def test_duplicate_caught_by_unique_index(self):
+        facade.create_place(self._place_data())
+        # Simule une insertion concurrente : la vérification ne voit rien
+        with patch.object(facade.place_repository, "get_duplicate",
+                          return_value=None):
+            with self.assertRaises(ValueError) as ctx:
+                facade.create_place(self._place_data())
+        self.assertIn("already exists", str(ctx.exception))
+        # La session reste utilisable après le rollback
+        self.assertEqual(len(facade.get_all_places()), 1)
+
+    def test_update_into_a_duplicate_is_rejected(self):
+        facade.create_place(self._place_data())
+        other = facade.create_place(self._place_data("Other house"))
+        with self.assertRaises(ValueError) as ctx:
+            facade.update_place(other.id, {"title": "House"})
+        self.assertIn("already exists", str(ctx.exception))
+        self.assertNotIn("IntegrityError", str(ctx.exception))
+        # Transaction annulée : la place garde son titre
+        db.session.expire_all()
+        self.assertEqual(facade.get_place(other.id).title, "Other house")
+
+    def test_duplicate_probe_uses_index(self):
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM places WHERE owner_id = 'o' "
+            "AND _title = 't' AND _latitude = 1.0 AND _longitude = 2.0"
+        )).fetchall()
+        detail = " ".join(row[-1] for row in plan)
+        self.assertIn("ix_places_owner_title_coords", detail)
+
+
+if __name__ == "__main__":
+    unittest.main()
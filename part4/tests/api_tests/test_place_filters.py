@@ -0,0 +1,137 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+
+
+class PlaceFiltersTestCase(unittest.TestCase):
+    """Price and amenity filters with facet counts on GET /places/."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.wifi = Amenity("Wifi")
+        self.bath = Amenity("Bath")
+        self.pool = Amenity("Pool")
+        self.places = {}
+        for title, price, amenities in (
+                ("Cheap", 30.0, [self.wifi]),
+                ("Middle", 80.0, [self.wifi, self.bath]),
+                ("Upper", 120.0, [self.bath, self.pool]),
+                ("Luxury", 400.0, [self.wifi, self.bath, self.pool])):
+            place = Place(title, price, 45.0, 5.0, owner)
+            place.amenities.extend(amenities)
+            self.places[title] = place
+        db.session.add_all([owner, *self.places.values()])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, **params):
+        response = self.client.get("/api/v1/places/", query_string=params)
+        return response.status_code, response.get_json()
+
+    @staticmethod
+    def _titles(body):
+        return sorted(item["title"] for item in body["items"])
+
+    def test_price_range(self):
+        status, body = self._get(min_price=50, max_price=120)
+        self.assertEqual(status, 200)
+        self.assertEqual(self._titles(body), ["Middle", "Upper"])
+        self.assertIsNone(body["next_cursor"])
+
+    def test_amenities_all_and_any(self):
+        ids = f"{self.wifi.id},{self.bath.id}"
+        _, body = self._get(amenities=ids)
+        self.assertEqual(self._titles(body), ["Luxury", "Middle"])
+        _, body = self._get(amenities=ids, amenities_match="any")
+        self.assertEqual(
+            self._titles(body), ["Cheap", "Luxury", "Middle", "Upper"])
+
+    def test_price_and_amenities_combined(self):
+        _, body = self._get(
+            min_price=50, max_price=120,
+            amenities=f"{self.wifi.id},{self.bath.id}")
+        self.assertEqual(self._titles(body), ["Middle"])
+
+    def test_facets_count_matching_places(self):
+        _, body = self._get(min_price=50)
+        facets = {f["name"]: f["count"] for f in body["facets"]["amenities"]}
+        self.assertEqual(facets, {"Bath": 3, "Pool": 2, "Wifi": 2})
+        # Triées par nombre décroissant
+        self.assertEqual(body["facets"]["amenities"][0]["name"], "Bath")
+
+    def test_filtered_pages_cover_all_matches(self):
+        titles = []
+        cursor = None
+        while True:
+            params = {"min_price": 50, "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            _, body = self._get(**params)
+            titles += [item["title"] for item in body["items"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(sorted(titles), ["Luxury", "Middle", "Upper"])
+
+    def test_query_count_is_constant(self):
+        wifi_id = self.wifi.id
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            self._get(min_price=10, amenities=wifi_id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        # Version + page + owners + amenities + reviews + facettes
+        self.assertEqual(len(statements), 6)
+
+    def test_unfiltered_listing_unchanged(self):
+        _, body = self._get()
+        self.assertIsInstance(body, list)
+        self.assertEqual(len(body), 4)
+
+    def test_invalid_filters(self):
+        self.assertEqual(self._get(min_price=100, max_price=50)[0], 400)
+        self.assertEqual(self._get(min_price=-1)[0], 400)
+        self.assertEqual(self._get(min_price="abc")[0], 400)
+        self.assertEqual(
+            self._get(amenities=self.wifi.id, amenities_match="some")[0],
+            400)
+
+    def test_invalid_parameter_is_named(self):
+        for params, name in (
+                ({"amenities_match": "bogus", "min_price": 1},
+                 "amenities_match"),
+                ({"min_price": "abc"}, "min_price"),
+                ({"limit": "x"}, "limit"),
+                ({"stream": "maybe"}, "stream")):
+            status, body = self._get(**params)
+            self.assertEqual(status, 400, params)
+            self.assertTrue(body["error"].startswith(
+                f"Invalid value for '{name}': "), body)
+            self.assertNotIn("Unexpected error", body["error"])
+        response = self.client.get("/api/v1/places/search",
+                                   query_string={"lat": "abc"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json()["error"],
+            "Invalid value for 'lat': could not convert string to float: "
+            "'abc'")
+
+
+if __name__ == "__main__":
+    unittest.main()
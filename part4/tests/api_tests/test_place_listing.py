@@ -0,0 +1,78 @@
+import unittest
+import uuid
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+
+
+class PlaceListingQueryTestCase(unittest.TestCase):
+    """GET /api/v1/places/ must use a constant number of SQL queries."""
+
+    # 1 SELECT version (ETag) + 1 SELECT places
+    # + 3 SELECT ... IN (owners, amenities, reviews)
+    MAX_QUERIES = 5
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_places(self, count):
+        """Create `count` places, each with its own owner, amenity, review."""
+        for _ in range(count):
+            suffix = uuid.uuid4().hex[:8]
+            owner = User("Owner", "Test", f"owner_{suffix}@example.com", "pw")
+            reviewer = User("Rev", "Test", f"rev_{suffix}@example.com", "pw")
+            place = Place(f"Place {suffix}", 100.0, 45.0, 5.0, owner)
+            place.amenities.append(Amenity(f"Amenity {suffix}"))
+            db.session.add_all([owner, reviewer, place])
+            db.session.add(Review("Great", 5, place, reviewer))
+        db.session.commit()
+        db.session.expunge_all()
+
+    def _count_listing_queries(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            resp = self.client.get("/api/v1/places/")
+        finally:
+            event.remove(
+                db.engine, "before_cursor_execute", before_cursor_execute)
+        self.assertEqual(resp.status_code, 200)
+        return len(statements), resp.get_json()
+
+    def test_listing_returns_nested_data(self):
+        self._add_places(1)
+        _, places = self._count_listing_queries()
+        self.assertEqual(len(places), 1)
+        self.assertIsNotNone(places[0]["owner"])
+        self.assertEqual(len(places[0]["amenities"]), 1)
+        self.assertEqual(len(places[0]["reviews"]), 1)
+
+    def test_query_count_does_not_depend_on_row_count(self):
+        self._add_places(2)
+        small_count, _ = self._count_listing_queries()
+        self._add_places(30)
+        large_count, places = self._count_listing_queries()
+
+        self.assertEqual(len(places), 32)
+        self.assertLessEqual(large_count, self.MAX_QUERIES)
+        self.assertEqual(small_count, large_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+
+
+class ReviewLookupTestCase(unittest.TestCase):
+    """Reviews are looked up by place and by (user, place) through indexes."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner)
+        self.other = Place("Flat", 80.0, 45.0, 5.0, self.owner)
+        db.session.add_all([self.owner, self.guest, self.place, self.other])
+        db.session.commit()
+        token = create_access_token(
+            identity={'id': self.guest.id, 'is_admin': False})
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _post_review(self):
+        return self.client.post("/api/v1/reviews/", headers=self.headers, json={
+            "place_id": self.place.id,
+            "user_id": self.guest.id,
+            "text": "Nice",
+            "rating": 4
+        })
+
+    def test_get_reviews_by_place_filters_in_db(self):
+        db.session.add(Review("Good", 4, self.place, self.guest))
+        db.session.add(Review("Bad", 1, self.other, self.guest))
+        db.session.commit()
+        reviews = facade.get_reviews_by_place(self.place.id)
+        self.assertEqual([r.text for r in reviews], ["Good"])
+
+    def test_duplicate_review_is_rejected(self):
+        self.assertEqual(self._post_review().status_code, 201)
+        resp = self._post_review()
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("already reviewed", resp.get_json()["error"])
+
+    def test_duplicate_insert_is_a_clean_error(self):
+        self.assertEqual(self._post_review().status_code, 201)
+        with self.assertRaises(ValueError):
+            facade.create_review({
+                "place_id": self.place.id, "user_id": self.guest.id,
+                "text": "Again", "rating": 2})
+        # Insertion concurrente : la vérification de la route n'a rien vu
+        with patch.object(facade, "get_review_by_user_and_place",
+                          return_value=None):
+            resp = self._post_review()
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(),
+                         {"error": "You have already reviewed this place"})
+        place = db.session.get(Place, self.place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 4))
+
+    def test_unique_index_on_user_and_place(self):
+        db.session.add(Review("One", 4, self.place, self.guest))
+        db.session.commit()
+        db.session.add(Review("Two", 3, self.place, self.guest))
+        with self.assertRaises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_lookups_use_indexes(self):
+        queries = [
+            "SELECT * FROM reviews WHERE place_id = 'x'",
+            "SELECT * FROM reviews WHERE user_id = 'x' AND place_id = 'y'",
+        ]
+        for query in queries:
+            plan = db.session.execute(
+                text(f"EXPLAIN QUERY PLAN {query}")).fetchall()
+            detail = " ".join(row[-1] for row in plan)
+            self.assertIn("USING INDEX", detail)
+
+
+if __name__ == "__main__":
+    unittest.main()
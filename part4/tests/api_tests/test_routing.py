@@ -0,0 +1,115 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.routing import (
+    has_replicas, primary, replica_engines)
+from app.persistence.unit_of_work import unit_of_work
+from config import TestingConfig
+
+
+class ReplicaRoutingTestCase(unittest.TestCase):
+    """Reads on a replica (a copy of the database), writes on the primary."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        primary_path = os.path.join(self.tmp, "primary.db")
+        replica_path = os.path.join(self.tmp, "replica.db")
+        config = type("ReplicaConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary_path}",
+            # Copie en lecture seule : toute écriture y échouerait
+            "DB_REPLICA_URLS": [
+                f"sqlite:///file:{replica_path}?mode=ro&uri=true"],
+        })
+        self.app = create_app(config)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        db.session.add(Amenity("Wifi"))
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copy(primary_path, replica_path)
+        # Une base WAL en lecture seule a besoin de son fichier -shm
+        with sqlite3.connect(replica_path) as connection:
+            connection.execute("PRAGMA journal_mode=DELETE")
+        self.repo = SQLAlchemyRepository(Amenity)
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in [db.engine, *replica_engines(self.app)]:
+            engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.tmp)
+
+    def _add_on_primary_only(self, name):
+        """Row the replica has not received yet."""
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO amenities (id, created_at, updated_at, _name) "
+                "VALUES (:name, '2024-01-02', '2024-01-02', :name)"),
+                {"name": name})
+
+    def _names(self):
+        return sorted(amenity.name for amenity in self.repo.get_all())
+
+    def test_reads_go_to_the_replica(self):
+        self.assertTrue(has_replicas())
+        self._add_on_primary_only("Pool")
+        self.assertEqual(self._names(), ["Wifi"])
+        self.assertIsNone(self.repo.get("Pool"))
+        self.assertIsNone(self.repo.get_by_attribute("_name", "Pool"))
+        with primary():
+            self.assertEqual(self.repo.get("Pool").name, "Pool")
+
+    def test_read_your_writes_after_a_write(self):
+        self._add_on_primary_only("Pool")
+        self.repo.add(Amenity("Sauna"))
+        # Toutes les lectures de la requête vont ensuite au primaire
+        self.assertEqual(self._names(), ["Pool", "Sauna", "Wifi"])
+        # Nouvelle requête : de nouveau sur le réplica
+        db.session.remove()
+        self.assertEqual(self._names(), ["Wifi"])
+
+    def test_unit_of_work_reads_the_primary(self):
+        self._add_on_primary_only("Pool")
+        with unit_of_work():
+            self.assertEqual(self._names(), ["Pool", "Wifi"])
+
+    def test_update_starts_from_the_primary_row(self):
+        wifi = self.repo.get_by_attribute("_name", "Wifi")
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "UPDATE amenities SET _name = 'Fast wifi'"))
+        self.assertEqual(wifi.name, "Wifi")      # Lu sur le réplica
+        self.assertIs(self.repo.get_for_update(wifi.id), wifi)
+        self.assertEqual(wifi.name, "Fast wifi")
+        self.repo.update(wifi.id, {"name": "Wifi 6"})
+        self.assertEqual(self._names(), ["Wifi 6"])
+        self.repo.delete(wifi.id)
+        self.assertEqual(self._names(), [])
+
+    def test_http_reads_use_the_replica(self):
+        self._add_on_primary_only("Pool")
+        response = self.app.test_client().get("/api/v1/amenities/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a["name"] for a in response.get_json()],
+                         ["Wifi"])
+
+
+class NoReplicaTestCase(unittest.TestCase):
+
+    def test_everything_goes_to_the_primary(self):
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            self.assertFalse(has_replicas())
+            self.assertIs(db.session.get_bind(Amenity), db.engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import unittest
+from types import SimpleNamespace
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.utils import serializers
+from app.utils.fieldsets import Shape
+
+
+class SerializersTestCase(unittest.TestCase):
+    """Compiled serializers and JSON encoders (app/utils/serializers.py)."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner, "Nice")
+        self.place.amenities.append(Amenity("Wifi"))
+        self.review = Review("Great", 5, self.place, self.guest)
+        db.session.add_all([self.owner, self.guest, self.place, self.review])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_place_views(self):
+        item = serializers.place_list_serializer(self.place)
+        self.assertEqual(item["owner"]["email"], "owner@example.com")
+        self.assertEqual(item["amenities"], [
+            {"id": self.place.amenities[0].id, "name": "Wifi"}])
+        self.assertEqual(item["reviews"], [
+            {"id": self.review.id, "rating": 5, "text": "Great"}])
+        # Le détail renomme le texte de la review en 'comment'
+        detail = serializers.place_detail_serializer(self.place)
+        self.assertEqual(detail["reviews"][0]["comment"], "Great")
+
+    def test_shaped_variants_are_compiled_once(self):
+        shape = Shape({"id", "title", "owner"}, {"owner"})
+        serializer = serializers.place_list_serializer.shaped(shape)
+        self.assertIs(serializer,
+                      serializers.place_list_serializer.shaped(
+                          Shape({"title", "id", "owner"}, {"owner"})))
+        item = serializer(self.place)
+        self.assertEqual(set(item), {"id", "title", "owner"})
+        self.assertEqual(
+            serializers.user_serializer.variant(keys={"email"})(self.owner),
+            {"email": "owner@example.com"})
+
+    def test_missing_relation_is_null(self):
+        review = serializers.review_serializer.variant(
+            keys={"id", "place"}, embed={"place"})
+        # Les sérialiseurs lisent des attributs : tout objet convient
+        orphan = SimpleNamespace(id="r1", place=None)
+        self.assertEqual(review(orphan), {"id": "r1", "place": None})
+
+    def test_encoders_give_the_same_document(self):
+        data = {"id": "x", "price": 1.5, "items": [1, None, "é"]}
+        for backend in ("json", "orjson", "msgspec"):
+            try:
+                encode = serializers.make_encoder(backend)
+            except RuntimeError:
+                continue                        # Librairie non installée
+            self.assertEqual(json.loads(encode(data)), data)
+        with self.assertRaises(ValueError):
+            serializers.make_encoder("yaml")
+
+    def test_responses_use_configured_encoder(self):
+        calls = []
+        encode = serializers.make_encoder("json")
+
+        def spy(data, indent=False):
+            calls.append(data)
+            return encode(data, indent)
+        self.app.extensions["json_encoder"] = spy
+        response = self.client.get("/api/v1/places/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.get_json()[0]["title"], "House")
+        self.assertEqual(len(calls), 1)
+
+    def test_schemas_are_documented(self):
+        response = self.client.get("/swagger.json")
+        self.assertEqual(response.status_code, 200)
+        definitions = response.get_json()["definitions"]
+        self.assertEqual(
+            definitions["PlaceDetailModel"]["properties"]["reviews"]["items"],
+            {"$ref": "#/definitions/ReviewMiniModel"})
+        self.assertIn("UserPlaceModel", definitions)
+
+
+if __name__ == "__main__":
+    unittest.main()
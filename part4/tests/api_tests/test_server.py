@@ -0,0 +1,77 @@
+import os
+import signal
+import unittest
+from app import create_app, db
+from app.cli import init_db
+from app.extensions import password_hasher
+from app.server import after_fork, worker_settings
+
+
+class WorkerSettingsTestCase(unittest.TestCase):
+    """Worker model read from the HBNB_* variables."""
+
+    def test_defaults(self):
+        settings = worker_settings({})
+        self.assertEqual(settings["workers"], os.cpu_count() or 1)
+        self.assertEqual((settings["threads"], settings["worker_class"]),
+                         (4, "gthread"))
+        self.assertTrue(settings["preload_app"])
+        self.assertIsNone(settings["accesslog"])
+
+    def test_environment(self):
+        settings = worker_settings({
+            "HBNB_WORKERS": "3", "HBNB_THREADS": "1",
+            "HBNB_BIND": "127.0.0.1:9000", "HBNB_MAX_REQUESTS": "1000"})
+        self.assertEqual(settings["workers"], 3)
+        self.assertEqual(settings["worker_class"], "sync")
+        self.assertEqual(settings["bind"], "127.0.0.1:9000")
+        self.assertEqual((settings["max_requests"],
+                          settings["max_requests_jitter"]), (1000, 100))
+
+    def test_invalid_values(self):
+        for environ in ({"HBNB_WORKERS": "0"}, {"HBNB_THREADS": "many"},
+                        {"HBNB_MAX_REQUESTS": "-1"}):
+            with self.assertRaises(ValueError):
+                worker_settings(environ)
+
+
+class ProcessLifecycleTestCase(unittest.TestCase):
+    """Schema creation command and worker fork."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_init_db_creates_the_tables(self):
+        result = self.app.test_cli_runner().invoke(init_db)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("users", db.inspect(db.engine).get_table_names())
+        # Sans effet la seconde fois
+        result = self.app.test_cli_runner().invoke(init_db)
+        self.assertEqual(result.exit_code, 0, result.output)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork()")
+    def test_hashing_works_in_a_forked_worker(self):
+        # Le pool a des threads dans le process parent avant le fork
+        password_hasher.hash("pw")
+        pid = os.fork()
+        if pid == 0:
+            try:
+                signal.alarm(10)
+                after_fork(self.app)
+                os._exit(0 if password_hasher.verify(
+                    password_hasher.hash("pw"), "pw") else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import tracemalloc
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.models.place_amenity import place_amenity
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+class StreamingTestCase(unittest.TestCase):
+    """Streamed (NDJSON / chunked JSON) place and review listings."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _seed(self, count, start=0):
+        """Bulk insert `count` places with one amenity and one review."""
+        now = datetime(2024, 1, 1)
+        if start == 0:
+            db.session.execute(User.__table__.insert(), [
+                {"id": user_id, "created_at": now, "updated_at": now,
+                 "_first_name": "Stream", "_last_name": "Test",
+                 "_email": f"{user_id}@example.com", "_password_hash": "x",
+                 "_is_admin": False} for user_id in ("owner", "guest")])
+            db.session.execute(Amenity.__table__.insert(), [{
+                "id": "wifi", "created_at": now, "updated_at": now,
+                "_name": "Wifi"}])
+        places, links, reviews = [], [], []
+        for i in range(start, start + count):
+            place_id = str(uuid.uuid4())
+            created = now + timedelta(seconds=i)
+            places.append({
+                "id": place_id, "created_at": created, "updated_at": created,
+                "_title": f"Place {i}", "_description": "x" * 200,
+                "_price": 10.0, "_latitude": 0.0, "_longitude": 0.0,
+                "owner_id": "owner"})
+            links.append({"place_id": place_id, "amenity_id": "wifi"})
+            reviews.append({
+                "id": str(uuid.uuid4()), "created_at": created,
+                "updated_at": created, "_text": "Nice stay", "_rating": 4,
+                "place_id": place_id, "user_id": "guest"})
+        db.session.execute(Place.__table__.insert(), places)
+        db.session.execute(place_amenity.insert(), links)
+        db.session.execute(Review.__table__.insert(), reviews)
+        db.session.commit()
+
+    def _peak_memory(self, url, headers=None):
+        """Peak traced memory while the response is produced and read."""
+        tracemalloc.start()
+        try:
+            response = self.client.get(url, headers=headers, buffered=False)
+            for _ in response.response:         # Lecture chunk par chunk
+                pass
+            response.close()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_ndjson_matches_json_list(self):
+        self._seed(30)
+        plain = self.client.get("/api/v1/places/").get_json()
+        response = self.client.get("/api/v1/places/", headers=NDJSON)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        streamed = [json.loads(line) for line in lines]
+        self.assertEqual(len(streamed), 30)
+        # Ordre stable : (created_at, id)
+        self.assertEqual([item["title"] for item in streamed],
+                         [f"Place {i}" for i in range(30)])
+        self.assertEqual(sorted(streamed, key=lambda item: item["id"]),
+                         sorted(plain, key=lambda item: item["id"]))
+
+    def test_chunked_json_array(self):
+        self._seed(5)
+        response = self.client.get(
+            "/api/v1/places/", query_string={"stream": "true",
+                                             "fields": "title"})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.get_json(),
+                         [{"title": f"Place {i}"} for i in range(5)])
+
+        response = self.client.get(
+            "/api/v1/reviews/", query_string={"stream": "true"})
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertEqual(self.client.get(
+            "/api/v1/reviews/", query_string={"stream": "true", "limit": 2}
+        ).status_code, 400)
+
+    def test_empty_collection(self):
+        response = self.client.get("/api/v1/places/",
+                                   query_string={"stream": "true"})
+        self.assertEqual(response.get_json(), [])
+        response = self.client.get("/api/v1/reviews/", headers=NDJSON)
+        self.assertEqual(response.get_data(), b"")
+
+    def test_validators_depend_on_format(self):
+        self._seed(3)
+        plain = self.client.get("/api/v1/places/")
+        streamed = self.client.get("/api/v1/places/", headers=NDJSON)
+        self.assertEqual(streamed.headers["Vary"], "Accept")
+        self.assertNotEqual(plain.headers["ETag"], streamed.headers["ETag"])
+        response = self.client.get("/api/v1/places/", headers={
+            **NDJSON, "If-None-Match": streamed.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_pagination_and_filters_rejected(self):
+        self.assertEqual(self.client.get(
+            "/api/v1/places/", headers=NDJSON, query_string={"limit": 5}
+        ).status_code, 400)
+        self.assertEqual(self.client.get(
+            "/api/v1/places/", headers=NDJSON, query_string={"min_price": 5}
+        ).status_code, 400)
+
+    def test_memory_stays_flat(self):
+        self._seed(1000)
+        small = self._peak_memory("/api/v1/places/", NDJSON)
+        self._seed(7000, start=1000)
+        large = self._peak_memory("/api/v1/places/", NDJSON)
+        buffered = self._peak_memory("/api/v1/places/")
+        # 8 fois plus de places, mais un seul lot en mémoire à la fois
+        self.assertLess(large, small * 2)
+        self.assertLess(large * 3, buffered)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.cli import rebuild_search_index
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+
+
+class TextSearchTestCase(unittest.TestCase):
+    """GET /api/v1/places/search?q= (SQLite FTS5)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.cabin = Place("Mountain cabin", 80.0, 45.0, 6.0, self.owner,
+                           "Wooden cabin with a fireplace")
+        self.loft = Place("City loft", 120.0, 48.8, 2.3, self.owner,
+                          "Bright loft near the cabin-style bakery")
+        self.castle = Place("Château", 300.0, 47.0, 1.0, self.owner,
+                            "Old stones and a large garden")
+        db.session.add_all([
+            self.owner, self.guest, self.cabin, self.loft, self.castle])
+        db.session.add(Review(
+            "Quiet garden, lovely fireplace", 5, self.castle, self.guest))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _search(self, **params):
+        response = self.client.get(
+            "/api/v1/places/search", query_string=params)
+        return response.status_code, response.get_json()
+
+    @staticmethod
+    def _titles(body):
+        return [item["title"] for item in body["items"]]
+
+    def test_title_match_ranks_first(self):
+        status, body = self._search(q="cabin")
+        self.assertEqual(status, 200)
+        self.assertEqual(self._titles(body), ["Mountain cabin", "City loft"])
+        scores = [item["score"] for item in body["items"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_snippet_highlights_terms(self):
+        _, body = self._search(q="fireplace")
+        snippets = {item["title"]: item["snippet"] for item in body["items"]}
+        self.assertIn("[fireplace]", snippets["Mountain cabin"])
+        # Trouvée par le texte de sa review
+        self.assertIn("[fireplace]", snippets["Château"])
+
+    def test_review_match_ranks_after_place_match(self):
+        _, body = self._search(q="garden")
+        self.assertEqual(self._titles(body), ["Château"])
+        _, body = self._search(q="fireplace")
+        self.assertEqual(self._titles(body), ["Mountain cabin", "Château"])
+
+    def test_accents_and_prefix(self):
+        self.assertEqual(self._titles(self._search(q="chateau")[1]),
+                         ["Château"])
+        self.assertEqual(self._titles(self._search(q="fire")[1]),
+                         ["Mountain cabin", "Château"])
+
+    def test_fts_syntax_is_plain_text(self):
+        status, body = self._search(q='cabin" OR NEAR(')
+        self.assertEqual(status, 200)
+        self.assertEqual(body["items"], [])
+        self.assertEqual(self._search(q="  ?! ")[0], 400)
+
+    def test_index_follows_writes(self):
+        facade.update_place(self.loft.id, {"description": "Sunny terrace"})
+        self.assertEqual(self._titles(self._search(q="terrace")[1]),
+                         ["City loft"])
+        self.assertEqual(self._titles(self._search(q="bakery")[1]), [])
+
+        review = Review.query.first()
+        facade.delete_review(review.id)
+        self.assertEqual(self._titles(self._search(q="lovely")[1]), [])
+
+    def test_index_survives_rowid_renumbering(self):
+        # Comme VACUUM, qui peut renuméroter le rowid implicite des tables
+        # à clé TEXT
+        db.session.execute(text("UPDATE places SET rowid = 10 - rowid"))
+        db.session.execute(text("UPDATE reviews SET rowid = rowid + 10"))
+        db.session.commit()
+        self.assertEqual(self._titles(self._search(q="bakery")[1]),
+                         ["City loft"])
+        self.assertEqual(self._titles(self._search(q="lovely")[1]),
+                         ["Château"])
+        self.assertEqual(self._titles(self._search(q="wooden")[1]),
+                         ["Mountain cabin"])
+
+    def test_bulk_import_is_indexed(self):
+        facade.bulk_import([json.dumps({
+            "type": "place", "title": "Beach hut", "price": 40.0,
+            "latitude": 43.0, "longitude": 3.0, "owner_id": self.owner.id})])
+        self.assertEqual(self._titles(self._search(q="hut")[1]),
+                         ["Beach hut"])
+
+    def test_pagination_walks_all_results(self):
+        titles = []
+        cursor = None
+        while True:
+            params = {"q": "cabin", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            _, body = self._search(**params)
+            titles += self._titles(body)
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(titles, ["Mountain cabin", "City loft"])
+
+    def test_rebuild_command(self):
+        db.session.execute(text(
+            "INSERT INTO places_fts(places_fts) VALUES ('delete-all')"))
+        db.session.commit()
+        self.assertEqual(self._search(q="cabin")[1]["items"], [])
+
+        result = self.app.test_cli_runner().invoke(rebuild_search_index)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(len(self._search(q="cabin")[1]["items"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
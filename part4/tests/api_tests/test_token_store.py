@@ -0,0 +1,367 @@
+import threading
+import time
+import unittest
+from sqlalchemy import event
+from flask_jwt_extended import decode_token
+from app import create_app, db
+from app.models.user import User
+from app.persistence.token_store import (
+    MemoryTokenStore, REVOKE_SCRIPT, RedisTokenStore, SQLTokenStore,
+    TokenReplay, TokenStore, make_token_store)
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+
+
+class FakeRedis:
+    """The few Redis commands used by RedisTokenStore, in memory."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.scripts = []
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(
+            {k: str(v).encode() for k, v in mapping.items()})
+
+    def hsetnx(self, key, field, value):
+        fields = self.data.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = str(value).encode()
+        return 1
+
+    def hgetall(self, key):
+        return {k.encode(): v for k, v in self.data.get(key, {}).items()}
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member.encode())
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def expireat(self, key, when):
+        self.expires[key] = when
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(
+            {member.encode(): score for member, score in mapping.items()})
+
+    def eval(self, script, numkeys, *args):
+        # Seul script utilisé : REVOKE_SCRIPT (INCR puis ZADD)
+        self.scripts.append(script)
+        (key, counter), (member,) = args[:numkeys], args[numkeys:]
+        number = self.incr(counter)
+        self.zadd(key, {member: number})
+        return number
+
+    def zrange(self, key, start, end):
+        return sorted(self.data.get(key, {}), key=self.data[key].get)
+
+    def zrangebyscore(self, key, low, high, withscores=False):
+        low = float(low.lstrip("("))
+        return sorted(((member, float(score))
+                       for member, score in self.data.get(key, {}).items()
+                       if score > low), key=lambda item: item[1])
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.data.get(key, {}).pop(member, None)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(
+            (name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs)
+                for name, args, kwargs in self.calls]
+
+
+class StoreContract:
+    """Behaviour shared by every token store backend."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def add(self, store, jti, family="f1", ttl=3600):
+        store.add(jti, self.user_id, family, int(time.time()) + ttl)
+
+    def test_token_is_used_once(self):
+        store = self.make_store()
+        self.add(store, "a")
+        record = store.consume("a")
+        self.assertEqual((record["user_id"], record["family_id"]),
+                         (self.user_id, "f1"))
+        with self.assertRaises(TokenReplay) as raised:
+            store.consume("a")
+        self.assertEqual(raised.exception.family_id, "f1")
+        self.assertIsNone(store.consume("unknown"))
+        stats = store.stats()
+        self.assertEqual((stats["rotations"], stats["replays"]), (1, 1))
+
+    def test_revoke_family(self):
+        store = self.make_store()
+        self.add(store, "a")
+        self.add(store, "b")
+        self.add(store, "c", family="f2")
+        store.revoke_family("f1")
+        self.assertIsNone(store.consume("a"))
+        self.assertIsNone(store.consume("b"))
+        self.assertIsNotNone(store.consume("c"))
+
+    def test_expired_token_is_refused(self):
+        store = self.make_store()
+        self.add(store, "old", ttl=-1)
+        self.assertIsNone(store.consume("old"))
+
+    def test_revocations_are_read_from_a_cursor(self):
+        store = self.make_store()
+        self.assertEqual(store.revoked_since(0), ([], 0))
+        store.revoke_token("a", 2000000000)
+        store.revoke_token("b", None)
+        revoked, cursor = store.revoked_since(0)
+        self.assertEqual(revoked, [("a", 2000000000), ("b", None)])
+        store.revoke_token("c", 2000000000)
+        self.assertEqual(store.revoked_since(cursor)[0],
+                         [("c", 2000000000)])
+
+
+class MemoryTokenStoreTestCase(StoreContract, unittest.TestCase):
+    user_id = "u1"
+
+    def make_store(self):
+        return MemoryTokenStore()
+
+    def test_eviction_follows_expiration(self):
+        now = [1000]
+        store = MemoryTokenStore(max_entries=2, clock=lambda: now[0])
+        store.add("late", "u1", "f", 3000)
+        store.add("soon", "u1", "f", 2000)
+        store.add("later", "u1", "f", 4000)
+        # Plein : le token qui expire le premier est retiré
+        self.assertIsNone(store.consume("soon"))
+        self.assertEqual(store.size(), 2)
+        now[0] = 3500
+        store.add("new", "u1", "f", 5000)
+        self.assertIsNone(store.consume("late"))
+        self.assertEqual(store.size(), 2)
+
+    def test_concurrent_use_has_one_winner(self):
+        store = MemoryTokenStore()
+        self.add(store, "a")
+        results = []
+
+        def use():
+            try:
+                results.append(store.consume("a") is not None)
+            except TokenReplay:
+                results.append(False)
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 1)
+
+
+class RedisTokenStoreTestCase(StoreContract, unittest.TestCase):
+    user_id = "u1"
+
+    def make_store(self):
+        self.client = FakeRedis()
+        return RedisTokenStore(None, client=self.client)
+
+    def test_keys_expire_with_the_token(self):
+        store = self.make_store()
+        store.add("a", "u1", "f1", 12345)
+        self.assertEqual(self.client.expires["hbnb:rt:a"], 12345)
+
+    def test_revocation_is_one_atomic_command(self):
+        store = self.make_store()
+        store.revoke_token("a", None)
+        store.revoke_token("b", None)
+        self.assertEqual(self.client.scripts, [REVOKE_SCRIPT] * 2)
+        self.assertEqual(store.revoked_since(1), ([("b", None)], 2))
+
+    def test_purge_removes_expired_revocations(self):
+        store = self.make_store()
+        store.revoke_token("old", 1000)
+        store.revoke_token("new", int(time.time()) + 60)
+        store.revoke_token("forever", None)
+        self.assertEqual(store.purge_revoked(), 1)
+        self.assertEqual([jti for jti, _ in store.revoked_since(0)[0]],
+                         ["new", "forever"])
+
+
+class SQLTokenStoreTestCase(StoreContract, unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User("Jane", "Doe", "jane@example.com", "pw")
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def make_store(self):
+        return SQLTokenStore()
+
+    def test_replay_seen_by_another_process(self):
+        store, other = SQLTokenStore(), SQLTokenStore()
+        with unit_of_work():
+            self.add(store, "a")
+        with unit_of_work():
+            self.assertIsNotNone(other.consume("a"))
+        # `store` ne sait pas que le token a servi : la base le sait
+        with self.assertRaises(TokenReplay):
+            store.consume("a")
+        # Replay connu de l'index : aucune requête SQL
+        with self.assertRaises(TokenReplay):
+            other.consume("a")
+
+    def test_index_answers_expired_tokens_without_sql(self):
+        now = [time.time()]
+        store = SQLTokenStore(clock=lambda: now[0])
+        with unit_of_work():
+            self.add(store, "a", ttl=60)
+        now[0] += 120
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            self.assertIsNone(store.consume("a"))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        self.assertEqual(statements, [])
+        # Token inconnu de l'index : lu dans la table
+        self.assertIsNone(SQLTokenStore(clock=lambda: now[0]).consume("a"))
+
+    def test_purge_deletes_expired_rows(self):
+        store = SQLTokenStore()
+        with unit_of_work():
+            self.add(store, "old", ttl=-1)
+            self.add(store, "new")
+        self.assertEqual(store.purge(), 1)
+        self.assertEqual(store.size(), 1)
+
+    def test_make_token_store(self):
+        self.assertIsInstance(facade.token_store, SQLTokenStore)
+        self.assertIsInstance(
+            make_token_store({'TOKEN_STORE_BACKEND': 'memory'}),
+            MemoryTokenStore)
+        with self.assertRaises(ValueError):
+            make_token_store({'TOKEN_STORE_BACKEND': 'unknown'})
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class NoRevoke(TokenStore):
+            def _add(self, jti, user_id, family_id, expires_at):
+                pass
+
+            def _consume(self, jti):
+                return None
+        with self.assertRaises(TypeError):
+            NoRevoke()
+
+
+class RefreshRotationTestCase(unittest.TestCase):
+    """POST /auth/refresh rotates tokens and detects replays."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        db.session.add(User("Jane", "Doe", "jane@example.com", "secret"))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _login(self):
+        return self.client.post("/api/v1/auth/login", json={
+            "email": "jane@example.com", "password": "secret"}).get_json()
+
+    def _refresh(self, token):
+        return self.client.post("/api/v1/auth/refresh", headers={
+            "Authorization": f"Bearer {token}"})
+
+    def test_rotation(self):
+        first = self._login()["refresh_token"]
+        response = self._refresh(first)
+        self.assertEqual(response.status_code, 200)
+        tokens = response.get_json()
+        self.assertNotEqual(tokens["refresh_token"], first)
+        self.assertEqual(self.client.get("/api/v1/auth/protected", headers={
+            "Authorization": f"Bearer {tokens['access_token']}"
+        }).status_code, 200)
+        self.assertEqual(
+            self._refresh(tokens["refresh_token"]).status_code, 200)
+
+    def test_rotation_reads_the_admin_flag(self):
+        user = User.query.one()
+        user.is_admin = True
+        db.session.commit()
+        first = self._login()["refresh_token"]
+        user.is_admin = False
+        db.session.commit()
+        facade.forget_user_identity(user.id)
+        tokens = self._refresh(first).get_json()
+        response = self.client.get("/api/v1/admin/cache", headers={
+            "Authorization": f"Bearer {tokens['access_token']}"})
+        self.assertEqual(response.status_code, 403)
+        self.assertIs(decode_token(tokens["access_token"])["sub"]["is_admin"],
+                      False)
+
+    def test_replay_revokes_the_family(self):
+        first = self._login()["refresh_token"]
+        other_session = self._login()["refresh_token"]
+        second = self._refresh(first).get_json()["refresh_token"]
+
+        response = self._refresh(first)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("already used", response.get_json()["error"])
+        # Le token légitime de la famille est révoqué aussi
+        self.assertEqual(self._refresh(second).status_code, 401)
+        # Les autres logins ne sont pas touchés
+        self.assertEqual(self._refresh(other_session).status_code, 200)
+        self.assertEqual(facade.token_store.stats()["replays"], 1)
+
+    def test_logout_revokes_the_family(self):
+        first = self._login()["refresh_token"]
+        second = self._refresh(first).get_json()["refresh_token"]
+        self.client.post("/api/v1/auth/logout", headers={
+            "Authorization": f"Bearer {second}"})
+        self.assertEqual(self._refresh(second).status_code, 401)
+        self.assertEqual(facade.token_store.size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
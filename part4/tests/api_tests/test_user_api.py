@@ -1,12 +1,19 @@
 import unittest
-from app import create_app
+from app import create_app, db
 import json
 
-app = create_app()
-
 class UserApiTestCase(unittest.TestCase):
     def setUp(self):
-        self.client = app.test_client()
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
 
     def test_create_user_valid(self):
         data = {
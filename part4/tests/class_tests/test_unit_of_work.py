@@ -0,0 +1,83 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Repositories commit once per unit of work instead of once per call."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.owner = User("Owner", "Test", "owner@example.com", "pw")
+        self.guest = User("Guest", "Test", "guest@example.com", "pw")
+        self.place = Place("House", 100.0, 45.0, 5.0, self.owner)
+        self.other = Place("Flat", 80.0, 45.0, 5.0, self.owner)
+        self.review = Review("Nice", 4, self.place, self.guest)
+        db.session.add_all(
+            [self.owner, self.guest, self.place, self.other, self.review])
+        db.session.commit()
+        self.commits = 0
+        event.listen(db.engine, "commit", self._on_commit)
+
+    def tearDown(self):
+        event.remove(db.engine, "commit", self._on_commit)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def test_repository_commits_by_default(self):
+        for name in ("A", "B", "C"):
+            facade.amenity_repository.add(Amenity(name))
+        self.assertEqual(self.commits, 3)
+
+    def test_batch_commits_once(self):
+        with unit_of_work():
+            for name in ("A", "B", "C"):
+                facade.create_amenity({"name": name})
+            facade.update_place(self.place.id, {"price": 120.0})
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(Amenity.query.count(), 3)
+
+    def test_update_review_commits_once(self):
+        facade.update_review(self.review.id, {"text": "Edited", "rating": 3})
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(self.review.text, "Edited")
+
+    def test_rejected_relink_does_not_leak(self):
+        # Le relink est fait avant la vérification des champs
+        with self.assertRaises(ValueError):
+            facade.update_review(self.review.id, {"place_id": self.other.id})
+        facade.create_amenity({"name": "Later commit"})
+        db.session.expire_all()
+        self.assertEqual(self.review.place_id, self.place.id)
+
+    def test_commit_false_only_flushes(self):
+        facade.amenity_repository.add(Amenity("Pending"), commit=False)
+        self.assertEqual(self.commits, 0)
+        db.session.rollback()
+        self.assertIsNone(facade.get_amenity_by_name("Pending"))
+
+    def test_error_rolls_back_whole_unit(self):
+        with self.assertRaises(ValueError):
+            with unit_of_work():
+                facade.create_amenity({"name": "Kept?"})
+                facade.update_review(self.review.id, {"rating": 10})
+        self.assertEqual(self.commits, 0)
+        self.assertIsNone(facade.get_amenity_by_name("Kept?"))
+        self.assertEqual(facade.get_review(self.review.id).rating, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+"""
+Production entry point of the HBnB application.
+
+Builds the app once, with the configuration named by HBNB_CONFIG
+(config.ProductionConfig by default). Serve it with gunicorn, which reads
+the worker model from gunicorn.conf.py:
+
+    flask --app wsgi init-db            # creates or upgrades the tables
+    gunicorn wsgi:app
+
+The schema is not created here: starting a worker never touches it.
+"""
+import os
+from app import create_app
+
+app = create_app(os.getenv('HBNB_CONFIG', 'config.ProductionConfig'))